@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Build benchmark: times the generator's stages on synthetic bilingual corpora.
+
+For every corpus size, content/posts is replaced by that many generated posts
+(NNNNN-slug.md plus an .en.md sibling, with front matter like the real ones,
+headings, lists, code fences and images), and these are timed separately:
+read_front_matter_and_body and to_html_paragraphs over every post,
+copy_static into an empty public/ and again with nothing to copy, and build()
+from scratch and again with nothing changed. Everything happens in a
+temporary directory; the real content/ and public/ are not touched.
+
+    python bench_build.py --sizes 10,1000 --output bench_build.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+from datetime import date as Date, timedelta
+
+import generate_static
+
+SITE_CONTENT = generate_static.CONTENT  # before bench_size points the generator at a corpus
+DEFAULT_SIZES = (10, 1000, 10000, 50000)
+# Local images go through responsive_images, remote ones stay as they are unless --localize-images
+IMAGES = ('/images/133.jpg', '/images/profile-photo.jpg', '/images/cert-networking-basics.jpg',
+          'https://images.unsplash.com/photo-1555949963-aa79dcee981c?w=1200&auto=format&fit=crop')
+TOPICS = (('Socket', 'Java'), ('NIO', 'Java'), ('HTTP', 'Java'), ('WebSocket', 'JavaScript'),
+          ('TCP', 'Node.js'), ('Socket.IO', 'Node.js'), ('REST', 'Express'), ('CORS', 'Security'))
+WORDS = {
+    'vi': ('kết nối', 'máy chủ', 'dữ liệu', 'luồng', 'giao thức', 'hiệu năng', 'ứng dụng', 'mạng',
+           'yêu cầu', 'phản hồi', 'bộ đệm', 'xử lý', 'đồng thời', 'cổng', 'gói tin', 'bảo mật'),
+    'en': ('connection', 'server', 'data', 'thread', 'protocol', 'performance', 'application', 'network',
+           'request', 'response', 'buffer', 'handler', 'concurrent', 'port', 'packet', 'security'),
+}
+CODE = {
+    'java': ('ServerSocket server = new ServerSocket(8080);\n'
+             'while (true) {\n'
+             '    Socket client = server.accept();\n'
+             '    new Thread(() -> handle(client)).start();\n'
+             '}'),
+    'javascript': ("const net = require('net');\n"
+                   'const server = net.createServer(socket => {\n'
+                   "  socket.on('data', data => socket.write(data));\n"
+                   '});\n'
+                   'server.listen(8080);'),
+}
+
+
+def sentence(rng, lang):
+    words = [rng.choice(WORDS[lang]) for _ in range(rng.randint(8, 18))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def paragraph(rng, lang):
+    text = ' '.join(sentence(rng, lang) for _ in range(rng.randint(2, 5)))
+    if rng.random() < 0.3:
+        text += f' **{rng.choice(WORDS[lang])}**: `{rng.choice(WORDS["en"]).replace(" ", "_")}()`.'
+    return text
+
+
+def post_body(rng, lang, topic):
+    blocks = [paragraph(rng, lang), paragraph(rng, lang)]
+    image = rng.choice(IMAGES)
+    blocks.append(f'![{topic[0]} {topic[1]}]({image})\n*{sentence(rng, lang)}*')
+    for section in range(1, rng.randint(3, 6)):
+        blocks.append(f'### {section}. {sentence(rng, lang)[:-1]}')
+        blocks.append(paragraph(rng, lang))
+        if rng.random() < 0.5:
+            blocks.append('\n'.join(f'- {sentence(rng, lang)}' for _ in range(rng.randint(2, 5))))
+        if rng.random() < 0.6:
+            language = rng.choice(sorted(CODE))
+            blocks.append(f'```{language}\n{CODE[language]}\n```')
+    return '\n\n'.join(blocks) + '\n'
+
+
+def write_post(path, title, day, topic, thumbnail, body):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('++\n'
+                f'title = "{title}"\n'
+                f'date = "{day.isoformat()}"\n'
+                f'tags = ["{topic[0]}","{topic[1]}"]\n'
+                'draft = false\n'
+                f'thumbnail = "{thumbnail}"\n'
+                '++\n\n' + body)
+
+
+def make_corpus(content_dir, count, seed=0):
+    # content_dir/_index.md and about/ come from the real site, posts/ is generated
+    rng = random.Random(seed)
+    shutil.copy2(os.path.join(SITE_CONTENT, '_index.md'), os.path.join(content_dir, '_index.md'))
+    shutil.copytree(os.path.join(SITE_CONTENT, 'about'), os.path.join(content_dir, 'about'))
+    posts_dir = os.path.join(content_dir, 'posts')
+    os.makedirs(posts_dir)
+    first_day = Date(2020, 1, 1)
+    for n in range(1, count + 1):
+        topic = rng.choice(TOPICS)
+        slug = f'{n:05d}-{topic[0].lower().replace(".", "")}-{topic[1].lower().replace(".", "")}'
+        day = first_day + timedelta(days=rng.randrange(2000))
+        thumbnail = rng.choice(IMAGES)
+        write_post(os.path.join(posts_dir, slug + '.md'), f'{topic[0]} trong {topic[1]} — phần {n}', day, topic,
+                   thumbnail, post_body(rng, 'vi', topic))
+        write_post(os.path.join(posts_dir, slug + '.en.md'), f'{topic[0]} in {topic[1]} — part {n}', day, topic,
+                   thumbnail, post_body(rng, 'en', topic))
+    return sorted(os.path.join(posts_dir, f) for f in os.listdir(posts_dir))
+
+
+def timed(fn, *args, repeat=1, **kwargs):
+    # Best of repeat runs, the generator's own output swallowed
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_size(work_dir, count, repeat, build_options):
+    content_dir = os.path.join(work_dir, f'content-{count}')
+    public_dir = os.path.join(work_dir, f'public-{count}')
+    os.makedirs(content_dir)
+    paths = make_corpus(content_dir, count)
+    generate_static.CONTENT = content_dir
+    generate_static.PUBLIC = public_dir
+    generate_static.BUILD_CACHE = public_dir + '_cache'
+
+    stages = {}
+    stages['read_front_matter_and_body'], parsed = timed(
+        lambda: [generate_static.read_front_matter_and_body(p) for p in paths], repeat=repeat)
+    bodies = [body for _, body in parsed]
+    stages['to_html_paragraphs'], _ = timed(lambda: [generate_static.to_html_paragraphs(b) for b in bodies],
+                                            repeat=repeat)
+
+    os.makedirs(public_dir)
+    stages['copy_static_cold'], _ = timed(generate_static.copy_static)
+    stages['copy_static_warm'], _ = timed(generate_static.copy_static, repeat=repeat)
+    shutil.rmtree(public_dir)
+    shutil.rmtree(generate_static.BUILD_CACHE)
+
+    stages['build_cold'], _ = timed(generate_static.build, force=True, **build_options)
+    stages['build_incremental'], _ = timed(generate_static.build, **build_options)
+    markdown_bytes = sum(os.path.getsize(p) for p in paths)
+    shutil.rmtree(content_dir)
+    shutil.rmtree(public_dir)
+    shutil.rmtree(generate_static.BUILD_CACHE)
+    return {'posts': count, 'files': len(paths), 'markdown_kb': round(markdown_bytes / 1024, 1),
+            'seconds': {stage: round(elapsed, 4) for stage, elapsed in stages.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the generator stages on synthetic bilingual corpora')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated post counts, each with an English sibling (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timing rounds for the parse, render and warm copy stages; the best is reported')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N', help='passed to build()')
+    parser.add_argument('--minify', action='store_true', help='build with --minify')
+    parser.add_argument('--critical-css', action='store_true', help='build with --critical-css')
+    parser.add_argument('--output', '-o', default='bench_build.json', help='JSON results file (default: %(default)s)')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    build_options = {'jobs': args.jobs or os.cpu_count(), 'minify': args.minify, 'critical_css': args.critical_css}
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='bench_build-')
+    try:
+        print(f'{"posts":>7}{"files":>8}{"parse s":>10}{"render s":>10}{"static s":>10}'
+              f'{"build s":>10}{"rebuild s":>11}')
+        for count in sizes:
+            result = bench_size(work_dir, count, args.repeat, build_options)
+            results.append(result)
+            s = result['seconds']
+            print(f'{count:>7}{result["files"]:>8}{s["read_front_matter_and_body"]:>10.3f}'
+                  f'{s["to_html_paragraphs"]:>10.3f}{s["copy_static_cold"]:>10.3f}'
+                  f'{s["build_cold"]:>10.3f}{s["build_incremental"]:>11.3f}')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                   'cpus': os.cpu_count(), 'build_options': build_options, 'repeat': args.repeat,
+                   'results': results}, f, indent=2)
+    print('Results written to', args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark: per-KB render time of markdown_render.render against the old
+paragraph-splitting to_html_paragraphs, over the real posts in content/posts.
+
+    python bench_markdown.py --repeat 200
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from generate_static import CONTENT, read_front_matter_and_body
+from markdown_render import render
+
+
+def legacy_to_html_paragraphs(md):
+    # Verbatim copy of the previous generate_static.to_html_paragraphs, kept as the baseline
+    parts = re.split(r"\n\s*\n", md.strip())
+    html = []
+    for p in parts:
+        p = p.strip()
+        if p.startswith('#'):
+            heading_match = re.match(r'^(#{1,6})\s+(.+)$', p)
+            if heading_match:
+                level = len(heading_match.group(1))
+                heading_text = heading_match.group(2)
+                html.append(f'<h{level}>{heading_text}</h{level}>')
+                continue
+        if p.startswith('!['):
+            img_match = re.match(r'!\[([^\]]*)\]\(([^\)]+)\)', p)
+            if img_match:
+                alt_text = img_match.group(1)
+                img_url = img_match.group(2)
+                html.append(f'<img src="{img_url}" alt="{alt_text}" style="max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0;">')
+                continue
+        p = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', p)
+        if not p.startswith('*'):
+            p = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', p)
+        else:
+            p = '<em>' + p[1:] + '</em>'
+        p = re.sub(r'`([^`]+)`', r'<code>\1</code>', p)
+        p = p.replace('\n', '<br/>')
+        html.append(f'<p>{p}</p>')
+    return '\n'.join(html)
+
+
+def time_renderer(fn, bodies, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Markdown renderers on content/posts')
+    parser.add_argument('--repeat', type=int, default=100, help='timing rounds; the best round is reported')
+    args = parser.parse_args()
+
+    bodies = [read_front_matter_and_body(path)[1]
+              for path in sorted(glob.glob(os.path.join(CONTENT, 'posts', '*.md')))]
+    kb = sum(len(b.encode('utf-8')) for b in bodies) / 1024
+    print(f'{len(bodies)} documents, {kb:.1f} KB of Markdown, best of {args.repeat} rounds')
+    print(f'{"renderer":<22}{"total ms":>10}{"us/KB":>10}')
+    results = {}
+    for name, fn in (('legacy (paragraphs)', legacy_to_html_paragraphs), ('markdown_render', render)):
+        elapsed = time_renderer(fn, bodies, args.repeat)
+        results[name] = elapsed
+        print(f'{name:<22}{elapsed * 1000:>10.2f}{elapsed * 1e6 / kb:>10.1f}')
+    ratio = results['markdown_render'] / results['legacy (paragraphs)']
+    print(f'markdown_render takes {ratio:.2f}x the legacy time')
+
+
+if __name__ == '__main__':
+    main()
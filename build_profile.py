@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Per-stage build profiling for generate_static.py --profile.
+
+The generator marks its stages with `with stage('post render'):`. While a
+Profiler is active, each stage accumulates its call count, wall time, CPU time,
+bytes read and written (from /proc/self/io, so Linux only) and the peak of the
+memory traced by tracemalloc while it ran. Stages nest without double
+counting: while an inner stage runs, the outer one is paused, so every
+figure is the stage's own share. When no Profiler is active, stage() costs a
+function call.
+
+Pages rendered in the --jobs worker processes are profiled there and their
+figures added to the parent's, so with several workers the wall times of the
+render stages add up across processes. cProfile data from the main process
+is dumped next to the table, in the pstats format snakeviz, flameprof and
+gprof2dot read.
+"""
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+FIELDS = ('calls', 'wall', 'cpu', 'read', 'written', 'peak')
+
+_active = None
+_proc_io_read = 0  # what reading /proc/self/io itself has added to rchar
+
+
+def io_counters():
+    # (bytes read, bytes written) by this process through read()/write() calls, or None
+    global _proc_io_read
+    try:
+        fd = os.open('/proc/self/io', os.O_RDONLY)
+        try:
+            data = os.read(fd, 4096)
+        finally:
+            os.close(fd)
+        counters = dict(line.split(':') for line in data.decode('ascii').splitlines())
+        read = int(counters['rchar']) - _proc_io_read
+    except (OSError, KeyError, ValueError):
+        return None
+    _proc_io_read += len(data)
+    return read, int(counters['wchar'])
+
+
+class Profiler:
+    def __init__(self):
+        self.stages = {}  # name -> {'calls', 'wall', 'cpu', 'read', 'written', 'peak'}
+        self.stack = []   # open stages: [name, wall, cpu, io counters] as of their last resume
+        self.lock = threading.Lock()  # merge() runs on the executor's callback thread
+
+    def snapshot(self):
+        return time.perf_counter(), time.process_time(), io_counters()
+
+    def charge(self, frame, now):
+        # Add what the stage on top of the stack spent since it last (re)started
+        name, wall, cpu, io = frame
+        wall_now, cpu_now, io_now = now
+        with self.lock:
+            entry = self.stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+            entry['wall'] += wall_now - wall
+            entry['cpu'] += cpu_now - cpu
+            if io is not None and io_now is not None:
+                entry['read'] += io_now[0] - io[0]
+                entry['written'] += io_now[1] - io[1]
+            if tracemalloc.is_tracing():
+                entry['peak'] = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        now = self.snapshot()
+        if self.stack:
+            self.charge(self.stack[-1], now)
+        self.stack.append([name, *now])
+        try:
+            yield
+        finally:
+            now = self.snapshot()
+            self.charge(self.stack.pop(), now)
+            with self.lock:
+                self.stages[name]['calls'] += 1
+            if self.stack:
+                self.stack[-1][1:] = now
+
+    def merge(self, stages):
+        with self.lock:
+            for name, figures in stages.items():
+                entry = self.stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+                for field in FIELDS:
+                    entry[field] = max(entry[field], figures[field]) if field == 'peak' else entry[field] + figures[field]
+
+
+def stage(name):
+    return _active.stage(name) if _active is not None else nullcontext()
+
+
+def active():
+    return _active is not None
+
+
+def merge(stages):
+    # Stage figures a worker process returned from profiled_call
+    if _active is not None:
+        _active.merge(stages)
+
+
+def start():
+    # Profiles the current process until stop(cprofile, ...); returns the cProfile.Profile
+    global _active
+    _active = Profiler()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    cprofile = cProfile.Profile()
+    cprofile.enable()
+    return cprofile
+
+
+def stop(cprofile, dump_path):
+    global _active
+    cprofile.disable()
+    cprofile.dump_stats(dump_path)
+    tracemalloc.stop()
+    profiler, _active = _active, None
+    return profiler
+
+
+def profiled_call(fn, *args):
+    # Runs in a worker process: fn(*args) under a fresh Profiler, returned with its stages
+    global _active
+    outer = _active
+    _active = Profiler()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    try:
+        return fn(*args), _active.stages
+    finally:
+        _active = outer
+
+
+def profile_report(profiler, total_wall, total_cpu, dump_path, jobs=1):
+    head = f'Build profile: {total_wall:.3f} s wall, {total_cpu:.3f} s CPU in the main process'
+    if jobs > 1:
+        head += f' (render stages summed over {jobs} workers)'
+    lines = [head, f'  {"stage":<16}{"calls":>7}{"wall s":>10}{"cpu s":>10}{"read KB":>11}{"written KB":>12}{"peak MB":>9}']
+    accounted = 0.0
+    for name, s in sorted(profiler.stages.items(), key=lambda item: -item[1]['wall']):
+        accounted += s['wall']
+        lines.append(f'  {name:<16}{s["calls"]:>7}{s["wall"]:>10.3f}{s["cpu"]:>10.3f}{s["read"] / 1024:>11.1f}'
+                     f'{s["written"] / 1024:>12.1f}{s["peak"] / 1048576:>9.1f}')
+    if jobs <= 1:
+        lines.append(f'  {"(other)":<16}{"":>7}{max(total_wall - accounted, 0):>10.3f}')
+    if io_counters() is None:
+        lines.append('  read/written need /proc/self/io and are 0 on this platform')
+    lines.append(f'  cProfile data (main process): {dump_path}, '
+                 'open with snakeviz, flameprof or python -m pstats')
+    return '\n'.join(lines)
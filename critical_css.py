@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Critical CSS for generate_static.py.
+
+For each page, the rules of the site's own stylesheets whose selectors can
+match something on that page (the header, hero, post cards, footer...) are
+inlined into a <style> in <head>. Every stylesheet, the Font Awesome one from
+the CDN included, is then loaded without blocking rendering: a
+rel="preload" link that becomes a stylesheet once it has loaded, plus a
+<noscript> fallback.
+
+Matching is deliberately generous. Pseudo-classes, pseudo-elements and
+attribute selectors are ignored, so a rule is kept whenever the classes, ids
+and element names it mentions all occur in the page. Rules only reached
+through classes that scripts add later (menu-open, active...) are left out;
+they arrive with the full stylesheet, as do :hover, :focus and :active rules.
+"""
+import os
+import re
+from functools import lru_cache
+
+# At-rules whose block holds further rules rather than declarations
+GROUPING_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+TAG_RE = re.compile(r'''<link\b(?:"[^"]*"|'[^']*'|[^'">])*>''', re.I)
+REL_RE = re.compile(r'''\srel=["']?([^"'\s>]+)''', re.I)
+HREF_RE = re.compile(r'''\shref=["']?([^"'\s>]+)''', re.I)
+PSEUDO_RE = re.compile(r'::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?')
+# States that need user interaction, so no rule behind them is part of the first paint
+INTERACTIVE_RE = re.compile(r':(?:hover|focus|focus-within|focus-visible|active|visited|target)\b')
+ATTRIBUTE_RE = re.compile(r'\[[^\]]*\]')
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+ID_RE = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+TYPE_RE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:([^;}]*)')
+KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+PAGE_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+PAGE_CLASS_RE = re.compile(r'''\sclass=["']([^"']*)["']''')
+PAGE_ID_RE = re.compile(r'''\sid=["']([^"']*)["']''')
+
+
+def skip_string(text, i):
+    # i is on a quote; returns the index just past the matching quote
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+
+def parse_css(text):
+    # [(prelude, body), ...]: body is the declaration text of a rule (or of @font-face,
+    # @keyframes...), a nested list for @media and friends, None for @import-style statements
+    rules = []
+    i, n = 0, len(text)
+    while i < n:
+        while i < n and (text[i].isspace() or text.startswith('/*', i)):
+            if text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                i = n if end < 0 else end + 2
+            else:
+                i += 1
+        start = i
+        while i < n and text[i] not in '{;}':
+            if text[i] in '"\'':
+                i = skip_string(text, i)
+            elif text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                i = n if end < 0 else end + 2
+            else:
+                i += 1
+        prelude = re.sub(r'/\*[\s\S]*?\*/', '', text[start:i]).strip()
+        if i >= n:
+            break
+        if text[i] != '{':
+            if text[i] == ';' and prelude:
+                rules.append((prelude, None))
+            i += 1
+            continue
+        depth = 0
+        body_start = i + 1
+        while i < n:
+            if text[i] in '"\'':
+                i = skip_string(text, i)
+                continue
+            if text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                i = n if end < 0 else end + 2
+                continue
+            if text[i] == '{':
+                depth += 1
+            elif text[i] == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        body = text[body_start:i]
+        i += 1
+        if prelude.lower().startswith(GROUPING_AT_RULES):
+            rules.append((prelude, parse_css(body)))
+        else:
+            rules.append((prelude, body.strip()))
+    return rules
+
+
+def serialize(rules):
+    lines = []
+    for prelude, body in rules:
+        if body is None:
+            lines.append(prelude + ';')
+        elif isinstance(body, list):
+            lines.append(prelude + ' {\n' + serialize(body) + '\n}')
+        else:
+            lines.append(f'{prelude} {{ {body} }}')
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=32)
+def _load(path, mtime_ns, size):
+    with open(path, encoding='utf-8') as f:
+        return parse_css(f.read())
+
+
+def load_stylesheet(path):
+    # Parsed once per process and file version
+    st = os.stat(path)
+    return _load(path, st.st_mtime_ns, st.st_size)
+
+
+def split_selectors(prelude):
+    # Split a selector list on top-level commas (not the ones inside :is(...) and co.)
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def page_usage(html):
+    # The element names, classes and ids a page contains
+    classes = set()
+    for value in PAGE_CLASS_RE.findall(html):
+        classes.update(value.split())
+    ids = {value.strip() for value in PAGE_ID_RE.findall(html)}
+    tags = {tag.lower() for tag in PAGE_TAG_RE.findall(html)}
+    return tags, classes, ids
+
+
+def selector_matches(selector, usage, interactive=True):
+    tags, classes, ids = usage
+    if not interactive and INTERACTIVE_RE.search(selector):
+        return False
+    simple = ATTRIBUTE_RE.sub('', PSEUDO_RE.sub('', selector))
+    return (all(c in classes for c in CLASS_RE.findall(simple))
+            and all(i in ids for i in ID_RE.findall(simple))
+            and all(t.lower() in tags for t in TYPE_RE.findall(simple)))
+
+
+def used_rules(rules, usage, interactive=True):
+    # The subset of rules that can apply to a page; @keyframes are kept when a kept
+    # rule animates with them, other non-grouping at-rules (@import, @font-face) are not.
+    # interactive=False also leaves out rules that only apply on hover, focus and so on.
+    kept = []
+    for prelude, body in rules:
+        if prelude.startswith('@'):
+            if isinstance(body, list):
+                inner = used_rules(body, usage, interactive)
+                if inner:
+                    kept.append((prelude, inner))
+            continue
+        if any(selector_matches(s, usage, interactive) for s in split_selectors(prelude)):
+            kept.append((prelude, body))
+    animations = set()
+    for _, body in flatten(kept):
+        for value in ANIMATION_RE.findall(body):
+            animations.update(re.findall(r'[\w-]+', value))
+    for prelude, body in rules:
+        m = KEYFRAMES_RE.match(prelude)
+        if m and m.group(1) in animations:
+            kept.append((prelude, body))
+    return kept
+
+
+def flatten(rules):
+    for prelude, body in rules:
+        if isinstance(body, list):
+            yield from flatten(body)
+        elif body is not None:
+            yield prelude, body
+
+
+def deferred_link(href):
+    # Fetched at low priority without blocking rendering, applied once loaded
+    return (f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+
+
+def inline_critical_css(html, resolve):
+    # resolve(href) -> path of a stylesheet of this site, or None for third-party ones.
+    # Returns the page with the critical rules inlined and every stylesheet deferred.
+    head_end = html.find('</head>')
+    if head_end < 0:
+        return html
+    head = html[:head_end]
+    links = []
+    for m in TAG_RE.finditer(head):
+        rel = REL_RE.search(m.group(0))
+        href = HREF_RE.search(m.group(0))
+        if rel and href and rel.group(1).lower() == 'stylesheet':
+            links.append((m, href.group(1)))
+    if not links:
+        return html
+
+    usage = page_usage(html)
+    critical = []
+    for _, href in links:
+        path = resolve(href)
+        if path is not None:
+            critical.extend(used_rules(load_stylesheet(path), usage, interactive=False))
+
+    out = []
+    pos = 0
+    seen = set()
+    for index, (m, href) in enumerate(links):
+        out.append(head[pos:m.start()])
+        if index == 0 and critical:
+            out.append('<style>\n' + serialize(critical) + '\n</style>\n  ')
+        if href in seen:
+            out[-1] = out[-1].rstrip()  # a duplicate link, drop it and its indentation
+        else:
+            seen.add(href)
+            out.append(deferred_link(href))
+        pos = m.end()
+    out.append(head[pos:])
+    return ''.join(out) + html[head_end:]
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Local preview server for generate_static.py serve [--watch].
+
+public/ is served over HTTP, under the path of baseURL if it has one (the
+pages link /your-repo/... for a GitHub project page, so that is where public/
+has to be). Every HTML page gets a small script that listens
+on /__livereload, a server-sent events stream, and reloads the page when told
+to. With --watch, a background thread polls the watched files (stat only,
+so no dependency on inotify or watchdog), waits until they have stopped
+changing for DEBOUNCE seconds, and hands the set of changed paths to the
+rebuild callback; once that returns, every open page reloads.
+
+The generator decides what a change costs: content edits only rebuild the
+pages that come from the edited files, anything else runs the incremental
+build.
+"""
+import os
+import threading
+import time
+import traceback
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+POLL_INTERVAL = 0.05
+DEBOUNCE = 0.03
+RELOAD_PATH = '/__livereload'
+RELOAD_SCRIPT = (f"<script>new EventSource('{RELOAD_PATH}').onmessage = function () "
+                 "{ location.reload(); };</script>").encode()
+
+
+def scan(roots):
+    # {path: (mtime, size)} for every file under the given directories (or the files themselves)
+    state = {}
+    for root in roots:
+        if os.path.isfile(root):
+            st = os.stat(root)
+            state[root] = (st.st_mtime_ns, st.st_size)
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                if filename.startswith('.') or filename.endswith(('~', '.swp', '.tmp')):
+                    continue  # editor and generator temp files
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def changed_paths(old, new):
+    # Added, removed and modified files
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+class Reloader:
+    # Counts builds; the event streams wait for the count to move
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class Handler(SimpleHTTPRequestHandler):
+    reloader = None
+    base_path = ''
+
+    def translate_path(self, path):
+        # /<base path>/posts/ -> public/posts/
+        if self.base_path and (path == self.base_path or path.startswith((self.base_path + '/', self.base_path + '?'))):
+            path = path[len(self.base_path):] or '/'
+        return super().translate_path(path)
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')  # always the latest build
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            return self.stream_reloads()
+        if self.base_path and self.path == '/':
+            self.send_response(302)
+            self.send_header('Location', self.base_path + '/')
+            self.end_headers()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?')[0].endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if not path.endswith('.html') or not os.path.isfile(path):
+            return super().do_GET()
+        with open(path, 'rb') as f:
+            body = f.read()
+        end = body.rfind(b'</body>')
+        body = body[:end] + RELOAD_SCRIPT + body[end:] if end >= 0 else body + RELOAD_SCRIPT
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        generation = self.reloader.generation
+        try:
+            while True:
+                current = self.reloader.wait(generation, timeout=15)
+                # A comment line keeps proxies and the browser from timing the stream out
+                self.wfile.write(b'data: reload\n\n' if current != generation else b': ping\n\n')
+                self.wfile.flush()
+                generation = current
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass  # one line per request drowns out the rebuild messages
+
+
+def watch(roots, rebuild, reloader):
+    state = scan(roots)
+    while True:
+        time.sleep(POLL_INTERVAL)
+        new = scan(roots)
+        changed = changed_paths(state, new)
+        if not changed:
+            continue
+        # Editors save in several steps; wait until the files stop moving
+        while True:
+            time.sleep(DEBOUNCE)
+            latest = scan(roots)
+            if latest == new:
+                break
+            changed |= changed_paths(new, latest)
+            new = latest
+        state = new
+        started = time.perf_counter()
+        try:
+            rebuild(changed)
+        except Exception:
+            traceback.print_exc()
+            continue
+        names = ', '.join(sorted(os.path.basename(p) for p in changed)[:3]) + (', ...' if len(changed) > 3 else '')
+        print(f'Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms after changes to {names}')
+        reloader.notify()
+
+
+def serve(public_dir, host='127.0.0.1', port=1313, roots=(), rebuild=None, base_path=''):
+    # Serves public_dir at base_path until interrupted; with rebuild, watches roots and calls
+    # rebuild(changed paths)
+    reloader = Reloader()
+    handler = type('Handler', (Handler,), {'reloader': reloader, 'base_path': base_path})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=public_dir))
+    server.daemon_threads = True
+    if rebuild is not None:
+        threading.Thread(target=watch, args=(roots, rebuild, reloader), daemon=True).start()
+        print(f'Watching {", ".join(os.path.relpath(r) for r in roots)} for changes')
+    print(f'Serving {public_dir} at http://{host}:{port}{base_path}/ (Ctrl+C to stop)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
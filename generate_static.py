@@ -1,10 +1,74 @@
 # -*- coding: utf-8 -*-
 
+import argparse
+
+import hashlib
+
+import json
+
 import os
 
+import pickle
+
 import re
 
-from datetime import datetime
+import shutil
+
+import time
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from dataclasses import dataclass, field
+
+from datetime import date as Date, datetime
+
+from functools import lru_cache
+
+from html import escape
+
+from urllib.parse import urlsplit
+
+
+
+try:
+
+    import tomllib
+
+except ImportError:  # Python < 3.11: fall back to the line-based key = value parser
+
+    tomllib = None
+
+
+
+import build_profile
+
+from build_profile import stage
+
+from critical_css import inline_critical_css
+
+from dev_server import serve
+
+from icons import inline_icons, used_icons
+
+from markdown_render import RENDERER_VERSION, render as render_markdown
+
+from minify import minify_css, minify_html, minify_js, minify_report
+
+from output_writer import remove_output, write_output
+
+from precompress import SIBLING_EXTS, precompress, size_report
+
+from prune_css import prune_report, prune_stylesheets
+
+from remote_images import localize, localize_html
+
+from render_cache import cache_report, open_cache
+
+from responsive_images import available_formats, derivatives, derived_urls, rewrite_img_tags
+
+from taxonomy import build_index, cloud, term_names, term_slug
+
+from templates import Environment
 
 
 
@@ -16,1737 +80,2397 @@ STATIC = os.path.join(ROOT, 'static')
 
 PUBLIC = os.path.join(ROOT, 'public')
 
+LAYOUTS = os.path.join(ROOT, 'layouts')
 
+ICONS = os.path.join(ROOT, 'icons')
 
-def read_front_matter_and_body(path):
+I18N = os.path.join(ROOT, 'i18n')
 
-  text = open(path, encoding='utf-8').read()
+BUILD_CACHE = os.path.join(ROOT, '.build_cache')
 
-  # Remove BOM if present
+MANIFEST_VERSION = 3
 
-  if text.startswith('\ufeff'):
+STATIC_WORKERS = 8
 
-    text = text[1:]
 
-  
 
-  # Match front matter delimited by ++ or +++ (Hugo uses +++ but some files used ++)
+# Assets copied by copy_static also get a content-hashed name (style.css -> style.<hash>.css)
 
-  m = re.match(r"\+{2,3}([\s\S]*?)\+{2,3}[ \t\r\n]*", text)
+# that pages link to and that can be cached forever
 
-  fm = {}
+ASSET_DIRS = ('css', 'js', 'images')
 
-  body = text
+FINGERPRINT_RE = re.compile(r'\.[0-9a-f]{8}(?=\.[^.]+$)')
 
-  if m:
+ASSET_REF_RE = re.compile(r'''(["'])(/(?:css|js|images)/[^"'?#\s]+)(?:\?[^"'#\s]*)?\1''')
 
-    fm_text = m.group(1)  # Get content between ++ markers
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
 
-    body = text[m.end():].strip()
+# An element whose text is the translation of its data-i18n key
 
-    for line in fm_text.splitlines():
+I18N_ELEMENT_RE = re.compile(r'(<([a-zA-Z][\w-]*)\b[^>]*\sdata-i18n="([^"]+)"[^>]*>)([\s\S]*?)(</\2>)')
 
-      line = line.strip()
+# Root-relative URLs in the pages, which get the path of baseURL in front
 
-      if not line or line.startswith('++'):
+ROOT_URL_RE = re.compile(r'''(\s(?:href|src|action|poster)=["'])/(?!/)''')
 
-        continue
+SRCSET_RE = re.compile(r'''(\ssrcset=["'])([^"']*)''')
 
-      if '=' in line:
+ASSET_URLS = {}
 
-        key, value = line.split('=', 1)
+RESPONSIVE_IMAGES = {}
 
-        key = key.strip()
+REMOTE_IMAGES = {}
 
-        value = value.strip().strip('"')
+MINIFY = False
 
-        fm[key] = value
+CRITICAL_CSS = False
 
-  
+INLINE_ICONS = False
 
-  # Generate summary if not provided - extract first paragraph from body
+BASE_PATH = ''
 
-  if not fm.get('summary') and body:
+# What the last build() in this process set up (assets, manifest...), reused by targeted
 
-    # Remove markdown headings, code blocks, and images for summary
+# watch-mode rebuilds that only re-render the pages of the content files that changed
 
-    summary_text = re.sub(r'```[\s\S]*?```', '', body)  # Remove code blocks
+WATCH_STATE = {}
 
-    summary_text = re.sub(r'^#{1,6}\s+.*$', '', summary_text, flags=re.MULTILINE)  # Remove headings
+# External assets minified on --minify, unless already minified upstream
 
-    summary_text = re.sub(r'!\[.*?\]\(.*?\)', '', summary_text)  # Remove images
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
 
-    summary_text = re.sub(r'\*[^\*]*\*', '', summary_text)  # Remove image captions
 
-    # Get first paragraph
 
-    first_para = summary_text.strip().split('\n\n')[0] if summary_text.strip() else ''
+# Match front matter delimited by ++ or +++ (Hugo uses +++ but some files used ++)
 
-    # Take first 150 chars
+FRONT_MATTER_RE = re.compile(r"\+{2,3}([\s\S]*?)\+{2,3}[ \t\r\n]*")
 
-    fm['summary'] = first_para[:150].strip() + ('...' if len(first_para) > 150 else '')
+BARE_HEADING_RE = re.compile(r'^#{1,6}\s*$', re.MULTILINE)
 
-  
+# read_front_matter reads the whole post once the body read for the summary passes this many characters
 
-  return fm, body
+SUMMARY_PREFIX = 16384
 
+# Bump when summarize() changes so cached summaries are not reused (see render_cache.py)
 
+SUMMARY_VERSION = 1
 
-def to_html_paragraphs(md):
+DEFAULT_TITLE = 'Nguyễn Thanh Trà'
 
-    # Very small markdown -> HTML converter: paragraphs, inline `code`, images, and headings
+DEFAULT_LANGUAGES = {
 
-    parts = re.split(r"\n\s*\n", md.strip())
+    'vi': {'languageCode': 'vi', 'languageName': 'VN', 'weight': 1},
 
-    html = []
+    'en': {'languageCode': 'en', 'languageName': 'EN', 'weight': 2},
 
-    for p in parts:
+}
 
-        p = p.strip()
+# Hugo's [taxonomies]: singular = plural, the plural being the front matter key and the URL section
 
-        
+DEFAULT_TAXONOMIES = {'tag': 'tags', 'category': 'categories'}
 
-        # Check if this is a heading (starts with #)
 
-        if p.startswith('#'):
 
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', p)
+# Layouts are compiled on first use and cached for the life of the process
 
-            if heading_match:
+TEMPLATES = Environment(LAYOUTS, {'langURL': lambda suffix, url: lang_url(suffix, url)})
 
-                level = len(heading_match.group(1))
 
-                heading_text = heading_match.group(2)
 
-                html.append(f'<h{level}>{heading_text}</h{level}>')
+@dataclass(frozen=True)
 
-                continue
+class MenuEntry:
 
-        
+    identifier: str
 
-        # Check if this is an image line (starts with ![)
+    name: str
 
-        if p.startswith('!['):
+    url: str
 
-            # Image markdown: ![alt](url)
+    weight: int = 0
 
-            img_match = re.match(r'!\[([^\]]*)\]\(([^\)]+)\)', p)
 
-            if img_match:
 
-                alt_text = img_match.group(1)
+@dataclass(frozen=True)
 
-                img_url = img_match.group(2)
+class Language:
 
-                html.append(f'<img src="{img_url}" alt="{alt_text}" style="max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0;">')
+    code: str            # key under [languages], also the page suffix ('en' -> .en.html)
 
-                continue
+    language_code: str   # value of <html lang>
 
-        
+    name: str            # label on the language switch button
 
-        # Bold markdown
+    weight: int = 0
 
-        p = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', p)
 
-        # Italic markdown (but not for image caption lines starting with *)
 
-        if not p.startswith('*'):
+@dataclass(frozen=True)
 
-            p = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', p)
+class SiteConfig:
 
-        else:
+    title: str = DEFAULT_TITLE
 
-            # This is likely an image caption
+    tagline: str = ''
 
-            p = '<em>' + p[1:] + '</em>'
+    base_url: str = '/'
 
-        # Inline code
+    language_code: str = 'vi'
 
-        p = re.sub(r'`([^`]+)`', r'<code>\1</code>', p)
+    menu: tuple = ()
 
-        p = p.replace('\n', '<br/>')
+    languages: tuple = ()
 
-        html.append(f'<p>{p}</p>')
+    paginate: int = 10   # posts per index page; later pages are /posts/page/2/ and on
 
-    return '\n'.join(html)
+    taxonomies: tuple = tuple(DEFAULT_TAXONOMIES.items())  # (singular, plural) pairs
 
+    params: dict = field(default_factory=dict)
 
 
-def ensure_dir(path):
 
-    if not os.path.exists(path):
+    @property
 
-        os.makedirs(path)
+    def base_path(self):
 
+        # '/your-repo' for baseURL = "https://yourusername.github.io/your-repo", '' for a site at the root
 
+        return urlsplit(self.base_url).path.rstrip('/')
 
-def get_social_section_html():
 
-    return '''<section class="social-section">
 
-      <div class="social-container">
+    @property
 
-        <h2 data-i18n="social-title">Xã hội</h2>
+    def menus(self):
 
-        <div class="social-grid">
+        # .Site.Menus.main in the layouts
 
-          <a href="https://github.com/ThanhTra1409" target="_blank" class="social-card">
+        return {'main': self.menu}
 
-            <i class="fab fa-github social-icon"></i>
 
-            <h3>GitHub</h3>
 
-            <p>@nttra204</p>
+    def language(self, code):
 
-          </a>
+        for lang in self.languages:
 
-          <a href="https://www.facebook.com/nguyen.thanh.tra.970568?locale=vi_VN" target="_blank" class="social-card">
+            if lang.code == code:
 
-            <i class="fab fa-facebook social-icon"></i>
+                return lang
 
-            <h3>Facebook</h3>
+        return Language(code, code, code.upper())
 
-            <p>Nguy&#7877;n Thanh Tr&#224;</p>
 
-          </a>
 
-          <a href="https://www.instagram.com/nttra204_/?igsh=MXVlc3p1NG4zdnBidw%3D%3D&utm_source=qr" target="_blank" class="social-card">
+def parse_key_values(text):
 
-            <i class="fab fa-instagram social-icon"></i>
+  # Flat key = value reader used when tomllib is unavailable or the block is not valid TOML
 
-            <h3>Instagram</h3>
+  fm = {}
 
-            <p>@nttra204_</p>
+  for line in text.splitlines():
 
-          </a>
+    line = line.strip()
 
-          <a href="https://www.linkedin.com/in/thanh-tra-nguyen-84a46833a" target="_blank" class="social-card">
+    if not line or line.startswith('++'):
 
-            <i class="fab fa-linkedin social-icon"></i>
+      continue
 
-            <h3>LinkedIn</h3>
+    if '=' in line:
 
-            <p>Nguy&#7877;n Thanh Tr&#224;</p>
+      key, value = line.split('=', 1)
 
-          </a>
+      key = key.strip()
 
-        </div>
+      value = value.strip().strip('"')
 
-      </div>
+      fm[key] = value
 
-    </section>'''
+  return fm
 
 
 
-def get_footer_html(site_title):
+def parse_toml(text):
 
-    return f'''<footer>
+    if tomllib is not None:
 
-    <div class="footer-content">
+        try:
 
-      <div class="footer-brand">
+            return tomllib.loads(text)
 
-        <h3 data-i18n="site-title">{site_title}</h3>
+        except tomllib.TOMLDecodeError:
 
-        <p class="footer-tagline" data-i18n="footer-tagline">Building scalable solutions with passion</p>
+            pass
 
-      </div>
+    return parse_key_values(text)
 
-      <div class="footer-contact">
 
-        <h4 data-i18n="contact-info">Thông tin liên hệ</h4>
 
-        <div class="contact-info-grid">
+@lru_cache(maxsize=4096)
 
-          <div class="contact-info-item">
+def _parse_front_matter_cached(fm_text):
 
-            <i class="fas fa-envelope"></i>
+    fm = parse_toml(fm_text)
 
-            <a href="mailto:ntra140924@gmail.com">ntra140924@gmail.com</a>
+    # Pages and the manifest treat dates as text, keep Hugo's string form
 
-          </div>
+    for key, value in fm.items():
 
-          <div class="contact-info-item">
+        if isinstance(value, (Date, datetime)):
 
-            <i class="fas fa-phone"></i>
+            fm[key] = value.isoformat()
 
-            <a href="tel:0941779093">0941779093</a>
+    return fm
 
-          </div>
 
-        </div>
 
-      </div>
+def parse_front_matter(fm_text):
 
-      <div class="footer-bottom">
+    # Typed front matter (tags = [...] is a list, draft a bool). Parsed blocks are memoised on their
 
-        <p><span data-i18n="footer-copyright">© {datetime.now().year}</span> <span data-i18n="site-title">{site_title}</span></p>
+    # text, so watch-mode rebuilds of unchanged posts skip the TOML parser.
 
-      </div>
+    return dict(_parse_front_matter_cached(fm_text))
 
-    </div>
 
-  </footer>'''
 
+def parse_config(data):
 
+    params = data.get('params', {})
 
-def copy_static():
+    menu = [MenuEntry(m.get('identifier', m.get('name', '').lower()), m.get('name', ''), m.get('url', '/'), m.get('weight', 0))
 
-    # copy css
+            for m in data.get('menu', {}).get('main', [])]
 
-    src_css = os.path.join(STATIC, 'css', 'style.css')
+    languages = [Language(code, lang.get('languageCode', code), lang.get('languageName', code.upper()), lang.get('weight', 0))
 
-    dst_css_dir = os.path.join(PUBLIC, 'css')
+                 for code, lang in (data.get('languages') or DEFAULT_LANGUAGES).items()]
 
-    ensure_dir(dst_css_dir)
+    return SiteConfig(
 
-    if os.path.exists(src_css):
+        title=data.get('title', DEFAULT_TITLE),
 
-        with open(src_css, 'rb') as fr, open(os.path.join(dst_css_dir, 'style.css'), 'wb') as fw:
+        tagline=params.get('tagline', ''),
 
-            fw.write(fr.read())
+        base_url=data.get('baseURL', '/'),
 
-    
+        language_code=data.get('languageCode', 'vi'),
 
-    # copy js
+        menu=tuple(sorted(menu, key=lambda e: e.weight)),
 
-    src_js = os.path.join(STATIC, 'js')
+        languages=tuple(sorted(languages, key=lambda l: l.weight)),
 
-    dst_js_dir = os.path.join(PUBLIC, 'js')
+        paginate=max(1, int(data.get('paginate', 10))),
 
-    if os.path.exists(src_js):
+        taxonomies=tuple((data.get('taxonomies') or DEFAULT_TAXONOMIES).items()),
 
-        ensure_dir(dst_js_dir)
+        params=params,
 
-        for filename in os.listdir(src_js):
+    )
 
-            src_file = os.path.join(src_js, filename)
 
-            dst_file = os.path.join(dst_js_dir, filename)
 
-            if os.path.isfile(src_file):
+_config_cache = {}
 
-                with open(src_file, 'rb') as fr, open(dst_file, 'wb') as fw:
 
-                    fw.write(fr.read())
 
-    
+def load_config(path=None):
 
-    # copy images
+    # Parsed config.toml is cached by content hash: in memory for watch-mode rebuilds and in
 
-    src_images = os.path.join(STATIC, 'images')
+    # .build_cache/config.pickle across builds
 
-    dst_images = os.path.join(PUBLIC, 'images')
+    path = path or os.path.join(ROOT, 'config.toml')
 
-    if os.path.exists(src_images):
+    if not os.path.exists(path):
 
-        ensure_dir(dst_images)
+        return parse_config({})
 
-        for filename in os.listdir(src_images):
+    with open(path, 'rb') as f:
 
-            src_file = os.path.join(src_images, filename)
+        raw = f.read()
 
-            dst_file = os.path.join(dst_images, filename)
+    digest = hashlib.sha256(raw).hexdigest()
 
-            if os.path.isfile(src_file):
+    if digest not in _config_cache:
 
-                with open(src_file, 'rb') as fr, open(dst_file, 'wb') as fw:
+        cache_path = os.path.join(BUILD_CACHE, 'config.pickle')
 
-                    fw.write(fr.read())
+        data = None
 
+        try:
 
+            with open(cache_path, 'rb') as f:
 
-def build():
+                cached_digest, cached_data = pickle.load(f)
 
-    ensure_dir(PUBLIC)
+            if cached_digest == digest:
+
+                data = cached_data
+
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
 
-    copy_static()
+            pass
 
+        if data is None:
 
+            data = parse_toml(raw.decode('utf-8'))
 
-    # read config title
+            ensure_dir(BUILD_CACHE)
 
-    site_title = 'Nguyễn Thanh Trà'
+            with open(cache_path, 'wb') as f:
 
-    tagline = ''
+                pickle.dump((digest, data), f)
 
-    cfg = os.path.join(ROOT, 'config.toml')
+        _config_cache[digest] = parse_config(data)
 
-    if os.path.exists(cfg):
+    return _config_cache[digest]
 
-        for line in open(cfg, encoding='utf-8'):
 
-            if line.strip().startswith('title'):
 
-                site_title = line.split('=',1)[1].strip().strip('"')
+def summarize(body, partial=False):
 
-            if 'tagline' in line:
+  # First paragraph of the body without headings, code blocks, images and captions, cut to 150 chars.
 
-                tagline = line.split('=',1)[1].strip().strip('"')
+  # With partial=True the body is only a prefix of the post; returns None while the prefix
 
+  # is too short to be sure the full body would give the same first paragraph.
 
+  if partial and (body.count('```') % 2 or BARE_HEADING_RE.search(body)):
 
-    # Home
+    return None
 
-    home_fm, home_body = read_front_matter_and_body(os.path.join(CONTENT, '_index.md'))
+  # Remove markdown headings, code blocks, and images for summary
 
-    home_html = f'''<!doctype html>
+  summary_text = re.sub(r'```[\s\S]*?```', '', body)  # Remove code blocks
 
-<html lang="vi">
+  summary_text = re.sub(r'^#{1,6}\s+.*$', '', summary_text, flags=re.MULTILINE)  # Remove headings
 
-<head>
+  summary_text = re.sub(r'!\[.*?\]\(.*?\)', '', summary_text)  # Remove images
 
-  <meta charset="utf-8">
+  if partial and summary_text.count('*') % 2:
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
+    return None
 
-  <title>{site_title}</title>
+  summary_text = re.sub(r'\*[^\*]*\*', '', summary_text)  # Remove image captions
 
-  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>
+  summary_text = summary_text.strip()
 
-  <link rel="stylesheet" href="/css/style.css">
+  if partial and '\n\n' not in summary_text:
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+    return None
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+  # Get first paragraph
 
-    <script>
+  first_para = summary_text.split('\n\n')[0] if summary_text else ''
 
-    function toggleMenu(){{
+  # Take first 150 chars
 
-      document.body.classList.toggle('menu-open');
+  return first_para[:150].strip() + ('...' if len(first_para) > 150 else '')
 
-    }}
 
-    </script>
 
-</head>
+def read_front_matter_and_body(path, summary=True):
 
-<body>
+  # summary=False leaves a missing summary to the caller (render_body gets it from the render cache)
 
-  <div class="overlay" id="overlay">
+  text = open(path, encoding='utf-8').read()
 
-    <ul class="menu">
+  # Remove BOM if present
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+  if text.startswith('\ufeff'):
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+    text = text[1:]
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
+  
 
-    </ul>
+  m = FRONT_MATTER_RE.match(text)
 
-  </div>
+  fm = {}
 
-  <header>
+  body = text
 
-    <nav>
+  if m:
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
+    fm = parse_front_matter(m.group(1))  # Get content between ++ markers
 
-      <ul>
+    body = text[m.end():].strip()
 
-        <li><a href="/" data-i18n="home">Home</a></li>
+  
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+  # Generate summary if not provided - extract first paragraph from body
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+  if summary and not fm.get('summary') and body:
 
-        <li class="lang-toggle-wrapper">
+    fm['summary'] = summarize(body)
 
-          <div id="lang-switch" class="lang-switch" data-lang="vi">
+  
 
-            <div class="lang-switch-slider"></div>
+  return fm, body
 
-            <button id="lang-vn" class="lang-btn">VN</button>
 
-            <button id="lang-en" class="lang-btn">EN</button>
 
-          </div>
+def read_front_matter(path):
 
-        </li>
+  # Lazy variant for index pages: streams the file and stops once the front matter and the
 
-      </ul>
+  # paragraph the summary is taken from have been read. The body is left for
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+  # read_front_matter_and_body, called only when the post page itself is rendered.
 
-    </nav>
+  # Gives exactly the same front matter and summary as read_front_matter_and_body.
 
-  </header>
+  with open(path, encoding='utf-8') as f:
 
-  <main>
+    text = ''
 
-    <section class="hero">
+    fm = None
 
-      <div class="hero-content">
+    for line in f:
 
-        <p class="hero-greeting" data-i18n="hero-greeting">Xin chào, tôi là</p>
+      if not text and line.startswith('\ufeff'):
 
-        <h1 data-i18n="hero-name">Nguyễn Thanh Trà</h1>
+        line = line[1:]
 
-        <div class="hero-intro">
+      text += line
 
-          <p><strong data-i18n="hero-role">Software Engineer | Backend Developer</strong></p>
+      if not text.startswith('++'):
 
-          <p data-i18n="hero-intro-main">Tôi là sinh viên năm 4 yêu thích công nghệ phần mềm, hiện đang tìm hiểu các kiến thức cơ bản về lập trình và phát triển phần mềm. Có tinh thần học hỏi, chủ động rèn luyện tư duy logic và kỹ năng chuyên môn để phục vụ học tập và công việc trong tương lai.</p>
+        fm = {}
 
-        </div>
+        break
 
-        <div class="cta">
+      if text.count('++', 2) == 0:
 
-          <a class="btn primary" href="/posts/" data-i18n="view-posts">Xem portfolio</a>
+        continue
 
-          <a class="btn ghost" href="/about/" data-i18n="about-me">Liên hệ</a>
+      m = FRONT_MATTER_RE.match(text)
 
-        </div>
+      if not m or m.end() == len(text):
 
-      </div>
+        continue  # still inside the front matter, or in the blank lines after it
 
-      <div class="hero-image-wrapper">
+      fm = parse_front_matter(m.group(1))
 
-        <img src="/images/133.jpg" alt="Nguyễn Thanh Trà" class="hero-avatar">
+      if fm.get('summary'):
 
-      </div>
+        return fm
 
-    </section>
+      text = text[m.end():]
 
-    <section class="intro">
+      break
 
-      {home_body}
+    if fm is not None:
 
-    </section>
+      # A paragraph ends at a blank line, so that is the only place the summary can be complete;
 
-    
+      # a body that still has none after SUMMARY_PREFIX characters is read in full below
 
-    <section class="certificates-section" style="max-width: 1200px; margin: 4rem auto; padding: 0 2rem;">
+      lines = [text]
 
-      <h2 style="text-align: center; font-size: 2rem; margin-bottom: 3rem;" data-i18n="certificates">Chá»©ng chá»‰ vÃ  thÃ nh tá»±u</h2>
+      size = len(text)
 
-      <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 2rem;">
+      for line in f:
 
-        <div class="certificate-card" style="cursor: pointer; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 8px rgba(0,0,0,0.1); transition: transform 0.3s; background: white;" onclick="openImageModal('/images/cert-networking-basics.jpg')">
+        lines.append(line)
 
-          <img src="/images/cert-networking-basics.jpg" alt="Networking Basics Certificate" style="width: 100%; height: auto; object-fit: contain;">
+        size += len(line)
 
-          <div style="padding: 1.5rem; text-align: center;">
+        if not line.strip():
 
-            <h3 style="margin: 0 0 0.5rem 0; font-size: 1.2rem; color: #5b6fce;">Networking Basics</h3>
+          summary = summarize(''.join(lines).strip(), partial=True)
 
-            <p style="margin: 0.5rem 0; color: #666; font-size: 0.95rem;">Nguyễn Thanh Trà</p>
+          if summary is not None:
 
-            <p style="margin: 0.5rem 0; color: #999; font-size: 0.9rem;">Nov 2025</p>
+            fm['summary'] = summary
 
-          </div>
+            return fm
 
-        </div>
+        if size > SUMMARY_PREFIX:
 
-        
+          break
 
-        <div class="certificate-card" style="cursor: pointer; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 8px rgba(0,0,0,0.1); transition: transform 0.3s; background: white;" onclick="openImageModal('/images/cert-js-essentials-1.jpg')">
+  # Short post, no summary within the prefix, or unterminated front matter
 
-          <img src="/images/cert-js-essentials-1.jpg" alt="JavaScript Essentials 1 Certificate" style="width: 100%; height: auto; object-fit: contain;">
+  return read_front_matter_and_body(path)[0]
 
-          <div style="padding: 1.5rem; text-align: center;">
 
-            <h3 style="margin: 0 0 0.5rem 0; font-size: 1.2rem; color: #5b6fce;">JavaScript Essentials 1</h3>
 
-            <p style="margin: 0.5rem 0; color: #666; font-size: 0.95rem;">Nguyễn Thanh Trà</p>
+def to_html_paragraphs(md):
 
-            <p style="margin: 0.5rem 0; color: #999; font-size: 0.9rem;">Dec 2025</p>
+    # Block + inline Markdown renderer (fenced code, lists, blockquotes, tables, links), see markdown_render.py
 
-          </div>
+    return render_markdown(md)
 
-        </div>
 
-        
 
-        <div class="certificate-card" style="cursor: pointer; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 8px rgba(0,0,0,0.1); transition: transform 0.3s; background: white;" onclick="openImageModal('/images/cert-js-essentials-2.jpg')">
+def render_cache():
 
-          <img src="/images/cert-js-essentials-2.jpg" alt="JavaScript Essentials 2 Certificate" style="width: 100%; height: auto; object-fit: contain;">
+    # This process's connection to .build_cache/render-cache.sqlite; None without sqlite3
 
-          <div style="padding: 1.5rem; text-align: center;">
+    return open_cache(BUILD_CACHE, f'{RENDERER_VERSION}.{SUMMARY_VERSION}')
 
-            <h3 style="margin: 0 0 0.5rem 0; font-size: 1.2rem; color: #5b6fce;">JavaScript Essentials 2</h3>
 
-            <p style="margin: 0.5rem 0; color: #666; font-size: 0.95rem;">Nguyễn Thanh Trà</p>
 
-            <p style="margin: 0.5rem 0; color: #999; font-size: 0.9rem;">Dec 2025</p>
+def render_body(body):
 
-          </div>
+    # (HTML, summary) of a post body; bodies rendered by any earlier build come from the render cache
 
-        </div>
+    cache = render_cache()
 
-      </div>
+    cached = cache.get(body) if cache is not None else None
 
-    </section>
+    if cached is None:
 
-    
+        cached = to_html_paragraphs(body), summarize(body)
 
-    <!-- Image Modal -->
+        if cache is not None:
 
-    <div id="imageModal" style="display: none; position: fixed; z-index: 9999; left: 0; top: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.9); justify-content: center; align-items: center;" onclick="closeImageModal()">
+            cache.put(body, *cached)
 
-      <span style="position: absolute; top: 20px; right: 40px; color: white; font-size: 40px; font-weight: bold; cursor: pointer;">&times;</span>
+    return cached
 
-      <img id="modalImage" style="max-width: 90%; max-height: 90%; object-fit: contain;">
 
-    </div>
 
-    
+def ensure_dir(path):
 
-    <section class="social-section">
+    if not os.path.exists(path):
 
-      <div class="social-container">
+        os.makedirs(path)
 
-        <h2 data-i18n="social-title">Xã hội</h2>
 
-        <div class="social-grid">
 
-          <a href="https://github.com/nttra204" target="_blank" class="social-card">
+def file_digest(path):
 
-            <i class="fab fa-github social-icon"></i>
+    h = hashlib.sha256()
 
-            <h3>GitHub</h3>
+    with open(path, 'rb') as f:
 
-            <p>@nttra204</p>
+        for chunk in iter(lambda: f.read(65536), b''):
 
-          </a>
+            h.update(chunk)
 
-          <a href="https://www.facebook.com/nguyen.thanh.tra.970568?locale=vi_VN" target="_blank" class="social-card">
+    return h.hexdigest()
 
-            <i class="fab fa-facebook social-icon"></i>
 
-            <h3>Facebook</h3>
 
-            <p>Nguyễn Thanh Trà</p>
+def generator_fingerprint(assets=None):
 
-          </a>
+    # Editing the generator or its helper modules, any layout or config.toml invalidates
 
-          <a href="https://www.instagram.com/nttra204_/?igsh=MXVlc3p1NG4zdnBidw%3D%3D&utm_source=qr" target="_blank" class="social-card">
+    # every page. The footer prints the current year, so a new
 
-            <i class="fab fa-instagram social-icon"></i>
+    # year does too, and so does a new fingerprint for any asset the pages link to.
 
-            <h3>Instagram</h3>
+    h = hashlib.sha256(f'{MANIFEST_VERSION}:{datetime.now().year}'.encode())
 
-            <p>@nttra204_</p>
+    h.update(json.dumps(assets or {}, sort_keys=True).encode())
 
-          </a>
+    paths = [os.path.abspath(__file__), os.path.join(ROOT, 'markdown_render.py'),
 
-          <a href="https://www.linkedin.com/in/nttra204" target="_blank" class="social-card">
+             os.path.join(ROOT, 'templates.py'), os.path.join(ROOT, 'responsive_images.py'),
 
-            <i class="fab fa-linkedin social-icon"></i>
+             os.path.join(ROOT, 'remote_images.py'), os.path.join(ROOT, 'minify.py'),
 
-            <h3>LinkedIn</h3>
+             os.path.join(ROOT, 'critical_css.py'), os.path.join(ROOT, 'prune_css.py'),
 
-            <p>Nguyễn Thanh Trà</p>
+             os.path.join(ROOT, 'icons.py'), os.path.join(ROOT, 'taxonomy.py'), os.path.join(ROOT, 'config.toml')]
 
-          </a>
+    for tree in (LAYOUTS, ICONS, I18N):
 
-        </div>
+        for dirpath, dirnames, filenames in sorted(os.walk(tree)):
 
-      </div>
+            dirnames.sort()
 
-    </section>
+            paths.extend(os.path.join(dirpath, f) for f in sorted(filenames))
 
-  </main>
+    for path in paths:
 
-  {get_footer_html(site_title)}
+        if os.path.exists(path):
 
-  <script src="/js/i18n.js?v=1.1"></script>
+            h.update(file_digest(path).encode())
 
-  <script>
+    return h.hexdigest()
 
-  function toggleMenu(){{
 
-    document.body.classList.toggle('menu-open');
 
-  }}
+def load_manifest(force=False, assets=None):
 
-  
+    # The manifest remembers, per content file, its mtime/size/hash, the index metadata
 
-  function openImageModal(imageSrc) {{
+    # extracted from it and the output pages it feeds, so unchanged posts are not re-read
 
-    document.getElementById('imageModal').style.display = 'flex';
+    fingerprint = generator_fingerprint(assets)
 
-    document.getElementById('modalImage').src = imageSrc;
+    manifest = None
 
-  }}
+    path = os.path.join(BUILD_CACHE, 'manifest.json')
 
-  
+    if not force and os.path.exists(path):
 
-  function closeImageModal() {{
+        try:
 
-    document.getElementById('imageModal').style.display = 'none';
+            with open(path, encoding='utf-8') as f:
 
-  }}
+                manifest = json.load(f)
 
-  
+        except (OSError, ValueError):
 
-  // Hover effect for certificate cards
+            manifest = None
 
-  document.addEventListener('DOMContentLoaded', function() {{
+    full = (manifest is None or manifest.get('generator') != fingerprint
 
-    const cards = document.querySelectorAll('.certificate-card');
+            or manifest.get('public') != os.path.abspath(PUBLIC))
 
-    cards.forEach(card => {{
+    if full:
 
-      card.addEventListener('mouseenter', function() {{
+        # Start over, but remember what the last build wrote so that outputs of deleted sources
 
-        this.style.transform = 'translateY(-5px)';
+        # and index pages past the new last one are still cleaned up
 
-      }});
+        previous = manifest if manifest and manifest.get('public') == os.path.abspath(PUBLIC) else {}
 
-      card.addEventListener('mouseleave', function() {{
+        manifest = {'sources': {k: {'outputs': v.get('outputs', [])} for k, v in previous.get('sources', {}).items()},
 
-        this.style.transform = 'translateY(0)';
+                    'pages': dict.fromkeys(previous.get('pages', {}))}
 
-      }});
+    manifest.update({'version': MANIFEST_VERSION, 'generator': fingerprint,
 
-    }});
+                     'public': os.path.abspath(PUBLIC), 'full': full,
 
-  }});
+                     'seen': set(), 'rendered': 0, 'skipped': 0})
 
-  </script>
+    return manifest
 
-</body>
 
-</html>'''
 
-    with open(os.path.join(PUBLIC, 'index.html'), 'w', encoding='utf-8') as f:
+def save_manifest(manifest):
 
-        f.write(home_html)
+    ensure_dir(BUILD_CACHE)
 
+    data = {k: v for k, v in manifest.items() if k not in ('full', 'seen', 'rendered', 'skipped')}
 
+    tmp = os.path.join(BUILD_CACHE, 'manifest.json.tmp')
 
-    # About
+    with open(tmp, 'w', encoding='utf-8') as f:
 
-    about_dir = os.path.join(PUBLIC, 'about')
+        # Compact, so json uses its C encoder: the manifest has an entry per content file
 
-    ensure_dir(about_dir)
+        f.write(json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')))
 
-    about_fm, about_body = read_front_matter_and_body(os.path.join(CONTENT, 'about', '_index.md'))
+    os.replace(tmp, os.path.join(BUILD_CACHE, 'manifest.json'))
 
-    
 
-    # About page with i18n-ready content
 
-    about_html = f'''<!doctype html>
+@lru_cache(maxsize=None)
 
-<html lang="vi">
+def source_key(path):
 
-<head>
+    return os.path.relpath(path, ROOT).replace(os.sep, '/')
 
-  <meta charset="utf-8">
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
 
-  <title>About - {site_title}</title>
+def source_changed(manifest, path):
 
-  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>
+    # Cheap stat comparison first; only hash the file when mtime or size moved
 
-  <link rel="stylesheet" href="/css/style.css">
+    key = source_key(path)
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+    manifest['seen'].add(key)
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+    st = os.stat(path)
 
-</head>
+    entry = manifest['sources'].setdefault(key, {})
 
-<body>
+    if not manifest['full'] and entry.get('mtime') == st.st_mtime_ns and entry.get('size') == st.st_size:
 
-  <div class="overlay" id="overlay">
+        return False
 
-    <ul class="menu">
+    digest = file_digest(path)
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+    changed = manifest['full'] or entry.get('hash') != digest
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+    entry.update({'mtime': st.st_mtime_ns, 'size': st.st_size, 'hash': digest})
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
+    if changed:
 
-    </ul>
+        entry.pop('meta', None)
 
-  </div>
+    return changed
 
-  <header>
 
-    <nav>
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
+def source_meta(manifest, path):
 
-      <ul>
+    return manifest['sources'].get(source_key(path), {}).get('meta')
 
-        <li><a href="/" data-i18n="home">Home</a></li>
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+def record_source(manifest, path, outputs, meta=None, **state):
 
-        <li class="lang-toggle-wrapper">
+    # state: anything else the pages of path depend on, compared by the caller on the next build
 
-          <div id="lang-switch" class="lang-switch" data-lang="vi">
+    entry = manifest['sources'][source_key(path)]
 
-            <div class="lang-switch-slider"></div>
+    entry['outputs'] = outputs
 
-            <button id="lang-vn" class="lang-btn">VN</button>
+    entry.update(state)
 
-            <button id="lang-en" class="lang-btn">EN</button>
+    if meta is not None:
 
-          </div>
+        entry['meta'] = meta
 
-        </li>
 
-      </ul>
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+def forget_source(manifest, path):
 
-    </nav>
+    # The pages of path were not written: the next build, targeted or not, renders them again
 
-  </header>
+    entry = manifest['sources'].get(source_key(path), {})
 
-  <main style="padding: 0; max-width: 100%;">
+    for field in ('mtime', 'size', 'hash'):
 
-    <article class="post about-content" style="max-width: 100%;">
+        entry.pop(field, None)
 
-      <section class="about-section personal-info-section" style="max-width: 100%; padding: 3rem 0; margin: 0; display: flex; justify-content: center;">
 
-        <div style="width: 85%; max-width: 1200px;">
 
-          <div style="background: white; padding: 3rem 4rem; box-shadow: 0 2px 8px rgba(0,0,0,0.1); border-radius: 12px; display: flex; flex-direction: column;">
+def outputs_missing(outputs):
 
-            <h2 data-i18n="personal-info" style="text-align: center; margin-bottom: 3rem; margin-top: 0; font-size: 2.5rem; font-weight: 700; margin-right: -114px;">ThÃ´ng tin cÃ¡ nhÃ¢n</h2>
+    return any(not os.path.exists(os.path.join(PUBLIC, *o.split('/'))) for o in outputs)
 
-            <div style="display: flex; align-items: flex-start; justify-content: flex-start; gap: 4rem; max-width: 100%; margin: 0 auto;">
 
-              <div style="flex-shrink: 0; margin-left: -114px; margin-top: -76px;">
 
-                <img src="/images/133.jpg" alt="Nguyễn Thanh Trà" style="width: 280px; height: 380px; border-radius: 16px; object-fit: cover; border: 4px solid rgba(107, 114, 128, 0.2); box-shadow: 0 8px 24px rgba(0, 0, 0, 0.12);">
+def page_changed(manifest, output, state):
 
-              </div>
+    # Aggregate pages (the posts indexes) are keyed on a digest of everything they list
 
-              <div style="flex: 1;">
+    digest = hashlib.sha256(json.dumps(state, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
 
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 2rem 4rem; max-width: 600px; margin-bottom: 2rem;">
+    changed = manifest['full'] or manifest['pages'].get(output) != digest or outputs_missing([output])
 
-                  <div>
+    manifest['pages'][output] = digest
 
-                    <strong data-i18n="fullname-label" style="color: #6b7280; font-size: 1rem; display: block; margin-bottom: 0.5rem;">Họ và tên</strong>
+    manifest['seen'].add(output)
 
-                    <span style="font-size: 1.1rem; color: #2d3748; font-weight: 500;">Nguyễn Thanh Trà</span>
+    return changed
 
-                  </div>
 
-                  
 
-                  <div>
+def source_stale(manifest, path, outputs, changed=None):
 
-                    <strong data-i18n="phone-label" style="color: #6b7280; font-size: 1rem; display: block; margin-bottom: 0.5rem;">SÄT</strong>
+    # The pages of path need rendering: it changed or they are gone. A targeted rebuild
 
-                    <span style="font-size: 1.1rem; color: #2d3748; font-weight: 500;">0941779093</span>
+    # (changed given) trusts every source not in changed without even a stat, unless its
 
-                  </div>
+    # pages failed to render last time.
 
-                  
+    if changed is not None and path not in changed and 'hash' in manifest['sources'].get(source_key(path), {}):
 
-                  <div>
+        manifest['seen'].add(source_key(path))
 
-                    <strong data-i18n="email-label" style="color: #6b7280; font-size: 1rem; display: block; margin-bottom: 0.5rem;">Email</strong>
+        return False
 
-                    <span style="font-size: 1.1rem; color: #2d3748; font-weight: 500;">ntra140924@gmail.com</span>
+    return source_changed(manifest, path) or outputs_missing(outputs)
 
-                  </div>
 
-                  
 
-                  <div>
+def prune_removed_sources(manifest):
 
-                    <strong data-i18n="location-label" style="color: #6b7280; font-size: 1rem; display: block; margin-bottom: 0.5rem;">Äá»‹a chá»‰</strong>
+    # Drop outputs of content files that were deleted, unless a live source still feeds them,
 
-                    <span data-i18n="location" style="font-size: 1.1rem; color: #2d3748; font-weight: 500;">TP. Há» ChÃ­ Minh</span>
+    # and aggregate pages this build did not produce (index pages past the last one).
 
-                  </div>
+    # Returns the outputs deleted.
 
-                </div>
+    removed = [k for k in manifest['sources'] if k not in manifest['seen']]
 
-                <div style="padding: 1.5rem 2rem; background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); border-left: 4px solid #667eea; border-radius: 8px; font-style: italic; color: #4b5563; font-size: 1.05rem; line-height: 1.6; max-width: 600px;">
+    live = set()
 
-                  "<span data-i18n="slogan">CÃ´ng nghá»‡ luÃ´n thay Ä‘á»•i, tÃ´i chá»n cÃ¡ch há»c há»i má»—i ngÃ y Ä‘á»ƒ khÃ´ng bá»‹ bá» láº¡i phÃ­a sau.</span></div>
+    for key in manifest['seen']:
 
-              </div>
+        live.update(manifest['sources'].get(key, {}).get('outputs', []))
 
-            </div>
+    deleted = []
 
-          </div>
+    for key in removed:
 
-        </div>
+        for output in manifest['sources'].pop(key).get('outputs', []):
 
-      </section>
+            if output not in live and remove_output(os.path.join(PUBLIC, *output.split('/'))):
 
-      
+                manifest['pages'].pop(output, None)
 
-      <section class="about-section" style="max-width: 90%; margin: 2rem auto; padding: 0 2rem;">
+                deleted.append(output)
 
-        <h2 data-i18n="education" style="text-align: center; margin-bottom: 3rem; font-size: 2rem;">Há»c váº¥n</h2>
+    for output in [o for o in manifest['pages'] if o not in manifest['seen']]:
 
-        
+        del manifest['pages'][output]
 
-        <div class="education-card" style="background: white; padding: 2.5rem; border-radius: 16px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); transition: all 0.3s ease; cursor: pointer; border: 2px solid transparent; max-width: 900px; margin: 0 auto; position: relative; overflow: hidden;">
+        out_path = os.path.join(PUBLIC, *output.split('/'))
 
-          <div style="position: relative; z-index: 1;">
+        if remove_output(out_path):
 
-            <h3 style="color: #4b5563; font-size: 1.5rem; font-weight: 700; margin-bottom: 1rem;">
+            deleted.append(output)
 
-              <span data-i18n="university">Äáº¡i há»c CÃ´ng nghá»‡ TP.HCM (HUTECH)</span> | 2022 - 2026
+            for ext in SIBLING_EXTS:
 
-            </h3>
+                remove_output(out_path + ext)
 
-            <p style="color: #6b7280; font-size: 1.1rem; margin-bottom: 2rem;">
+            parent = os.path.dirname(out_path)
 
-              <span data-i18n="major-label">NgÃ nh</span>: <strong data-i18n="major" style="color: #4b5563;">CÃ´ng nghá»‡ Pháº§n má»m</strong>
+            while os.path.abspath(parent) != os.path.abspath(PUBLIC) and not os.listdir(parent):
 
-            </p>
+                os.rmdir(parent)  # posts/page/<n>/ once its last language is gone
 
-            
+                parent = os.path.dirname(parent)
 
-            <h4 data-i18n="knowledge-title" style="color: #4b5563; font-size: 1.2rem; font-weight: 600; margin-bottom: 1rem;">Kiáº¿n thá»©c chuyÃªn mÃ´n:</h4>
+    return deleted
 
-            <ul style="list-style: none; padding: 0; margin: 0; display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 0.8rem;">
 
-              <li data-i18n="knowledge-1" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem; transition: all 0.3s ease;">Láº­p trÃ¬nh hÆ°á»›ng Ä‘á»‘i tÆ°á»£ng (OOP)</li>
 
-              <li data-i18n="knowledge-2" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem; transition: all 0.3s ease;">Cáº¥u trÃºc dá»¯ liá»‡u & Giáº£i thuáº­t</li>
+def sync_file(src, dst):
 
-              <li data-i18n="knowledge-3" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem; transition: all 0.3s ease;">Láº­p trÃ¬nh máº¡ng & Distributed Systems</li>
+    # Copy src over dst unless dst already has the same content: same size and mtime, or
 
-              <li data-i18n="knowledge-4" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem; transition: all 0.3s ease;">Database Design & Management</li>
+    # failing that the same hash. The copy lands in a temp file that replaces dst, and
 
-              <li data-i18n="knowledge-5" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem; transition: all 0.3s ease;">Software Engineering & Design Patterns</li>
+    # shutil.copyfile streams it in the kernel (sendfile) rather than through Python.
 
-            </ul>
+    # Returns (copied, size).
 
-          </div>
+    st = os.stat(src)
 
-        </div>
+    try:
 
-      </section>
+        dt = os.stat(dst)
 
-      
+    except FileNotFoundError:
 
-      <section class="about-section" style="max-width: 90%; margin: 2rem auto; padding: 0 2rem;">
+        dt = None
 
-        <h2 data-i18n="programming-skills" style="text-align: center; margin-bottom: 3rem; font-size: 2rem;">Ká»¹ nÄƒng láº­p trÃ¬nh Ä‘Ã£ há»c</h2>
+    if dt is not None and dt.st_size == st.st_size:
 
-        
+        same = dt.st_mtime_ns == st.st_mtime_ns or file_digest(src) == file_digest(dst)
 
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; max-width: 1200px; margin: 0 auto;">
+        if same:
 
-          <!-- Backend Card -->
+            if dt.st_mtime_ns != st.st_mtime_ns:
 
-          <div class="skill-card" style="background: white; padding: 2rem; border-radius: 16px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); transition: all 0.3s ease; cursor: pointer; border: 2px solid transparent;">
+                os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))  # stat fast path next time
 
-            <h3 data-i18n="backend-dev" style="color: #4b5563; margin-bottom: 1.5rem; font-size: 1.5rem; font-weight: 700;">Backend Development</h3>
+            return False, st.st_size
 
-            <ul style="list-style: none; padding: 0; margin: 0;">
+    tmp = dst + '.tmp'
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Java (Spring Boot, Socket Programming, Multithreading, NIO)</li>
+    shutil.copyfile(src, tmp)
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Node.js (Express.js, Socket.IO, REST API)</li>
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Database: MySQL, PostgreSQL, MongoDB</li>
+    os.replace(tmp, dst)
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">API Design (RESTful, WebSocket)</li>
+    return True, st.st_size
 
-            </ul>
 
-          </div>
 
-          
+def list_static_files():
 
-          <!-- Frontend Card -->
+    # Every file under static/ at any depth as a '/'-separated relative path; dotfiles skipped
 
-          <div class="skill-card" style="background: white; padding: 2rem; border-radius: 16px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); transition: all 0.3s ease; cursor: pointer; border: 2px solid transparent;">
+    files = []
 
-            <h3 data-i18n="frontend-dev" style="color: #4b5563; margin-bottom: 1.5rem; font-size: 1.5rem; font-weight: 700;">Frontend Development</h3>
+    for dirpath, dirnames, filenames in os.walk(STATIC):
 
-            <ul style="list-style: none; padding: 0; margin: 0;">
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">HTML5, CSS3, JavaScript (ES6+)</li>
+        rel_dir = os.path.relpath(dirpath, STATIC).replace(os.sep, '/')
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">React/Vue.js basics</li>
+        for filename in sorted(filenames):
 
-              <li data-i18n="responsive-design" style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Responsive Web Design</li>
+            if not filename.startswith('.'):
 
-            </ul>
+                files.append(filename if rel_dir == '.' else f'{rel_dir}/{filename}')
 
-          </div>
+    return files
 
-          
 
-          <!-- Tools Card -->
 
-          <div class="skill-card" style="background: white; padding: 2rem; border-radius: 16px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); transition: all 0.3s ease; cursor: pointer; border: 2px solid transparent;">
+def copy_static():
 
-            <h3 data-i18n="tools-tech" style="color: #4b5563; margin-bottom: 1.5rem; font-size: 1.5rem; font-weight: 700;">Tools & Technologies</h3>
+    # Mirror static/ into public/, copying in a thread pool. Files an earlier sync published
 
-            <ul style="list-style: none; padding: 0; margin: 0;">
+    # (listed in .build_cache/static.json) that are gone from static/ are deleted; nothing
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Git/GitHub</li>
+    # else in public/ is touched, since pages and other build outputs live there too.
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Docker basics</li>
+    stats = {'files': list_static_files(), 'copied': 0, 'copied_bytes': 0,
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Postman, VS Code</li>
+             'skipped': 0, 'skipped_bytes': 0, 'deleted': 0}
 
-              <li style="padding: 0.5rem 0; color: #6b7280; font-size: 1rem;">Linux command line</li>
+    for rel_dir in sorted({os.path.dirname(rel) for rel in stats['files']}):
 
-            </ul>
+        ensure_dir(os.path.join(PUBLIC, *rel_dir.split('/')))
 
-          </div>
 
-        </div>
 
-      </section>
+    def sync(rel):
 
-      
+        parts = rel.split('/')
 
-      <section class="about-section" style="max-width: 90%; margin: 2rem auto; padding: 0 2rem;">
+        return sync_file(os.path.join(STATIC, *parts), os.path.join(PUBLIC, *parts))
 
-        <h2 data-i18n="projects-portfolio" style="text-align: center; margin-bottom: 3rem; font-size: 2rem;">Dá»± Ã¡n & Portfolio</h2>
 
-        
 
-        <div class="projects-card" style="background: white; padding: 2.5rem; border-radius: 16px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); transition: all 0.3s ease; cursor: pointer; border: 2px solid transparent; max-width: 900px; margin: 0 auto; position: relative; overflow: hidden;">
+    with ThreadPoolExecutor(max_workers=STATIC_WORKERS) as pool:
 
-          <div style="position: relative; z-index: 1;">
+        for copied, size in pool.map(sync, stats['files']):
 
-            <p data-i18n="blog-intro-text" style="color: #6b7280; font-size: 1.1rem; margin-bottom: 2rem; text-align: center;">CÃ¡c bÃ i viáº¿t trong blog lÃ  cÃ¡c kiáº¿n thá»©c mÃ  tÃ´i Ä‘Ã£ Ä‘Æ°á»£c há»c:</p>
+            kind = 'copied' if copied else 'skipped'
 
-            <ul style="list-style: none; padding: 0; margin: 0; display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1rem;">
+            stats[kind] += 1
 
-              <li data-i18n="project-1" style="padding: 0.8rem; color: #6b7280; font-size: 1rem; transition: all 0.3s ease; border-left: 3px solid #d1d5db;">• Xây dựng TCP/UDP Server với Java</li>
+            stats[kind + '_bytes'] += size
 
-              <li data-i18n="project-2" style="padding: 0.8rem; color: #6b7280; font-size: 1rem; transition: all 0.3s ease; border-left: 3px solid #d1d5db;">• Phát triển RESTful API với Node.js & Express</li>
 
-              <li data-i18n="project-3" style="padding: 0.8rem; color: #6b7280; font-size: 1rem; transition: all 0.3s ease; border-left: 3px solid #d1d5db;">• Triển khai WebSocket real-time communication</li>
 
-              <li data-i18n="project-4" style="padding: 0.8rem; color: #6b7280; font-size: 1rem; transition: all 0.3s ease; border-left: 3px solid #d1d5db;">• Security & CORS handling</li>
+    record_path = os.path.join(BUILD_CACHE, 'static.json')
 
-            </ul>
+    try:
 
-          </div>
+        with open(record_path, encoding='utf-8') as f:
 
-        </div>
+            previous = json.load(f)
 
-      </section>
+    except (OSError, ValueError):
 
-      
+        previous = []
 
-      {get_social_section_html()}
+    for rel in sorted(set(previous) - set(stats['files'])):
 
-  </main>
+        path = os.path.join(PUBLIC, *rel.split('/'))
 
-  {get_footer_html(site_title)}
+        if os.path.isfile(path):
 
-  <script src="/js/i18n.js?v=1.1"></script>
+            os.remove(path)
 
-  <script>
+            stats['deleted'] += 1
 
-  function toggleMenu(){{
+        parent = os.path.dirname(path)
 
-    document.body.classList.toggle('menu-open');
+        if os.path.isdir(parent):
 
-  }}
+            # and the fingerprinted copies fingerprint_assets made of it
 
-  </script>
+            for name in os.listdir(parent):
 
-</body>
+                if name != os.path.basename(path) and FINGERPRINT_RE.sub('', name) == os.path.basename(path):
 
-</html>'''
+                    os.remove(os.path.join(parent, name))
 
-    with open(os.path.join(about_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        # Remove directories the deletion left empty, up to public/
 
-        f.write(about_html)
+        while os.path.abspath(parent) != os.path.abspath(PUBLIC) and os.path.isdir(parent) and not os.listdir(parent):
 
+            os.rmdir(parent)
 
+            parent = os.path.dirname(parent)
 
-    # Posts
+    ensure_dir(BUILD_CACHE)
 
-    posts_out = os.path.join(PUBLIC, 'posts')
+    with open(record_path, 'w', encoding='utf-8') as f:
 
-    ensure_dir(posts_out)
+        json.dump(stats['files'], f)
 
-    posts = []
+    return stats
 
-    posts_en = []
 
-    posts_src = os.path.join(CONTENT, 'posts')
 
-    
+def fingerprint_assets(files, minify=False, keep_urls=()):
 
-    # Process Vietnamese and English posts
+    # Next to every published asset (the static/ files under css/, js/ and images/), write a
 
-    for fn in sorted(os.listdir(posts_src)):
+    # copy named after its content hash, and drop hashed copies that are no longer current
 
-        if not fn.endswith('.md'):
+    # (apart from keep_urls, the pruned stylesheets). With minify, CSS/JS copies are minified
 
-            continue
+    # and named after the minified bytes.
 
-        
+    # Returns (URL -> fingerprinted URL, [(URL, original bytes, minified bytes), ...]).
 
-        # Skip .en.md files in the first pass
+    urls = {}
 
-        if fn.endswith('.en.md'):
+    keep = {}
+
+    minified = []
+
+    for url in keep_urls:
+
+        path = os.path.join(PUBLIC, *url.lstrip('/').split('/'))
+
+        keep.setdefault(os.path.dirname(path), set()).add(os.path.basename(path))
+
+    for rel in files:
+
+        if rel.split('/')[0] not in ASSET_DIRS:
 
             continue
 
-            
+        rel_dir, filename = os.path.split(rel)
 
-        # Process Vietnamese post
+        path = os.path.join(PUBLIC, *rel.split('/'))
 
-        path = os.path.join(posts_src, fn)
+        stem, ext = os.path.splitext(filename)
 
-        fm, body = read_front_matter_and_body(path)
+        minifier = MINIFIERS.get(ext) if minify and not stem.endswith('.min') else None
 
-        title = fm.get('title', fn)
+        if minifier is not None:
 
-        date = fm.get('date', '')
+            with open(path, 'rb') as f:
 
-        slug = os.path.splitext(fn)[0]
+                original = f.read()
 
-        thumbnail = fm.get('thumbnail', '')
+            data = minifier(original.decode('utf-8')).encode('utf-8')
 
-        html_body = to_html_paragraphs(body)
+            hashed = f'{stem}.{hashlib.sha256(data).hexdigest()[:8]}{ext}'
 
-        
+            minified.append((f'/{rel}', len(original), len(data)))
+
+        else:
 
-        # Add featured image if thumbnail exists
+            hashed = f'{stem}.{file_digest(path)[:8]}{ext}'
 
-        featured_image_html = ''
+        hashed_path = os.path.join(os.path.dirname(path), hashed)
 
-        if thumbnail:
+        if not os.path.exists(hashed_path):
 
-            if thumbnail.startswith('http://') or thumbnail.startswith('https://') or thumbnail.startswith('/'):
+            if minifier is not None:
 
-                src = thumbnail
+                write_output(hashed_path, data)
 
             else:
 
-                src = '/images/' + thumbnail
+                # A copy rather than a hardlink: sync_file replaces the plain file on change
 
-            featured_image_html = f'<div class="featured-image"><img src="{src}" alt="{title}"></div>'
+                shutil.copyfile(path, hashed_path + '.tmp')
 
-        
+                os.replace(hashed_path + '.tmp', hashed_path)
 
-        post_html = f'''<!doctype html>
+        urls[f'/{rel}'] = f'/{rel_dir}/{hashed}'
 
-<html lang="vi">
+        keep.setdefault(os.path.dirname(path), set()).update((filename, hashed))
 
-<head>
+    for out_dir, names in keep.items():
 
-  <meta charset="utf-8">
+        for filename in os.listdir(out_dir):
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
+            if filename not in names and FINGERPRINT_RE.search(filename):
 
-  <title>{title} - {site_title}</title>
+                os.remove(os.path.join(out_dir, filename))
 
-  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>
+    return urls, minified
 
-  <link rel="stylesheet" href="/css/style.css">
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+def write_headers(urls):
 
-</head>
+    # _headers (Netlify / Cloudflare Pages format): fingerprinted files never change
 
-<body>
+    lines = []
 
-  <div class="overlay" id="overlay">
+    for url in sorted(urls):
 
-    <ul class="menu">
+        lines += [url, f'  Cache-Control: {IMMUTABLE_CACHE}', '']
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+    write_output(os.path.join(PUBLIC, '_headers'), '\n'.join(lines))
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
 
-    </ul>
+def use_page_assets(asset_urls, images, remote, minify=False, critical_css=False, icons=False, base_path=''):
 
-  </div>
+    # Also the process pool initializer, so workers rewrite pages the same way
 
-  <header>
+    global MINIFY, CRITICAL_CSS, INLINE_ICONS, BASE_PATH
 
-    <nav>
+    BASE_PATH = base_path
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
+    MINIFY = minify
 
-      <ul>
+    CRITICAL_CSS = critical_css
 
-        <li><a href="/" data-i18n="home">Home</a></li>
+    INLINE_ICONS = icons
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+    ASSET_URLS.clear()
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+    ASSET_URLS.update(asset_urls)
 
-        <li class="lang-toggle-wrapper">
+    RESPONSIVE_IMAGES.clear()
 
-          <div id="lang-switch" class="lang-switch" data-lang="vi">
+    RESPONSIVE_IMAGES.update(images)
 
-            <div class="lang-switch-slider"></div>
+    REMOTE_IMAGES.clear()
 
-            <button id="lang-vn" class="lang-btn">VN</button>
+    REMOTE_IMAGES.update(remote)
 
-            <button id="lang-en" class="lang-btn">EN</button>
 
-          </div>
 
-        </li>
+def rewrite_asset_urls(html):
 
-      </ul>
+    # "/css/style.css", '/images/a.jpg' and "/js/i18n.js?v=1.1" point at the fingerprinted copies
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+    def replace(m):
 
-    </nav>
+        url = ASSET_URLS.get(m.group(2))
 
-  </header>
+        return m.group(1) + url + m.group(1) if url else m.group(0)
 
-  <main>
+    return ASSET_REF_RE.sub(replace, html) if ASSET_URLS else html
 
-    <article class="post">
 
-      <h1>{title}</h1>
 
-      <p class="meta">{date}</p>
+def with_base_path(html):
 
-      {featured_image_html}
+    # "/posts/" -> "/your-repo/posts/" in href, src and srcset, so the site works from the
 
-      {html_body}
+    # path of baseURL (a GitHub project page); protocol-relative "//host/..." URLs are left alone
 
-    </article>
+    if not BASE_PATH:
 
-    {get_social_section_html()}
+        return html
 
-  </main>
+    html = ROOT_URL_RE.sub(lambda m: m.group(1) + BASE_PATH + '/', html)
 
-  {get_footer_html(site_title)}
+    return SRCSET_RE.sub(lambda m: m.group(1) + re.sub(r'(^|,\s*)/(?!/)', lambda c: c.group(1) + BASE_PATH + '/', m.group(2)), html)
 
-  <script src="/js/i18n.js?v=1.1"></script>
 
-  <script>
 
-  function toggleMenu(){{
+def local_stylesheet(href):
 
-    document.body.classList.toggle('menu-open');
+    # "/css/style.1a2b3c4d.css" -> its file in public/; None for stylesheets on other hosts
 
-  }}
+    if not href.startswith('/') or href.startswith('//'):
 
-  </script>
+        return None
 
-</body>
+    path = os.path.join(PUBLIC, *href.split('?')[0].lstrip('/').split('/'))
 
-</html>'''
+    return path if os.path.exists(path) else None
 
-        outpath = os.path.join(posts_out, f'{slug}.html')
 
-        with open(outpath, 'w', encoding='utf-8') as f:
 
-          f.write(post_html)
+def thumbnail_src(thumbnail):
 
-        posts.append({'title': title, 'slug': slug, 'date': date, 'summary': fm.get('summary', ''), 'thumbnail': fm.get('thumbnail','')})
+    # Bare file names in front matter refer to static/images
 
-        
+    if not thumbnail or thumbnail.startswith(('http://', 'https://', '/')):
 
-        # Process English version if exists
+        return thumbnail
 
-        en_fn = slug + '.en.md'
+    return '/images/' + thumbnail
 
-        en_path = os.path.join(posts_src, en_fn)
 
-        if os.path.exists(en_path):
 
-            fm_en, body_en = read_front_matter_and_body(en_path)
+def lang_suffix(config, lang):
 
-            title_en = fm_en.get('title', title)
+    # Pages of the default language are page.html, the others page.<lang>.html
 
-            html_body_en = to_html_paragraphs(body_en)
+    return '' if lang == config.language_code else f'.{lang}'
 
-            
 
-            # Generate English HTML
 
-            post_html_en = f'''<!doctype html>
+def localized_output(config, output, lang):
 
-<html lang="en">
+    # 'about/index.html' -> 'about/index.en.html'
 
-<head>
+    stem, ext = os.path.splitext(output)
 
-  <meta charset="utf-8">
+    return stem + lang_suffix(config, lang) + ext
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
 
-  <title>{title_en} - {site_title}</title>
 
-  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>
+def page_url(output):
 
-  <link rel="stylesheet" href="/css/style.css">
+    # 'posts/index.html' -> '/posts/', 'posts/index.en.html' -> '/posts/index.en.html'
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+    url = '/' + output
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
+    return url[:-len('index.html')] if url.endswith('/index.html') else url
 
-</head>
 
-<body data-lang="en">
 
-  <div class="overlay" id="overlay">
+def lang_url(suffix, url):
 
-    <ul class="menu">
+    # langURL in the layouts: a link to a page of the site, in the language of the current one
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+    if not suffix or not url.startswith('/') or url.startswith('//'):
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+        return url
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
+    if url.endswith('/'):
 
-    </ul>
+        return f'{url}index{suffix}.html'
 
-  </div>
+    if url.endswith('.html') and not url.endswith(f'{suffix}.html'):
 
-  <header>
+        return url[:-len('.html')] + f'{suffix}.html'
 
-    <nav>
+    return url
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
 
-      <ul>
 
-        <li><a href="/" data-i18n="home">Home</a></li>
+def alternates(config, output, langs):
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+    # <link rel="alternate" hreflang> entries for the versions of a page in langs
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+    return [{'Lang': config.language(lang).language_code, 'URL': page_url(localized_output(config, output, lang))}
 
-        <li class="lang-toggle-wrapper">
+            for lang in langs]
 
-          <div id="lang-switch" class="lang-switch" data-lang="en">
 
-            <div class="lang-switch-slider"></div>
 
-            <button id="lang-vn" class="lang-btn">VN</button>
+def page_context(config, lang, **page):
 
-            <button id="lang-en" class="lang-btn">EN</button>
+    # What the layouts see as "." - Hugo-style field names over the config and page data
 
-          </div>
+    context = {'Site': config, 'Lang': lang, 'LanguageCode': config.language(lang).language_code, 'Title': '',
 
-        </li>
+               'LangSuffix': lang_suffix(config, lang), 'Alternates': []}
 
-      </ul>
+    context.update(page)
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+    return context
 
-    </nav>
 
-  </header>
 
-  <main>
+@lru_cache(maxsize=8)
 
-    <article class="post">
+def _read_translations(path, mtime_ns, size):
 
-      <h1>{title_en}</h1>
+    with open(path, encoding='utf-8') as f:
 
-      <p class="meta">{date}</p>
+        return parse_toml(f.read())
 
-      {featured_image_html}
 
-      {html_body_en}
 
-    </article>
+def translations(lang):
 
-    {get_social_section_html()}
+    # {key: text} from i18n/<lang>.toml, re-read only when the file changes
 
-  </main>
+    path = os.path.join(I18N, lang + '.toml')
 
-  {get_footer_html(site_title)}
+    try:
 
-  <script src="/js/i18n.js?v=1.1"></script>
+        st = os.stat(path)
 
-  <script>
+    except OSError:
 
-  function toggleMenu(){{
+        return {}
 
-    document.body.classList.toggle('menu-open');
+    return _read_translations(path, st.st_mtime_ns, st.st_size)
 
-  }}
 
-  </script>
 
-</body>
+def translate_html(html, strings):
 
-</html>'''
+    # Replace the text of every data-i18n element with its translation, as i18n.js used to
 
-            outpath_en = os.path.join(posts_out, f'{slug}.en.html')
+    # do in the browser; elements nesting one of their own kind are left alone
 
-            with open(outpath_en, 'w', encoding='utf-8') as f:
+    def replace(m):
 
-                f.write(post_html_en)
+        text = strings.get(m.group(3))
 
-            posts_en.append({'title': title_en, 'slug': slug, 'date': date, 'summary': fm_en.get('summary', ''), 'thumbnail': thumbnail})
+        if not text or f'<{m.group(2)}' in m.group(4):
 
+            return m.group(0)
 
+        return m.group(1) + escape(text, quote=False) + m.group(5)
 
-    # posts index
+    return I18N_ELEMENT_RE.sub(replace, html) if strings else html
 
-    items = []
 
-    for p in posts:
 
-        thumb_html = ''
+def render_page(name, context):
 
-        if p.get('thumbnail'):
+    return translate_html(TEMPLATES.render(name, context), translations(context['Lang']))
 
-          tn = p['thumbnail']
 
-          if tn.startswith('http://') or tn.startswith('https://') or tn.startswith('/'):
 
-            src = tn
+def write_page(output, html):
 
-          else:
+    # Remote images -> local copies -> responsive <picture> -> SVG icons -> fingerprinted asset
 
-            # assume images placed in /images/
+    # URLs -> critical CSS inlined -> baseURL path prefixed -> minified. Returns (output, bytes before minifying, bytes of the
 
-            src = '/images/' + tn
+    # page, whether public/ had to be written: False when it already held this exact page).
 
-          thumb_html = f'<div class="thumb-wrap"><img src="{src}" alt="{p["title"]}" loading="lazy"></div>'
+    with stage('post-process'):
 
-        
+        html = rewrite_img_tags(localize_html(html, REMOTE_IMAGES), RESPONSIVE_IMAGES)
 
-        # Add data-i18n attribute for post titles (extract number from slug like '01-socket-java' -> 'post-01')
+        if INLINE_ICONS:
 
-        post_num = p['slug'].split('-')[0]  # Get '01', '02', etc.
+            html = inline_icons(html, ICONS)
 
-        post_i18n_key = f"post-{post_num}"
+        html = rewrite_asset_urls(html)
 
-        excerpt_i18n_key = f"excerpt-{post_num}"
+        if CRITICAL_CSS:
 
-        
+            html = inline_critical_css(html, local_stylesheet)
 
-        # Create structured card HTML
+        html = with_base_path(html)
 
-        card_content = f'''
+        data = html.encode('utf-8')
 
-        {thumb_html}
+        original = len(data)
 
-        <div class="post-card-content">
+        if MINIFY:
 
-          <a href="/posts/{p['slug']}.html" data-i18n="{post_i18n_key}">{p['title']}</a>
+            data = minify_html(html).encode('utf-8')
 
-          <p class="excerpt" data-i18n="{excerpt_i18n_key}">{p['summary']}</p>
+    with stage('write'):
 
-          <div class="post-meta">
+        changed = write_output(os.path.join(PUBLIC, *output.split('/')), data)
 
-            <span class="post-date">{p['date']}</span>
+    return output, original, len(data), changed
 
-          </div>
 
-        </div>
 
-        '''
+def render_home(config):
 
-        items.append(f'<li>{card_content}</li>')
+    # index.html and index.<lang>.html; the data-i18n spans of _index.md are translated too
 
-    posts_index = f'''<!doctype html>
+    with stage('home'):
 
-<html lang="vi">
+        home_fm, home_body = read_front_matter_and_body(os.path.join(CONTENT, '_index.md'))
 
-<head>
+        langs = [l.code for l in config.languages]
 
-  <meta charset="utf-8">
+        written = []
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
+        for lang in langs:
 
-  <title>Blog - {site_title}</title>
+            context = page_context(config, lang, Content=home_body, Alternates=alternates(config, 'index.html', langs))
 
-  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>
+            written.append(write_page(localized_output(config, 'index.html', lang), render_page('index.html', context)))
 
-  <link rel="stylesheet" href="/css/style.css">
+    return written
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
 
-</head>
+def render_about(config):
 
-<body>
+    # About page with i18n-ready content, all of it in layouts/about/list.html
 
-  <div class="overlay" id="overlay">
+    with stage('about'):
 
-    <ul class="menu">
+        langs = [l.code for l in config.languages]
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+        written = []
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+        for lang in langs:
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
+            context = page_context(config, lang, Title='About', MainStyle='padding: 0; max-width: 100%;',
 
-    </ul>
+                                   Alternates=alternates(config, 'about/index.html', langs))
 
-  </div>
+            written.append(write_page(localized_output(config, 'about/index.html', lang),
 
-  <header>
+                                      render_page('about/list.html', context)))
 
-    <nav>
+    return written
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
 
-      <ul>
 
-        <li><a href="/" data-i18n="home">Home</a></li>
+def render_post(task):
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+    # One task per post: the Vietnamese page plus its .en.md sibling if there is one.
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+    # Returns the index metadata of both so the parent process can record it, and what
 
-        <li class="lang-toggle-wrapper">
+    # write_page reported for the pages written.
 
-          <div id="lang-switch" class="lang-switch" data-lang="vi">
+    config = task['config']
 
-            <div class="lang-switch-slider"></div>
+    path = task['path']
 
-            <button id="lang-vn" class="lang-btn">VN</button>
+    en_path = task['en_path']
 
-            <button id="lang-en" class="lang-btn">EN</button>
+    slug = task['slug']
 
-          </div>
+    meta = task['meta']
 
-        </li>
+    meta_en = task['meta_en']
 
-      </ul>
+    with stage('post parse'):
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+        if task['render_vi']:
 
-    </nav>
+            fm, body = read_front_matter_and_body(path, summary=False)
 
-  </header>
+        elif meta is None:
 
-  <main>
+            fm = read_front_matter(path)  # index metadata only, the page itself is up to date
 
-    <h1 data-i18n="blog-title">Blog</h1>
+    if task['render_vi']:
 
-    <p class="blog-intro" data-i18n="blog-intro">Chia sáº» kiáº¿n thá»©c vÃ  kinh nghiá»‡m trong láº­p trÃ¬nh máº¡ng vá»›i Java vÃ  JavaScript</p>
+        with stage('post render'):
 
-    <ul class="posts">
+            content, summary = render_body(body)
 
-      {''.join(items)}
+        if not fm.get('summary'):
 
-    </ul>
+            fm['summary'] = summary
 
-    {get_social_section_html()}
+    if task['render_vi'] or meta is None:
 
-  </main>
+        meta = {'title': fm.get('title', os.path.basename(path)), 'date': fm.get('date', ''), 'summary': fm.get('summary', ''), 'thumbnail': fm.get('thumbnail', '')}
 
-  {get_footer_html(site_title)}
+        for _, taxonomy in config.taxonomies:
 
-  <script src="/js/i18n.js?v=1.1"></script>
+            meta[taxonomy] = term_names(fm.get(taxonomy))
 
-    <script>
+    title = meta['title']
 
-      function toggleMenu(){{
+    thumbnail = thumbnail_src(meta['thumbnail'])
 
-        document.body.classList.toggle('menu-open');
+    langs = [config.language_code] + (['en'] if en_path else [])
 
-      }}
+    written = []
 
-      </script>
 
-</body>
 
-</html>'''
+    if task['render_vi']:
 
-    with open(os.path.join(posts_out, 'index.html'), 'w', encoding='utf-8') as f:
+        with stage('post render'):
 
-        f.write(posts_index)
+            context = page_context(config, config.language_code, Title=title, Date=meta['date'], Thumbnail=thumbnail,
 
-    
+                                   Terms=term_links(config, meta, config.language_code), Content=content,
 
-    # Generate English posts index
+                                   Alternates=alternates(config, f'posts/{slug}.html', langs))
 
-    items_en = []
+            html = render_page('_default/single.html', context)
 
-    for p in posts_en:
+        written.append(write_page(f'posts/{slug}.html', html))
 
-        thumb_html = ''
 
-        if p.get('thumbnail'):
 
-          tn = p['thumbnail']
+    # Process English version if exists
 
-          if tn.startswith('http://') or tn.startswith('https://') or tn.startswith('/'):
+    if en_path:
 
-            src = tn
+        with stage('post parse'):
 
-          else:
+            if task['render_en']:
 
-            src = '/images/' + tn
+                fm_en, body_en = read_front_matter_and_body(en_path, summary=False)
 
-          thumb_html = f'<div class="thumb-wrap"><img src="{src}" alt="{p["title"]}" loading="lazy"></div>'
+            elif meta_en is None:
 
-        
+                fm_en = read_front_matter(en_path)
 
-        post_num = p['slug'].split('-')[0]
+        if task['render_en']:
 
-        post_i18n_key = f"post-{post_num}"
+            with stage('post render'):
 
-        excerpt_i18n_key = f"excerpt-{post_num}"
+                content_en, summary_en = render_body(body_en)
 
-        
+            if not fm_en.get('summary'):
 
-        # Create structured card HTML
+                fm_en['summary'] = summary_en
 
-        card_content = f'''
+        if task['render_en'] or meta_en is None:
 
-        {thumb_html}
+            meta_en = {'title': fm_en.get('title'), 'summary': fm_en.get('summary', '')}
 
-        <div class="post-card-content">
+        if task['render_en']:
 
-          <a href="/posts/{p['slug']}.en.html" data-i18n="{post_i18n_key}">{p['title']}</a>
+            with stage('post render'):
 
-          <p class="excerpt" data-i18n="{excerpt_i18n_key}">{p['summary']}</p>
+                context = page_context(config, 'en', Title=meta_en['title'] or title, Date=meta['date'], Thumbnail=thumbnail,
 
-          <div class="post-meta">
+                                       Terms=term_links(config, meta, 'en'), Content=content_en,
 
-            <span class="post-date">{p['date']}</span>
+                                       Alternates=alternates(config, f'posts/{slug}.html', langs))
 
-          </div>
+                html = render_page('_default/single.html', context)
 
-        </div>
+            written.append(write_page(f'posts/{slug}.en.html', html))
 
-        '''
+    cache = render_cache()
 
-        items_en.append(f'<li>{card_content}</li>')
+    if cache is not None:
 
-    
+        cache.flush()  # this may be a worker process: its renders and counts go to disk per post
 
-    posts_index_en = f'''<!doctype html>
+    return meta, meta_en, written
 
-<html lang="en">
 
-<head>
 
-  <meta charset="utf-8">
+def list_page_output(section, number):
 
-  <meta name="viewport" content="width=device-width,initial-scale=1">
+    # Page 1 of a paginated list is <section>/index.html, page n <section>/page/<n>/index.html
 
-  <title>Blog - {site_title}</title>  <link rel="icon" type="image/x-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>ðŸ‘¨"€ðŸ’»</text></svg>>  <link rel="stylesheet" href="/css/style.css">
+    return f'{section}/index.html' if number == 1 else f'{section}/page/{number}/index.html'
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
 
-  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
 
-</head>
+def paginator(config, section, lang, number, total):
 
-<body data-lang="en">
+    # .Paginator of page number of total of a list, None when it all fits on one page
 
-  <div class="overlay" id="overlay">
+    if total <= 1:
 
-    <ul class="menu">
+        return None
 
-      <li><a href="/" data-i18n="home">Home</a></li>
+    return {'Number': number, 'Total': total,
 
-      <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+            'Prev': page_url(localized_output(config, list_page_output(section, number - 1), lang)) if number > 1 else '',
 
-      <li><a href="/about/" data-i18n="about">About</a></li>
+            'Next': page_url(localized_output(config, list_page_output(section, number + 1), lang)) if number < total else ''}
 
-    </ul>
 
-  </div>
 
-  <header>
+def term_links(config, post, lang):
 
-    <nav>
+    # .Terms of a post: its tags (and categories) linked to their pages in lang
 
-      <div class="brand"><a href="/" data-i18n="site-title">{site_title}</a></div>
+    links = []
 
-      <ul>
+    for _, taxonomy in config.taxonomies:
 
-        <li><a href="/" data-i18n="home">Home</a></li>
+        for name in post.get(taxonomy, ()):
 
-        <li><a href="/posts/" data-i18n="blog">Blog</a></li>
+            slug = term_slug(name)
 
-        <li><a href="/about/" data-i18n="about">About</a></li>
+            if slug:
 
-        <li class="lang-toggle-wrapper">
+                links.append({'Name': name, 'URL': page_url(localized_output(config, f'{taxonomy}/{slug}/index.html', lang))})
 
-          <div id="lang-switch" class="lang-switch" data-lang="en">
+    return links
 
-            <div class="lang-switch-slider"></div>
 
-            <button id="lang-vn" class="lang-btn">VN</button>
 
-            <button id="lang-en" class="lang-btn">EN</button>
+def post_cards(config, posts, lang):
 
-          </div>
+    # .Pages of a list page: one card per post, linking to the post in lang
 
-        </li>
+    suffix = lang_suffix(config, lang)
 
-      </ul>
+    return [{'Title': p['title'], 'Summary': p['summary'], 'Date': p['date'],
 
-      <div class="menu-toggle" onclick="toggleMenu()" aria-label="menu">˜°</div>
+             'Thumbnail': thumbnail_src(p.get('thumbnail')),
 
-    </nav>
+             'RelPermalink': f"/posts/{p['slug']}{suffix}.html", 'Terms': term_links(config, p, lang),
 
-  </header>
+             # i18n.js keys cards by the slug's number: '01-socket-java' -> 'post-01'
 
-  <main>
+             'Number': p['slug'].split('-')[0]}
 
-    <h1 data-i18n="blog-title">Blog</h1>
+            for p in posts]
 
-    <p class="blog-intro" data-i18n="blog-intro">Sharing knowledge and experience in network programming with Java and JavaScript</p>
 
-    <ul class="posts">
 
-      {''.join(items_en)}
+def render_posts_index(config, posts, lang, langs, number=1, total=1):
 
-    </ul>
+    # Page number of total of the posts index: posts holds just the cards of this page, langs
 
-    {get_social_section_html()}
+    # the languages whose index has this page. index.html for the default language,
 
-  </main>
+    # index.<lang>.html otherwise
 
-  {get_footer_html(site_title)}
+    with stage('index pages'):
 
-  <script src="/js/i18n.js?v=1.1"></script>
+        output = localized_output(config, list_page_output('posts', number), lang)
 
-    <script>
+        context = page_context(config, lang, Title='Blog', Description=translations(lang).get('blog-intro', ''),
 
-      function toggleMenu(){{
+                               Pages=post_cards(config, posts, lang),
 
-        document.body.classList.toggle('menu-open');
+                               Paginator=paginator(config, 'posts', lang, number, total),
 
-      }}
+                               Alternates=alternates(config, list_page_output('posts', number), langs))
 
-      </script>
+        html = render_page('_default/list.html', context)
 
-</body>
+    os.makedirs(os.path.dirname(os.path.join(PUBLIC, *output.split('/'))), exist_ok=True)
 
-</html>'''
+    return [write_page(output, html)]
 
-    with open(os.path.join(posts_out, 'index.en.html'), 'w', encoding='utf-8') as f:
 
-        f.write(posts_index_en)
 
+def render_term(config, singular, taxonomy, term, posts, lang, langs, number=1, total=1):
 
+    # Page number of total of the posts filed under one term, /tags/<slug>/ and on; term is
 
-    print('Generated static site in', PUBLIC)
+    # {'name', 'slug'}, langs the languages the term has this page in
 
+    with stage('taxonomy pages'):
 
+        section = f"{taxonomy}/{term['slug']}"
 
-if __name__ == '__main__':
+        output = localized_output(config, list_page_output(section, number), lang)
+
+        context = page_context(config, lang, Title=term['name'], Singular=singular, Taxonomy=taxonomy,
+
+                               TaxonomyURL=page_url(localized_output(config, f'{taxonomy}/index.html', lang)),
+
+                               Pages=post_cards(config, posts, lang),
+
+                               Paginator=paginator(config, section, lang, number, total),
+
+                               Alternates=alternates(config, list_page_output(section, number), langs))
+
+        html = render_page('_default/term.html', context)
+
+    os.makedirs(os.path.dirname(os.path.join(PUBLIC, *output.split('/'))), exist_ok=True)
+
+    return [write_page(output, html)]
+
+
+
+def render_taxonomy(config, taxonomy, terms, lang, langs):
+
+    # The term cloud of a taxonomy, /tags/: terms as taxonomy.cloud() lists them
+
+    with stage('taxonomy pages'):
+
+        output = localized_output(config, f'{taxonomy}/index.html', lang)
+
+        entries = [{'Name': t['name'], 'Count': t['count'], 'Weight': t['weight'],
+
+                    'URL': page_url(localized_output(config, f"{taxonomy}/{t['slug']}/index.html", lang))}
+
+                   for t in terms]
+
+        context = page_context(config, lang, Title=translations(lang).get(taxonomy, taxonomy.capitalize()),
+
+                               Taxonomy=taxonomy, Terms=entries,
+
+                               Alternates=alternates(config, f'{taxonomy}/index.html', langs))
+
+        html = render_page('_default/taxonomy.html', context)
+
+    os.makedirs(os.path.dirname(os.path.join(PUBLIC, *output.split('/'))), exist_ok=True)
+
+    return [write_page(output, html)]
+
+
+
+def submit(pool, fn, *args):
+
+    # Same Future interface whether we render in the process pool or inline (--jobs 1)
+
+    if pool is not None and build_profile.active():
+
+        # The worker profiles the call itself; its stage figures are added to ours on completion
+
+        future = Future()
+
+
+
+        def done(inner):
+
+            try:
+
+                result, stages = inner.result()
+
+            except Exception as e:
+
+                future.set_exception(e)
+
+                return
+
+            build_profile.merge(stages)
+
+            future.set_result(result)
+
+
+
+        pool.submit(build_profile.profiled_call, fn, *args).add_done_callback(done)
+
+        return future
+
+    if pool is not None:
+
+        return pool.submit(fn, *args)
+
+    future = Future()
+
+    try:
+
+        future.set_result(fn(*args))
+
+    except Exception as e:
+
+        future.set_exception(e)
+
+    return future
+
+
+
+def render_site(config, manifest, pool, changed=None):
+
+    # Every page that comes from content/: the ones whose sources changed (or, with changed
+
+    # given, whose sources are in it) are rendered. Returns what write_page reported.
+
+    written = []
+
+    pending = []  # (future, sources, aggregate pages) of home, about and the index pages
+
+    failed = []
+
+
+
+    def result(future, sources=(), pages=()):
+
+        # What a task returned, or None when it raised: its sources and pages are then left to
+
+        # render again, and the first error is raised once the other tasks are collected
+
+        try:
+
+            return future.result()
+
+        except Exception as e:
+
+            for path in sources:
+
+                forget_source(manifest, path)
+
+            for output in pages:
+
+                manifest['pages'].pop(output, None)
+
+            failed.append(e)
+
+            return None
+
+
+
+    def collect_pending():
+
+        for future, sources, pages in pending:
+
+            written.extend(result(future, sources, pages) or [])
+
+        pending.clear()
+
+        if failed:
+
+            raise failed[0]
+
+
+
+    def render_if_changed(output, state, fn, *args):
+
+        # Aggregate pages: rendered when what they list (state) differs from the last build
+
+        if page_changed(manifest, output, state):
+
+            pending.append((submit(pool, fn, *args), (), (output,)))
+
+            manifest['rendered'] += 1
+
+        else:
+
+            manifest['skipped'] += 1
+
+
+
+    # Home and About, one page per language
+
+    home_outputs = [localized_output(config, 'index.html', l.code) for l in config.languages]
+
+    home_src = os.path.join(CONTENT, '_index.md')
+
+    if source_stale(manifest, home_src, home_outputs, changed):
+
+        pending.append((submit(pool, render_home, config), (home_src,), ()))
+
+        manifest['rendered'] += len(home_outputs)
+
+    else:
+
+        manifest['skipped'] += len(home_outputs)
+
+    record_source(manifest, home_src, home_outputs)
+
+
+
+    ensure_dir(os.path.join(PUBLIC, 'about'))
+
+    about_outputs = [localized_output(config, 'about/index.html', l.code) for l in config.languages]
+
+    about_src = os.path.join(CONTENT, 'about', '_index.md')
+
+    if source_stale(manifest, about_src, about_outputs, changed):
+
+        pending.append((submit(pool, render_about, config), (about_src,), ()))
+
+        manifest['rendered'] += len(about_outputs)
+
+    else:
+
+        manifest['skipped'] += len(about_outputs)
+
+    record_source(manifest, about_src, about_outputs)
+
+
+
+    # Posts
+
+    posts_out = os.path.join(PUBLIC, 'posts')
+
+    ensure_dir(posts_out)
+
+    posts = []
+
+    posts_en = []
+
+    posts_src = os.path.join(CONTENT, 'posts')
+
+    post_tasks = []
+
+    filenames = sorted(os.listdir(posts_src))
+
+    present = set(filenames)
+
+    
+
+    # Process Vietnamese and English posts
+
+    for fn in filenames:
+
+        if not fn.endswith('.md'):
+
+            continue
+
+        
+
+        # Skip .en.md files in the first pass
+
+        if fn.endswith('.en.md'):
+
+            continue
+
+        
+
+        path = os.path.join(posts_src, fn)
+
+        slug = os.path.splitext(fn)[0]
+
+        en_path = os.path.join(posts_src, slug + '.en.md')
+
+        if slug + '.en.md' not in present:
+
+            en_path = None
+
+        with stage('change detection'):
+
+            render_vi = source_stale(manifest, path, [f'posts/{slug}.html'], changed)
+
+            # The page links its English version (hreflang) only while there is one
+
+            render_vi = render_vi or manifest['sources'].get(source_key(path), {}).get('en') != bool(en_path)
+
+            meta = source_meta(manifest, path)
+
+            meta_en = None
+
+            render_en = False
+
+            if en_path:
+
+                en_stale = source_stale(manifest, en_path, [f'posts/{slug}.en.html'], changed)
+
+                meta_en = source_meta(manifest, en_path)
+
+                render_en = render_vi or en_stale
+
+        task = {'config': config, 'path': path, 'en_path': en_path, 'slug': slug,
+
+                'meta': meta, 'meta_en': meta_en, 'render_vi': render_vi, 'render_en': render_en}
+
+        future = None
+
+        if render_vi or render_en or meta is None or (en_path and meta_en is None):
+
+            future = submit(pool, render_post, task)
+
+        rendered = int(render_vi) + int(render_en)
+
+        manifest['rendered'] += rendered
+
+        manifest['skipped'] += (2 if en_path else 1) - rendered
+
+        post_tasks.append((task, future))
+
+
+
+    for task, future in post_tasks:
+
+        done = result(future, [p for p in (task['path'], task['en_path']) if p]) if future else (task['meta'], task['meta_en'], [])
+
+        if done is None:
+
+            continue
+
+        meta, meta_en, pages = done
+
+        written.extend(pages)
+
+        slug = task['slug']
+
+        en_outputs = [f'posts/{slug}.en.html'] if task['en_path'] else []
+
+        record_source(manifest, task['path'], [f'posts/{slug}.html'] + en_outputs + ['posts/index.html', 'posts/index.en.html'], meta,
+
+                      en=bool(task['en_path']))
+
+        terms = {taxonomy: meta.get(taxonomy, []) for _, taxonomy in config.taxonomies}
+
+        posts.append({'title': meta['title'], 'slug': slug, 'date': meta['date'], 'summary': meta['summary'], 'thumbnail': meta['thumbnail'], **terms})
+
+        if task['en_path']:
+
+            record_source(manifest, task['en_path'], [f'posts/{slug}.en.html', 'posts/index.en.html'], meta_en)
+
+            posts_en.append({'title': meta_en['title'] or meta['title'], 'slug': slug, 'date': meta['date'], 'summary': meta_en['summary'], 'thumbnail': meta['thumbnail'], **terms})
+
+
+
+    if failed:
+
+        collect_pending()  # no index page is rendered without the posts that failed
+
+
+
+    # posts index, config.paginate cards per page; each page is its own task
+
+    # The languages can have different page counts: posts without an .en.md are only in the first
+
+    listings = ((config.language_code, posts), ('en', posts_en))
+
+    totals = {lang: max(1, -(-len(entries) // config.paginate)) for lang, entries in listings}
+
+    for lang, entries in listings:
+
+        total = totals[lang]
+
+        for number in range(1, total + 1):
+
+            cards = entries[(number - 1) * config.paginate:number * config.paginate]
+
+            langs = [l for l, _ in listings if totals[l] >= number]
+
+            render_if_changed(localized_output(config, list_page_output('posts', number), lang),
+
+                              {'cards': cards, 'number': number, 'total': total, 'langs': langs},
+
+                              render_posts_index, config, cards, lang, langs, number, total)
+
+
+
+    # Taxonomies: the inverted index term -> posts of each language, then a term cloud per taxonomy
+
+    # and paginated pages per term. Like the posts index, a page is only rendered again when its
+
+    # cards change, so a new post re-renders the pages of its own terms and the clouds.
+
+    with stage('taxonomy index'):
+
+        indexes = {lang: build_index(entries, [taxonomy for _, taxonomy in config.taxonomies])
+
+                   for lang, entries in listings}
+
+    for singular, taxonomy in config.taxonomies:
+
+        langs = [lang for lang, _ in listings if indexes[lang][taxonomy]]
+
+        for lang in langs:
+
+            terms = indexes[lang][taxonomy]
+
+            entries = cloud(terms)
+
+            render_if_changed(localized_output(config, f'{taxonomy}/index.html', lang), {'terms': entries, 'langs': langs},
+
+                              render_taxonomy, config, taxonomy, entries, lang, langs)
+
+            for slug, term in terms.items():
+
+                # Page counts per language: a term can have fewer English posts than Vietnamese ones
+
+                term_totals = {l: -(-len(indexes[l][taxonomy][slug]['posts']) // config.paginate)
+
+                               for l in langs if slug in indexes[l][taxonomy]}
+
+                total = term_totals[lang]
+
+                for number in range(1, total + 1):
+
+                    cards = term['posts'][(number - 1) * config.paginate:number * config.paginate]
+
+                    page_langs = [l for l, l_total in term_totals.items() if l_total >= number]
+
+                    render_if_changed(localized_output(config, list_page_output(f'{taxonomy}/{slug}', number), lang),
+
+                                      {'name': term['name'], 'cards': cards, 'number': number, 'total': total, 'langs': page_langs},
+
+                                      render_term, config, singular, taxonomy, {'name': term['name'], 'slug': slug},
+
+                                      cards, lang, page_langs, number, total)
+
+
+
+    collect_pending()
+
+    return written
+
+
+
+def output_counts(written, deleted):
+
+    # What the build did to public/: pages rendered to the bytes already there were not rewritten
+
+    changed = sum(1 for page in written if page[3])
+
+    return (f'public/: {changed} page(s) written, {len(written) - changed} identical and left untouched, '
+
+            f'{len(deleted)} deleted')
+
+
+
+def rebuild_content(changed):
+
+    # Targeted watch-mode rebuild, see build(): the assets, config and manifest of the last build
+
+    # are reused and nothing but the changed sources and the posts indexes is looked at
+
+    manifest = WATCH_STATE['manifest']
+
+    manifest.update({'full': False, 'seen': set(), 'rendered': 0, 'skipped': 0})
+
+    written = render_site(load_config(), manifest, None, changed)
+
+    deleted = prune_removed_sources(manifest)
+
+    WATCH_STATE['unsaved'] = True  # written once the server stops, see __main__
+
+    print(f"Rendered {manifest['rendered']} page(s), {manifest['skipped']} unchanged; {output_counts(written, deleted)}")
+
+    return written
+
+
+
+def build(force=False, jobs=1, localize_images=False, offline=False, minify=False, critical_css=False,
+
+          prune_css=False, icons=False, profile=False, changed=None):
+
+    # changed: the content files (.md) edited since the previous build() in this process, which
+
+    # must have run with the same options. Only their pages and the posts indexes are looked at;
+
+    # static files, assets and every other source are trusted to be as that build left them.
+
+    if changed is not None and WATCH_STATE:
+
+        return rebuild_content(changed)
+
+    if profile:
+
+        started = time.perf_counter(), time.process_time()
+
+        cprofile = build_profile.start()
+
+    ensure_dir(PUBLIC)
+
+    with stage('static copy'):
+
+        static_stats = copy_static()
+
+    with stage('assets'):
+
+        # Pages link the pruned stylesheets of the previous build right away: when pruning gives
+
+        # the same result again, unchanged pages come out byte-identical and are not rewritten
+
+        pruned_path = os.path.join(BUILD_CACHE, 'pruned-css.json')
+
+        previous_pruned = {}
+
+        if prune_css and os.path.exists(pruned_path):
+
+            with open(pruned_path, encoding='utf-8') as f:
+
+                previous_pruned = json.load(f)
+
+        asset_urls, minified_assets = fingerprint_assets(static_stats['files'], minify, previous_pruned.values())
+
+        page_urls = dict(asset_urls)
+
+        for url, pruned_url in previous_pruned.items():
+
+            if url in page_urls and os.path.exists(os.path.join(PUBLIC, *pruned_url.lstrip('/').split('/'))):
+
+                page_urls[url] = pruned_url
+
+        image_sources = [('/' + rel, os.path.join(STATIC, *rel.split('/')))
+
+                         for rel in static_stats['files'] if rel.startswith('images/')]
+
+        remote = {}
+
+        if localize_images:
+
+            # Remote images referenced by posts become local files, resized like the rest
+
+            content_files = [os.path.join(dirpath, f) for dirpath, _, filenames in os.walk(CONTENT)
+
+                             for f in sorted(filenames) if f.endswith('.md')]
+
+            remote, remote_files, remote_stats = localize(content_files, PUBLIC, BUILD_CACHE, offline)
+
+            image_sources += remote_files
+
+        images = derivatives(image_sources, PUBLIC, BUILD_CACHE, jobs)
+
+    with stage('config'):
+
+        config = load_config()
+
+        TEMPLATES.reset()
+
+    use_page_assets(page_urls, images, remote, minify, critical_css, icons, config.base_path)
+
+    with stage('manifest'):
+
+        manifest = load_manifest(force, {'urls': asset_urls, 'images': images, 'remote': remote,
+
+                                         'minify': minify, 'critical_css': critical_css, 'prune_css': prune_css,
+
+                                         'icons': icons, 'base_path': config.base_path})
+
+
+
+    cache = render_cache()
+
+    cache_counters = cache.counters() if cache is not None else None
+
+
+
+    # Change detection stays in this process; only the page rendering is farmed out
+
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=use_page_assets, initargs=(page_urls, images, remote, minify, critical_css, icons, config.base_path)) if jobs > 1 else None
+
+    written = []
+
+    try:
+
+        written = render_site(config, manifest, pool)
+
+    finally:
+
+        if pool is not None:
+
+            pool.shutdown()
+
+
+
+    with stage('manifest'):
+
+        deleted = prune_removed_sources(manifest)
+
+        save_manifest(manifest)
+
+    WATCH_STATE.update(manifest=manifest, unsaved=False)
+
+    immutable_urls = list(asset_urls.values()) + list(remote.values()) + derived_urls(images)
+
+    if prune_css:
+
+        # Needs every page in place: selectors are kept if anything on the site can match them
+
+        with stage('prune css'):
+
+            pruned = prune_stylesheets(PUBLIC, {url: asset_urls[url] for url in asset_urls if url.endswith('.css')},
+
+                                       [os.path.join(STATIC, *rel.split('/')) for rel in static_stats['files'] if rel.endswith('.js')],
+
+                                       minify_css if minify else None)
+
+        immutable_urls += [r['pruned_url'] for r in pruned]
+
+        write_output(pruned_path, json.dumps({r['url']: r['pruned_url'] for r in pruned}, sort_keys=True))
+
+    write_headers(immutable_urls)
+
+    with stage('precompress'):
+
+        compress_stats = precompress(PUBLIC, BUILD_CACHE, jobs)
+
+    if cache is not None:
+
+        cache_evicted = cache.evict()
+
+    if profile:
+
+        ensure_dir(BUILD_CACHE)
+
+        profile_path = os.path.join(BUILD_CACHE, 'build.prof')
+
+        profiler = build_profile.stop(cprofile, profile_path)
+
+        profile_table = build_profile.profile_report(profiler, time.perf_counter() - started[0],
+
+                                                     time.process_time() - started[1], profile_path, jobs)
+
+    print(f"Static files: {static_stats['copied']} copied ({static_stats['copied_bytes'] / 1024:.1f} KB), "
+
+          f"{static_stats['skipped']} unchanged ({static_stats['skipped_bytes'] / 1024:.1f} KB skipped), "
+
+          f"{static_stats['deleted']} deleted")
+
+    if localize_images:
+
+        print(f"Remote images: {remote_stats['downloaded']} downloaded, {remote_stats['cached']} from cache, "
+
+              f"{remote_stats['failed']} left remote")
+
+    if images:
+
+        print(f"Responsive images: {len(images)} source(s), {len(derived_urls(images))} derivative(s)")
+
+    elif image_sources and not available_formats():
+
+        print('Responsive images: skipped, Pillow is not installed')
+
+    print(f"Rendered {manifest['rendered']} page(s), {manifest['skipped']} unchanged; {output_counts(written, deleted)}")
+
+    if cache is not None:
+
+        print(cache_report(cache, cache_counters, cache_evicted))
+
+    if minify:
+
+        print(minify_report(written, minified_assets))
+
+    if icons:
+
+        # Every fa-* icon on the site's pages, and whether icons/ has an SVG for it
+
+        used = used_icons([os.path.join(dirpath, f) for dirpath, _, filenames in sorted(os.walk(PUBLIC))
+
+                           for f in sorted(filenames) if f.endswith('.html')])
+
+        missing = [f'{style}/{name}' for style, name in used
+
+                   if not os.path.exists(os.path.join(ICONS, style, name + '.svg'))]
+
+        print(f"Icons: {len(used)} used, {len(used) - len(missing)} inlined as SVG"
+
+              + (f", missing from icons/ (pages using them keep Font Awesome): {', '.join(missing)}" if missing else ''))
+
+    if prune_css:
+
+        print(prune_report(pruned, os.path.join(BUILD_CACHE, 'unused-css.txt')))
+
+    print(size_report(compress_stats))
+
+    if profile:
+
+        print(profile_table)
+
+    print('Generated static site in', PUBLIC)
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Generate the static site into public/')
+
+    parser.add_argument('command', nargs='?', choices=('build', 'serve'), default='build',
+
+                        help='serve: build, then preview public/ on a local server (default: build)')
+
+    parser.add_argument('--force', action='store_true', help='ignore the build manifest and regenerate every page')
+
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+
+                        help='render pages in N worker processes (0 = one per CPU)')
+
+    parser.add_argument('--localize-images', action='store_true',
+
+                        help='download remote images used by posts and serve local, resized copies')
+
+    parser.add_argument('--offline', action='store_true',
+
+                        help='with --localize-images, only use images already in the cache')
+
+    parser.add_argument('--minify', action='store_true',
+
+                        help='minify the generated HTML and the CSS/JS it links to')
+
+    parser.add_argument('--critical-css', action='store_true',
+
+                        help='inline the CSS each page needs and load the stylesheets without blocking rendering')
+
+    parser.add_argument('--prune-css', action='store_true',
+
+                        help='drop CSS selectors that match nothing on the generated site')
+
+    parser.add_argument('--inline-icons', action='store_true',
+
+                        help='replace the Font Awesome stylesheet with inline SVG icons from icons/')
+
+    parser.add_argument('--profile', action='store_true',
+
+                        help='print time, I/O and memory per build stage and dump cProfile data to .build_cache/build.prof')
+
+    parser.add_argument('--watch', action='store_true',
+
+                        help='with serve, rebuild when content/, static/, layouts/, i18n/, icons/ or config.toml change '
+
+                             'and reload the open pages')
+
+    parser.add_argument('--host', default='127.0.0.1', help='with serve, the address to listen on (default: %(default)s)')
+
+    parser.add_argument('--port', type=int, default=1313, help='with serve, the port to listen on (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    options = dict(jobs=args.jobs or os.cpu_count(), localize_images=args.localize_images, offline=args.offline,
+
+                   minify=args.minify, critical_css=args.critical_css, prune_css=args.prune_css,
+
+                   icons=args.inline_icons)
+
+    build(force=args.force, profile=args.profile, **options)
+
+    if args.command == 'serve':
+
+        def rebuild(changed):
+
+            # Edits to posts and the home/about pages only re-render what they feed
+
+            if all(p.endswith('.md') and os.path.abspath(p).startswith(os.path.abspath(CONTENT) + os.sep) for p in changed):
+
+                build(changed=changed, **options)
+
+            else:
 
-    build()
+                build(**options)
 
+        try:
 
+            serve(PUBLIC, args.host, args.port, [CONTENT, STATIC, LAYOUTS, I18N, ICONS, os.path.join(ROOT, 'config.toml')],
 
+                  rebuild if args.watch else None, load_config().base_path)
 
+        finally:
 
+            if WATCH_STATE.pop('unsaved', False):
 
+                save_manifest(WATCH_STATE['manifest'])
 
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Inline SVG icons in place of the Font Awesome web font.
+
+The pages use Font Awesome markup, <i class="fab fa-github"></i>. icons/ holds
+one SVG per icon the site uses, laid out like the svgs/ folder of the Font
+Awesome download (icons/brands/github.svg, icons/solid/envelope.svg). For
+every page whose icons are all there, each <i> gets an <svg><use> of its
+symbol, the symbols of the icons on that page are inlined once after <body>,
+and the Font Awesome stylesheet link is dropped, so the page no longer
+touches the CDN. A page that uses an icon missing from icons/ is left alone
+and keeps the stylesheet.
+"""
+import os
+import re
+from functools import lru_cache
+
+# Style class -> folder under icons/
+STYLE_DIRS = {
+    'fab': 'brands', 'fa-brands': 'brands',
+    'fas': 'solid', 'fa-solid': 'solid', 'fa': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+}
+# fa-* classes that are modifiers, not icon names (fa-icon is the class of the inlined <svg>)
+MODIFIERS = {'fa-icon', 'fa-fw', 'fa-lg', 'fa-xs', 'fa-sm', 'fa-xl', 'fa-2x', 'fa-3x', 'fa-4x', 'fa-5x',
+             'fa-spin', 'fa-pulse', 'fa-border', 'fa-inverse', 'fa-solid', 'fa-regular', 'fa-brands'}
+
+ICON_RE = re.compile(r'''<i\b[^>]*\sclass=["']([^"']*\bfa-[^"']*)["'][^>]*>\s*</i>''')
+CLASS_RE = re.compile(r'''\sclass=["']([^"']*\bfa-[^"']*)["']''')
+FONT_AWESOME_LINK_RE = re.compile(r'''\s*<link\b[^>]*\bhref=["'][^"']*font-?awesome[^"']*["'][^>]*>''', re.I)
+BODY_RE = re.compile(r'<body\b[^>]*>')
+VIEWBOX_RE = re.compile(r'''\sviewBox=["']([^"']*)["']''')
+SVG_RE = re.compile(r'<svg\b[^>]*>([\s\S]*)</svg>')
+
+
+def icon_name(classes):
+    # 'fab fa-github social-icon' -> ('brands', 'github'); None if it is not an icon
+    classes = classes.split()
+    names = [c[3:] for c in classes if c.startswith('fa-') and c not in MODIFIERS]
+    if not names:
+        return None
+    style = next((STYLE_DIRS[c] for c in classes if c in STYLE_DIRS), 'solid')
+    return style, names[0]
+
+
+def used_icons(paths):
+    # The icons referenced by the given pages
+    found = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for classes in CLASS_RE.findall(f.read()):
+                icon = icon_name(classes)
+                if icon:
+                    found.add(icon)
+    return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def load_icon(icons_dir, style, name, mtime_ns):
+    # (viewBox, inner markup) of icons/<style>/<name>.svg, comments stripped
+    with open(os.path.join(icons_dir, style, name + '.svg'), encoding='utf-8') as f:
+        text = f.read()
+    viewbox = VIEWBOX_RE.search(text)
+    body = SVG_RE.search(text)
+    return viewbox.group(1) if viewbox else '0 0 512 512', re.sub(r'\s+', ' ', re.sub(r'<!--[\s\S]*?-->', '', body.group(1))).strip()
+
+
+def find_icon(icons_dir, style, name):
+    path = os.path.join(icons_dir, style, name + '.svg')
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return load_icon(icons_dir, style, name, mtime_ns)
+
+
+def inline_icons(html, icons_dir):
+    icons = {}
+    for classes in ICON_RE.findall(html):
+        icon = icon_name(classes)
+        if icon and icon not in icons:
+            icons[icon] = find_icon(icons_dir, *icon)
+    if not icons or None in icons.values():
+        return html
+    body = BODY_RE.search(html)
+    if body is None:
+        return html
+
+    def replace(m):
+        icon = icon_name(m.group(1))
+        if icon is None:
+            return m.group(0)
+        tag = m.group(0)
+        opening = tag[:tag.index('>') + 1]
+        return f'{opening}<svg class="fa-icon" aria-hidden="true"><use href="#fa-{icon[0]}-{icon[1]}"></use></svg></i>'
+
+    symbols = ''.join(f'<symbol id="fa-{style}-{name}" viewBox="{viewbox}">{markup}</symbol>'
+                      for (style, name), (viewbox, markup) in sorted(icons.items()))
+    sprite = f'\n  <svg xmlns="http://www.w3.org/2000/svg" style="display: none">{symbols}</svg>'
+    head = FONT_AWESOME_LINK_RE.sub('', html[:body.start()])
+    rest = ICON_RE.sub(replace, html[body.end():])
+    return head + body.group(0) + sprite + rest
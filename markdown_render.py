@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Small single-pass Markdown -> HTML renderer for the posts in content/.
+
+Blocks are recognised line by line in one walk over the document (fenced code,
+headings, lists, blockquotes, tables, raw HTML, images, paragraphs) and inline
+markup is tokenised with one precompiled alternation. HTML is appended to a list
+buffer and joined once at the end.
+"""
+import re
+
+# Bump when the generated HTML changes so cached renders are not reused
+RENDERER_VERSION = 1
+
+IMG_STYLE = 'max-width: 100%; height: auto; border-radius: 8px; margin: 20px 0;'
+
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})\s*([\w+#.-]*)')
+HEADING_RE = re.compile(r'^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+HR_RE = re.compile(r'^ {0,3}([-*_])(?:\s*\1){2,}\s*$')
+LIST_RE = re.compile(r'^( *)([-*+]|\d{1,9}[.)])\s+(.*)$')
+QUOTE_RE = re.compile(r'^ {0,3}> ?(.*)$')
+TABLE_SEP_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+HTML_BLOCK_RE = re.compile(r'^ {0,3}<(?:[a-zA-Z][a-zA-Z0-9-]*[\s/>]|/[a-zA-Z]|!--)')
+IMAGE_LINE_RE = re.compile(r'^!\[([^\]]*)\]\(([^)\s]+)(?:\s+"([^"]*)")?\)\s*$')
+
+INLINE_RE = re.compile(r'''
+    (?P<code>`+)(?P<code_text>.+?)(?P=code)
+  | !\[(?P<img_alt>[^\]]*)\]\((?P<img_src>[^)\s]+)(?:\s+"(?P<img_title>[^"]*)")?\)
+  | \[(?P<link_text>[^\]]+)\]\((?P<link_href>[^)\s]+)(?:\s+"(?P<link_title>[^"]*)")?\)
+  | <(?P<autolink>https?://[^>\s]+)>
+  | \*\*(?P<strong>[^\s*](?:.*?[^\s*])?)\*\*
+  | \*(?P<em>[^\s*](?:[^*]*?[^\s*])?)\*
+''', re.X)
+
+
+def escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_attr(text):
+    return escape(text).replace('"', '&quot;')
+
+
+def render_inline(text):
+    out = []
+    pos = 0
+    for m in INLINE_RE.finditer(text):
+        out.append(text[pos:m.start()])
+        pos = m.end()
+        if m.group('code') is not None:
+            out.append(f'<code>{escape(m.group("code_text").strip())}</code>')
+        elif m.group('img_src') is not None:
+            title = m.group('img_title')
+            title_attr = f' title="{escape_attr(title)}"' if title else ''
+            out.append(f'<img src="{escape_attr(m.group("img_src"))}" alt="{escape_attr(m.group("img_alt"))}"{title_attr}>')
+        elif m.group('link_href') is not None:
+            title = m.group('link_title')
+            title_attr = f' title="{escape_attr(title)}"' if title else ''
+            out.append(f'<a href="{escape_attr(m.group("link_href"))}"{title_attr}>{render_inline(m.group("link_text"))}</a>')
+        elif m.group('autolink') is not None:
+            url = m.group('autolink')
+            out.append(f'<a href="{escape_attr(url)}">{escape(url)}</a>')
+        elif m.group('strong') is not None:
+            out.append(f'<strong>{render_inline(m.group("strong"))}</strong>')
+        else:
+            out.append(f'<em>{render_inline(m.group("em"))}</em>')
+    out.append(text[pos:])
+    return ''.join(out)
+
+
+def split_row(line):
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', line)]
+
+
+def starts_block(lines, i):
+    # Lines that interrupt a running paragraph
+    line = lines[i]
+    return bool(FENCE_RE.match(line) or HEADING_RE.match(line) or HR_RE.match(line)
+                or QUOTE_RE.match(line) or LIST_RE.match(line) or HTML_BLOCK_RE.match(line)
+                or IMAGE_LINE_RE.match(line.strip())
+                or ('|' in line and i + 1 < len(lines) and TABLE_SEP_RE.match(lines[i + 1])))
+
+
+def render_blocks(lines, out, tight=False):
+    i = 0
+    n = len(lines)
+    while i < n:
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        m = FENCE_RE.match(line)
+        if m:
+            fence = m.group(1)
+            lang = m.group(2)
+            i += 1
+            code = []
+            while i < n and not lines[i].lstrip().startswith(fence):
+                code.append(lines[i])
+                i += 1
+            i += 1  # closing fence (or end of document)
+            cls = f' class="language-{escape_attr(lang)}"' if lang else ''
+            out.append(f'<pre><code{cls}>{escape(chr(10).join(code))}</code></pre>')
+            continue
+
+        m = HEADING_RE.match(line)
+        if m:
+            level = len(m.group(1))
+            out.append(f'<h{level}>{render_inline(m.group(2))}</h{level}>')
+            i += 1
+            continue
+
+        if HR_RE.match(line):
+            out.append('<hr/>')
+            i += 1
+            continue
+
+        if QUOTE_RE.match(line):
+            quoted = []
+            while i < n and lines[i].strip():
+                q = QUOTE_RE.match(lines[i])
+                quoted.append(q.group(1) if q else lines[i])
+                i += 1
+            out.append('<blockquote>')
+            render_blocks(quoted, out)
+            out.append('</blockquote>')
+            continue
+
+        m = LIST_RE.match(line)
+        if m:
+            i = render_list(lines, i, out)
+            continue
+
+        if '|' in line and i + 1 < n and TABLE_SEP_RE.match(lines[i + 1]):
+            i = render_table(lines, i, out)
+            continue
+
+        if HTML_BLOCK_RE.match(line):
+            block = []
+            while i < n and lines[i].strip():
+                block.append(lines[i])
+                i += 1
+            out.append('\n'.join(block))
+            continue
+
+        m = IMAGE_LINE_RE.match(line.strip())
+        if m:
+            alt, src, title = m.groups()
+            title_attr = f' title="{escape_attr(title)}"' if title else ''
+            out.append(f'<img src="{escape_attr(src)}" alt="{escape_attr(alt)}"{title_attr} style="{IMG_STYLE}">')
+            i += 1
+            continue
+
+        para = [line.strip()]
+        i += 1
+        while i < n and lines[i].strip() and not starts_block(lines, i):
+            para.append(lines[i].strip())
+            i += 1
+        text = '<br/>'.join(render_inline(p) for p in para)
+        out.append(text if tight else f'<p>{text}</p>')
+
+
+def render_list(lines, i, out):
+    # Collect sibling items at this indentation; deeper lines belong to the current item
+    first = LIST_RE.match(lines[i])
+    indent = len(first.group(1))
+    ordered = first.group(2)[0].isdigit()
+    tag = 'ol' if ordered else 'ul'
+    start = int(first.group(2)[:-1]) if ordered else 1
+    items = []
+    loose = False
+    n = len(lines)
+    while i < n:
+        m = LIST_RE.match(lines[i])
+        if m and len(m.group(1)) == indent and m.group(2)[0].isdigit() == ordered:
+            items.append([m.group(3)])
+            content_indent = len(m.group(1)) + len(m.group(2)) + 1
+            i += 1
+            continue
+        line = lines[i]
+        if not line.strip():
+            # A blank line continues the list only if indented content or another item follows
+            j = i + 1
+            while j < n and not lines[j].strip():
+                j += 1
+            if j < n:
+                nxt = LIST_RE.match(lines[j])
+                sibling = nxt and len(nxt.group(1)) == indent and nxt.group(2)[0].isdigit() == ordered
+                following = len(lines[j]) - len(lines[j].lstrip())
+                if sibling or following >= content_indent:
+                    loose = loose or not (nxt and len(nxt.group(1)) > indent)
+                    items[-1].extend([''] * (j - i))
+                    i = j
+                    continue
+            break
+        leading = len(line) - len(line.lstrip())
+        if leading > indent:
+            items[-1].append(line[min(leading, content_indent):])
+            i += 1
+            continue
+        if LIST_RE.match(line) or starts_block(lines, i):
+            break
+        items[-1].append(line.strip())  # lazy paragraph continuation
+        i += 1
+
+    out.append(f'<{tag}>' if start == 1 else f'<{tag} start="{start}">')
+    for item in items:
+        inner = []
+        render_blocks(item, inner, tight=not loose)
+        out.append('<li>' + '\n'.join(inner) + '</li>')
+    out.append(f'</{tag}>')
+    return i
+
+
+def render_table(lines, i, out):
+    header = split_row(lines[i])
+    aligns = []
+    for cell in split_row(lines[i + 1]):
+        if cell.startswith(':') and cell.endswith(':'):
+            aligns.append('center')
+        elif cell.endswith(':'):
+            aligns.append('right')
+        elif cell.startswith(':'):
+            aligns.append('left')
+        else:
+            aligns.append(None)
+    i += 2
+
+    def cells(row, tag):
+        html = []
+        for k, cell in enumerate(row):
+            align = aligns[k] if k < len(aligns) else None
+            attr = f' style="text-align: {align}"' if align else ''
+            html.append(f'<{tag}{attr}>{render_inline(cell)}</{tag}>')
+        return ''.join(html)
+
+    out.append('<table>')
+    out.append(f'<thead><tr>{cells(header, "th")}</tr></thead>')
+    out.append('<tbody>')
+    while i < len(lines) and lines[i].strip() and '|' in lines[i]:
+        row = split_row(lines[i])
+        row += [''] * (len(header) - len(row))
+        out.append(f'<tr>{cells(row[:len(header)], "td")}</tr>')
+        i += 1
+    out.append('</tbody>')
+    out.append('</table>')
+    return i
+
+
+def render(md):
+    out = []
+    render_blocks(md.strip().replace('\r\n', '\n').expandtabs(4).split('\n'), out)
+    return '\n'.join(out)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Minification for the pages, stylesheets and scripts generate_static.py writes.
+
+minify_html collapses whitespace between and inside tags, drops comments and
+duplicate <link> tags in <head>, and minifies inline <style> and <script>
+blocks. The content of <pre>, <code> and <textarea> is left exactly as it is.
+minify_css and minify_js are deliberately conservative: comments and
+redundant whitespace go, nothing is renamed or restructured, and JavaScript
+keeps its line breaks so automatic semicolon insertion still works.
+"""
+import re
+
+# Elements whose content is copied verbatim (script/style get their own minifier)
+RAW_TAGS = ('pre', 'code', 'textarea', 'script', 'style')
+# Whitespace next to these tags never renders, so it can go entirely
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'meta', 'link', 'title', 'script', 'style', 'base',
+    'div', 'header', 'footer', 'main', 'nav', 'section', 'article', 'aside',
+    'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'pre', 'blockquote', 'figure', 'figcaption', 'hr', 'table', 'thead', 'tbody',
+    'tfoot', 'tr', 'th', 'td', 'form', 'fieldset', 'source', 'noscript',
+}
+JS_TYPES = ('', 'text/javascript', 'application/javascript', 'module')
+
+# A tag, quote-aware: attribute values may contain '>' (the inline SVG favicon does)
+TAG = r'''<(?:"[^"]*"|'[^']*'|[^'">])*>'''
+TOKEN_RE = re.compile(r'<!--[\s\S]*?-->'
+                      r'|(<(' + '|'.join(RAW_TAGS) + r')\b(?:"[^"]*"|\'[^\']*\'|[^\'">])*>)([\s\S]*?)(</\2\s*>)'
+                      r'|' + TAG, re.I)
+TAG_NAME_RE = re.compile(r'</?([a-zA-Z][a-zA-Z0-9]*)')
+TAG_SPACE_RE = re.compile(r'''("[^"]*"|'[^']*')|\s+''')
+TYPE_RE = re.compile(r'''\stype=["']?([^"'\s>]*)''', re.I)
+CSS_COMMENT_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*[\s\S]*?\*/''')
+CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+REGEX_AFTER_RE = re.compile(r'(?:^|[^\w$])(?:return|typeof|case|do|else|in|of|void|delete|throw|new)$')
+
+
+def minify_css(text):
+    text = CSS_COMMENT_RE.sub(lambda m: m.group(1) or ' ', text)
+    parts = CSS_STRING_RE.split(text)
+    for i in range(0, len(parts), 2):  # even parts are outside strings
+        s = re.sub(r'\s+', ' ', parts[i])
+        s = re.sub(r'\s*([{};,>])\s*', r'\1', s)
+        parts[i] = re.sub(r':\s+', ':', s)  # not before ':', "a :hover" is a descendant selector
+    return re.sub(r';}', '}', ''.join(parts)).strip()
+
+
+def minify_js(text):
+    # Strips comments and indentation and collapses blank lines; strings, template
+    # literals and regex literals pass through untouched
+    out = []
+    last = ''  # last significant character written, to tell a regex literal from division
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in '"\'`':
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == '\\' else 1
+            out.append(text[i:j + 1])
+            last = c
+            i = j + 1
+        elif text.startswith('//', i):
+            j = text.find('\n', i)
+            i = n if j < 0 else j
+        elif text.startswith('/*', i):
+            j = text.find('*/', i + 2)
+            i = n if j < 0 else j + 2
+            if out and not out[-1].isspace():
+                out.append(' ')
+        elif c == '/' and (last == '' or last in '(,=:[!&|?{};+-*%<>~^'
+                           or REGEX_AFTER_RE.search(''.join(out[-4:]).rstrip())):
+            j = i + 1
+            in_class = False
+            while j < n and text[j] != '\n' and (in_class or text[j] != '/'):
+                if text[j] == '\\':
+                    j += 1
+                elif text[j] == '[':
+                    in_class = True
+                elif text[j] == ']':
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and (text[j].isalnum() or text[j] == '_'):
+                j += 1  # flags
+            out.append(text[i:j])
+            last = '/'
+            i = j
+        elif c.isspace():
+            j = i
+            while j < n and text[j].isspace():
+                j += 1
+            if '\n' in text[i:j]:
+                if out and out[-1] == ' ':
+                    out.pop()
+                if out and out[-1] != '\n':
+                    out.append('\n')
+            elif out and out[-1] not in (' ', '\n'):
+                out.append(' ')
+            i = j
+        else:
+            j = i
+            while j < n and (text[j].isalnum() or text[j] in '_$.'):
+                j += 1
+            j = max(j, i + 1)
+            out.append(text[i:j])
+            last = text[j - 1]
+            i = j
+    return ''.join(out).strip()
+
+
+def tag_name(tag):
+    m = TAG_NAME_RE.match(tag)
+    return m.group(1).lower() if m else None
+
+
+def minify_html(html):
+    # Pieces are (tag name or None, text, is_text); whitespace-only text next to a
+    # block-level tag is dropped, other runs of whitespace become one character.
+    pieces = []
+    in_head = False
+    seen_links = set()
+    pos = 0
+    for m in TOKEN_RE.finditer(html):
+        if m.start() > pos:
+            pieces.append((None, html[pos:m.start()], True))
+        pos = m.end()
+        token = m.group(0)
+        if token.startswith('<!--'):
+            if token.startswith('<!--[if'):
+                pieces.append(('!--', token, False))  # conditional comments still mean something
+            continue
+        if m.group(1):
+            name = m.group(2).lower()
+            opening, content, closing = m.group(1), m.group(3), m.group(4)
+            opening = TAG_SPACE_RE.sub(lambda t: t.group(1) or ' ', opening)
+            opening = re.sub(r'\s+(/?>)$', r'\1', opening)
+            if name == 'style':
+                content = minify_css(content)
+            elif name == 'script':
+                kind = TYPE_RE.search(opening)
+                if (kind.group(1).lower() if kind else '') in JS_TYPES:
+                    content = minify_js(content)
+            pieces.append((name, opening + content + closing, False))
+            continue
+        name = tag_name(token)
+        token = TAG_SPACE_RE.sub(lambda t: t.group(1) or ' ', token)
+        token = re.sub(r'\s+(/?>)$', r'\1', token)
+        if name == 'head':
+            in_head = not token.startswith('</')
+        elif name == 'link' and in_head:
+            if token in seen_links:
+                continue
+            seen_links.add(token)
+        pieces.append((name, token, False))
+    if pos < len(html):
+        pieces.append((None, html[pos:], True))
+
+    out = []
+    for i, (name, text, is_text) in enumerate(pieces):
+        if not is_text:
+            out.append(text)
+            continue
+        before = pieces[i - 1][0] if i > 0 else 'html'
+        after = pieces[i + 1][0] if i + 1 < len(pieces) else 'html'
+        text = re.sub(r'\s+', lambda s: '\n' if '\n' in s.group(0) else ' ', text)
+        if before is None or before in BLOCK_TAGS or before == '!--':
+            text = text.lstrip()
+        if after is None or after in BLOCK_TAGS or after == '!--':
+            text = text.rstrip()
+        out.append(text)
+    return ''.join(out)
+
+
+def minify_report(pages, assets):
+    # pages, assets: [(path, original bytes, minified bytes, ...), ...]
+    rows = sorted(page[:3] for page in pages) + sorted(assets)
+    if not rows:
+        return 'Minified nothing, every page was up to date'
+    before = sum(r[1] for r in rows)
+    after = sum(r[2] for r in rows)
+    lines = [f'Minified {len(pages)} page(s) and {len(assets)} asset(s): '
+             f'{(before - after) / 1024:.1f} KB saved ({before / 1024:.1f} KB -> {after / 1024:.1f} KB)']
+    width = max(len(r[0]) for r in rows)
+    for path, original, minified in rows:
+        share = f'-{(original - minified) * 100 // original}%' if original else ''
+        lines.append(f'  {path:<{width}}  {original / 1024:>7.1f} KB -> {minified / 1024:>7.1f} KB  {share:>5}')
+    return '\n'.join(lines)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+The one way generate_static.py and its helpers put files into public/.
+
+write_output leaves a file alone when it already holds exactly the bytes to
+be written, so an unchanged page keeps its mtime and rsync, CDN uploads and
+caches keyed on it see nothing new. Otherwise the bytes go to a temporary
+file next to the target, which then replaces it, so a reader or an
+interrupted build never sees half a page.
+"""
+import os
+
+CHUNK = 65536
+
+
+def same_content(path, data):
+    # Size first, then the bytes, read in chunks; False when path does not exist
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            view = memoryview(data)
+            for start in range(0, len(data), CHUNK):
+                if f.read(CHUNK) != view[start:start + CHUNK]:
+                    return False
+        return True
+    except OSError:
+        return False
+
+
+def write_output(path, data):
+    # data: bytes, or text written as UTF-8. Returns True if path was written, False if it
+    # already had this content.
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if same_content(path, data):
+        return False
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+
+def remove_output(path):
+    # Returns True if there was a file to remove
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Precompressed .gz and .br siblings for the text files in public/.
+
+Every HTML/CSS/JS/SVG/JSON file gets name.gz (gzip level 9) and name.br (brotli
+quality 11) next to it, so the web server can send the compressed bytes as they
+are. The sha256 of each file's content is remembered in the build cache, and a
+file is only compressed again when its content changes. The work runs in a
+process pool. brotli is optional: without it only .gz files are written.
+
+The same record tells which siblings this step wrote: only those are removed
+once their file is gone or too small. Any other .gz or .br in public/, such as
+an archive copied from static/, is published as it is.
+"""
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_EXTS = ('.html', '.css', '.js', '.svg', '.json')
+SIBLING_EXTS = ('.gz', '.br')
+MIN_SIZE = 256  # below this the compressed copy saves next to nothing
+
+
+def compress_file(path):
+    # Runs in a worker process; returns (original, gzip, brotli) sizes, brotli 0 if skipped
+    with open(path, 'rb') as f:
+        data = f.read()
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz.tmp', 'wb') as f:
+        f.write(gz)
+    os.replace(path + '.gz.tmp', path + '.gz')
+    br_size = 0
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        with open(path + '.br.tmp', 'wb') as f:
+            f.write(br)
+        os.replace(path + '.br.tmp', path + '.br')
+        br_size = len(br)
+    return len(data), len(gz), br_size
+
+
+def digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def precompress(public_dir, cache_dir, jobs=1):
+    # Returns {'compressed', 'skipped', 'removed', 'sizes': {ext: [original, gzip, brotli]}}
+    state_path = os.path.join(cache_dir, 'precompress.json')
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    # What the last run wrote is cleaned up below; its hashes are only reused if brotli was available then too
+    previous_files = state.get('files', {})
+    owned = ('.gz', '.br') if state.get('brotli') else ('.gz',)
+    if state.get('brotli') != (brotli is not None):
+        state = {'brotli': brotli is not None, 'files': {}}
+
+    siblings = ('.gz', '.br') if brotli is not None else ('.gz',)
+    stats = {'compressed': 0, 'skipped': 0, 'removed': 0, 'sizes': {}}
+    files = {}
+    todo = []
+    for dirpath, dirnames, filenames in os.walk(public_dir):
+        dirnames.sort()
+        present = set(filenames)
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            ext = os.path.splitext(filename)[1]
+            if ext not in COMPRESS_EXTS:
+                continue
+            st = os.stat(path)
+            if st.st_size < MIN_SIZE:
+                continue  # any siblings of ours are removed below
+            rel = os.path.relpath(path, public_dir).replace(os.sep, '/')
+            previous = state['files'].get(rel)
+            # Size and mtime unchanged: trust the recorded hash without reading the file
+            if previous and previous['size'] == st.st_size and previous['mtime'] == st.st_mtime_ns:
+                content_hash = previous['hash']
+            else:
+                content_hash = digest(path)
+            entry = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': content_hash}
+            if previous and previous['hash'] == content_hash and all(filename + s in present for s in siblings):
+                entry['compressed'] = previous['compressed']
+                stats['skipped'] += 1
+            else:
+                todo.append((rel, path))
+            files[rel] = entry
+
+    # Siblings we wrote for files that are gone or now too small, and .br files once brotli is not
+    # available any more
+    for rel in previous_files:
+        for sibling in (owned if rel not in files else [s for s in owned if s not in siblings]):
+            try:
+                os.remove(os.path.join(public_dir, *rel.split('/')) + sibling)
+            except FileNotFoundError:
+                continue
+            stats['removed'] += 1
+
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(compress_file, [path for _, path in todo]))
+    else:
+        results = [compress_file(path) for _, path in todo]
+    for (rel, _), sizes in zip(todo, results):
+        files[rel]['compressed'] = sizes
+        stats['compressed'] += 1
+
+    for rel, entry in files.items():
+        totals = stats['sizes'].setdefault(os.path.splitext(rel)[1], [0, 0, 0])
+        for i, size in enumerate(entry['compressed']):
+            totals[i] += size
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'brotli': brotli is not None, 'files': files}, f)
+    os.replace(state_path + '.tmp', state_path)
+    return stats
+
+
+def size_report(stats):
+    def cell(size, original):
+        share = f' ({size * 100 // original}%)' if original else ''
+        return f'{size / 1024:.1f} KB{share}'.rjust(18)
+
+    head = f"Precompressed {stats['compressed']} file(s), {stats['skipped']} unchanged"
+    if stats['removed']:
+        head += f", {stats['removed']} stale sibling(s) removed"
+    if brotli is None:
+        head += ' (brotli not installed, .gz only)'
+    lines = [head, f'  {"type":<6}{"original":>12}{"gzip":>18}{"brotli":>18}']
+    totals = [0, 0, 0]
+    for ext, sizes in sorted(stats['sizes'].items()) + [('total', None)]:
+        if sizes is None:
+            sizes = totals
+        else:
+            totals = [t + s for t, s in zip(totals, sizes)]
+        original, gz, br = sizes
+        lines.append(f'  {ext:<6}{original / 1024:>9.1f} KB{cell(gz, original)}'
+                     + (cell(br, original) if brotli is not None else '-'.rjust(18)))
+    return '\n'.join(lines)
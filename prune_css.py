@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Unused CSS removal for generate_static.py.
+
+Once every page is written, the element names, classes and ids used anywhere
+in public/ are collected: from the markup, and from the scripts (the pages'
+inline ones and the site's .js files), where classList calls, className
+assignments, querySelector/closest selectors and getElementById name classes
+and ids that only exist at run time. Selectors of the site's stylesheets that
+can match none of them are dropped. The pruned stylesheet is published under
+its own content hash and the pages are pointed at it.
+
+Matching uses critical_css.selector_matches, so it errs on the side of keeping
+a rule: pseudo-classes and attribute selectors never cause a removal.
+"""
+import hashlib
+import os
+import re
+
+from critical_css import (ANIMATION_RE, CLASS_RE, ID_RE, KEYFRAMES_RE, TYPE_RE, flatten, page_usage,
+                          parse_css, selector_matches, serialize, split_selectors)
+from output_writer import remove_output, write_output
+
+CALL_RE = re.compile(r'''\.(classList\.(?:add|remove|toggle|contains|replace)|querySelector(?:All)?|closest|matches|getElementById|getElementsByClassName)\s*\(([^)]*)\)''')
+CLASS_NAME_RE = re.compile(r'''\.className\s*\+?=\s*(["'`])(.*?)\1''')
+STRING_RE = re.compile(r'''(["'`])((?:\\.|(?!\1).)*)\1''')
+
+
+def script_usage(text):
+    # (tags, classes, ids) that a script adds, removes or looks up
+    tags, classes, ids = page_usage(text)
+    for call, args in CALL_RE.findall(text):
+        values = [m.group(2) for m in STRING_RE.finditer(args)]
+        if call.startswith('classList') or call == 'getElementsByClassName':
+            for value in values:
+                classes.update(value.split())
+        elif call == 'getElementById':
+            ids.update(values)
+        else:
+            for selector in values:
+                classes.update(CLASS_RE.findall(selector))
+                ids.update(ID_RE.findall(selector))
+                tags.update(t.lower() for t in TYPE_RE.findall(selector))
+    for _, value in CLASS_NAME_RE.findall(text):
+        classes.update(value.split())
+    return tags, classes, ids
+
+
+def prune_rules(rules, usage):
+    # Returns (kept rules, removed selectors). A rule loses the selectors of its list
+    # that match nothing and goes once none is left; @media blocks go once empty,
+    # @keyframes once no remaining rule animates with them.
+    kept = []
+    removed = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            inner, inner_removed = prune_rules(body, usage)
+            removed.extend(f'{prelude} {selector}' for selector in inner_removed)
+            if inner:
+                kept.append((prelude, inner))
+        elif prelude.startswith('@') or body is None:
+            kept.append((prelude, body))
+        else:
+            selectors = split_selectors(prelude)
+            live = [s for s in selectors if selector_matches(s, usage)]
+            removed.extend(s for s in selectors if s not in live)
+            if live:
+                kept.append((prelude if len(live) == len(selectors) else ', '.join(live), body))
+    animations = set()
+    for _, body in flatten(kept):
+        for value in ANIMATION_RE.findall(body):
+            animations.update(re.findall(r'[\w-]+', value))
+    unused = [r for r in kept if KEYFRAMES_RE.match(r[0]) and KEYFRAMES_RE.match(r[0]).group(1) not in animations]
+    removed.extend(prelude for prelude, _ in unused)
+    return [r for r in kept if r not in unused], removed
+
+
+def prune_stylesheets(public_dir, stylesheets, scripts, minifier=None):
+    # stylesheets: {'/css/style.css': '/css/style.1a2b3c4d.css'}, the fingerprinted copies
+    # the pages link to; scripts: paths of the site's .js files. Every stylesheet some page
+    # links to is pruned, published as <stem>.<hash of the pruned CSS><ext>, and the pages
+    # are rewritten to link it. Returns [{'url', 'pruned_url', 'before', 'after', 'removed'}, ...].
+    pages = {}
+    for dirpath, dirnames, filenames in os.walk(public_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.html'):
+                path = os.path.join(dirpath, filename)
+                with open(path, encoding='utf-8') as f:
+                    pages[path] = f.read()
+    tags, classes, ids = set(), set(), set()
+    sources = list(pages.values())
+    for path in scripts:
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    for text in sources:
+        for total, found in zip((tags, classes, ids), script_usage(text)):
+            total.update(found)
+    usage = (tags, classes, ids)
+
+    results = []
+    for url, hashed_url in sorted(stylesheets.items()):
+        rel_dir, filename = url.rsplit('/', 1)
+        stem, ext = os.path.splitext(filename)
+        # Any fingerprint of this stylesheet: the full copy, or a pruned one from an earlier build
+        name_re = re.compile(re.escape(f'{stem}.') + r'[0-9a-f]{8}' + re.escape(ext))
+        link_re = re.compile(re.escape(f'{rel_dir}/') + name_re.pattern + r'(?=["\'?#])')
+        linking = [path for path, text in pages.items() if link_re.search(text)]
+        if not linking:
+            continue
+        out_dir = os.path.join(public_dir, *rel_dir.strip('/').split('/'))
+        with open(os.path.join(out_dir, hashed_url.rsplit('/', 1)[1]), encoding='utf-8') as f:
+            css = f.read()
+        kept, removed = prune_rules(parse_css(css), usage)
+        pruned = serialize(kept)
+        if minifier is not None:
+            pruned = minifier(pruned)
+        data = pruned.encode('utf-8')
+        name = f'{stem}.{hashlib.sha256(data).hexdigest()[:8]}{ext}'
+        write_output(os.path.join(out_dir, name), data)
+        pruned_url = f'{rel_dir}/{name}'
+        # Pruned copies from earlier builds are no longer linked once the pages are rewritten
+        for other in os.listdir(out_dir):
+            if other not in (name, hashed_url.rsplit('/', 1)[1]) and name_re.fullmatch(other):
+                remove_output(os.path.join(out_dir, other))
+        for path in linking:
+            text = link_re.sub(pruned_url, pages[path])
+            if text != pages[path]:
+                pages[path] = text
+                write_output(path, text)
+        results.append({'url': url, 'pruned_url': pruned_url, 'before': len(css.encode('utf-8')),
+                        'after': len(data), 'removed': removed})
+    return results
+
+
+def prune_report(results, report_path):
+    # One summary line per stylesheet; the removed selectors are listed in report_path
+    lines = []
+    with open(report_path, 'w', encoding='utf-8') as f:
+        for r in results:
+            lines.append(f"Unused CSS: {r['url']} {r['before'] / 1024:.1f} KB -> {r['after'] / 1024:.1f} KB, "
+                         f"{len(r['removed'])} selector(s) removed")
+            f.write(f"{r['url']} -> {r['pruned_url']}\n")
+            f.writelines(f'  {selector}\n' for selector in r['removed'])
+    if not lines:
+        return 'Unused CSS: no stylesheet is linked from the pages'
+    return '\n'.join(lines) + f'\n  removed selectors listed in {report_path}'
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Localize remote images (the Unsplash thumbnails and inline images in posts).
+
+Every http(s) image referenced by a post, as `thumbnail` in front matter or as
+![alt](url) in the body, is downloaded once into a content-addressed cache in
+the build cache (<sha256>.<ext>, plus an index from URL to hash) and published
+as public/images/remote/<hash>.<ext>. localize_html points the pages at those
+copies, and generate_static.py hands them to responsive_images for resized
+derivatives like any local image.
+
+Downloads only happen for URLs missing from the cache. With offline=True, or
+when a download fails, the cached copies are still used and anything not
+cached keeps its remote URL.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import urllib.parse
+import urllib.request
+
+OUTPUT_DIR = 'images/remote'  # under public/
+TIMEOUT = 20
+USER_AGENT = 'generate_static.py image localizer'
+# Ask for formats Pillow can always decode; Unsplash's auto=format would pick AVIF/WebP
+ACCEPT = 'image/jpeg,image/png;q=0.9,image/*;q=0.5'
+CONTENT_TYPES = {
+    'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp',
+    'image/gif': '.gif', 'image/avif': '.avif', 'image/svg+xml': '.svg',
+}
+
+THUMBNAIL_RE = re.compile(r'''^\s*thumbnail\s*[=:]\s*["']?(https?://[^"'\s]+)''', re.M)
+MD_IMAGE_RE = re.compile(r'!\[[^\]]*\]\((https?://[^)\s]+)')
+SRC_RE = re.compile(r'(\ssrc=")(https?://[^"]+)(")')
+
+
+def load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    index.setdefault('urls', {})     # url -> cached file name
+    index.setdefault('sources', {})  # content file -> [mtime_ns, size, urls]
+    return index
+
+
+def save_index(cache_dir, index):
+    path = os.path.join(cache_dir, 'index.json')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(path + '.tmp', path)
+
+
+def referenced_urls(paths, index):
+    # Remote image URLs in the given content files; a file is only re-read when its
+    # size or mtime changed since the last scan
+    urls = []
+    sources = {}
+    for path in paths:
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        cached = index['sources'].get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            found = cached[2]
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            found = THUMBNAIL_RE.findall(text) + MD_IMAGE_RE.findall(text)
+        sources[key] = [st.st_mtime_ns, st.st_size, found]
+        urls.extend(u for u in found if u not in urls)
+    index['sources'] = sources
+    return urls
+
+
+def download(url, cache_dir):
+    # Fetch url into cache_dir as <sha256><ext>; returns the file name
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Accept': ACCEPT})
+    tmp = os.path.join(cache_dir, 'download.tmp')
+    h = hashlib.sha256()
+    with urllib.request.urlopen(request, timeout=TIMEOUT) as response, open(tmp, 'wb') as f:
+        content_type = response.headers.get_content_type()
+        for chunk in iter(lambda: response.read(65536), b''):
+            h.update(chunk)
+            f.write(chunk)
+    ext = CONTENT_TYPES.get(content_type)
+    if ext is None:
+        ext = os.path.splitext(urllib.parse.urlparse(url).path)[1].lower() or '.img'
+    name = h.hexdigest() + ext
+    os.replace(tmp, os.path.join(cache_dir, name))
+    return name
+
+
+def localize(content_paths, public_dir, cache_dir, offline=False):
+    # Returns ({remote url: local url}, [(local url, cached file path), ...], stats) and
+    # leaves public/images/remote/ holding exactly the images in use.
+    cache_dir = os.path.join(cache_dir, 'remote')
+    os.makedirs(cache_dir, exist_ok=True)
+    index = load_index(cache_dir)
+    stats = {'downloaded': 0, 'cached': 0, 'failed': 0}
+    mapping = {}
+    files = []
+    for url in referenced_urls(content_paths, index):
+        name = index['urls'].get(url)
+        if name is not None and os.path.exists(os.path.join(cache_dir, name)):
+            stats['cached'] += 1
+        elif offline:
+            stats['failed'] += 1
+            continue
+        else:
+            try:
+                name = index['urls'][url] = download(url, cache_dir)
+                stats['downloaded'] += 1
+            except (OSError, ValueError) as e:
+                print(f'Could not download {url}: {e}')
+                stats['failed'] += 1
+                continue
+        digest, ext = os.path.splitext(name)
+        local_name = digest[:16] + ext
+        mapping[url] = f'/{OUTPUT_DIR}/{local_name}'
+        files.append((mapping[url], os.path.join(cache_dir, name)))
+    save_index(cache_dir, index)
+
+    out_dir = os.path.join(public_dir, *OUTPUT_DIR.split('/'))
+    os.makedirs(out_dir, exist_ok=True)
+    live = set()
+    for local_url, path in files:
+        name = os.path.basename(local_url)
+        live.add(name)
+        if not os.path.exists(os.path.join(out_dir, name)):
+            shutil.copyfile(path, os.path.join(out_dir, name))
+    for name in os.listdir(out_dir):
+        if name not in live:
+            os.remove(os.path.join(out_dir, name))
+    return mapping, files, stats
+
+
+def localize_html(text, mapping):
+    # src="https://images.unsplash.com/..." -> the local copy. The Markdown renderer
+    # escapes '&' in attributes and the layouts do not, so both spellings are looked up.
+    if not mapping:
+        return text
+
+    def replace(m):
+        local = mapping.get(m.group(2)) or mapping.get(html.unescape(m.group(2)))
+        return m.group(1) + local + m.group(3) if local else m.group(0)
+
+    return SRC_RE.sub(replace, text)
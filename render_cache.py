@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of rendered post bodies for generate_static.py.
+
+A post body's HTML and summary are stored in an SQLite file in the build
+cache, keyed by the sha256 of the renderer version and the Markdown text, so
+a body that has been rendered before (by this build, an earlier one, or a CI
+run that restored .build_cache) is never rendered again. Every process,
+the --jobs workers included, opens its own connection; WAL mode lets them
+read while another one writes. A connection is only used by the thread that
+opened it, so the watch thread of serve --watch gets its own too.
+
+Each entry remembers when it was last used. Once the entries add up to
+more than the size limit, the least recently used ones are deleted until the
+cache is back under it. Hits and misses are counted in the database, so the
+figures of the worker processes add up too.
+
+sqlite3 is optional: a Python built without it renders every body.
+"""
+import hashlib
+import os
+import threading
+import time
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+MAX_BYTES = 64 * 1024 * 1024
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS renders (key TEXT PRIMARY KEY, html TEXT NOT NULL, summary TEXT NOT NULL,
+                                    size INTEGER NOT NULL, used INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0);
+'''
+
+
+class RenderCache:
+    def __init__(self, path, version):
+        self.path = path
+        self.version = str(version)
+        self.pid = os.getpid()
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')  # a cache: losing the last writes is harmless
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+        self.pending = {}  # key -> (html, summary) rendered since the last flush
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown):
+        return hashlib.sha256(f'{self.version}\0{markdown}'.encode('utf-8')).hexdigest()
+
+    def get(self, markdown):
+        # (html, summary), or None when this body has not been rendered with this version
+        key = self.key(markdown)
+        row = self.pending.get(key) or self.db.execute('SELECT html, summary FROM renders WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used.add(key)
+        return tuple(row)
+
+    def put(self, markdown, html, summary):
+        self.pending[self.key(markdown)] = (html, summary)
+
+    def flush(self):
+        # One transaction for what was rendered and looked up since the last flush
+        if not (self.pending or self.used or self.hits or self.misses):
+            return
+        now = time.time_ns()
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?, ?)',
+                                [(key, html, summary, len(html.encode('utf-8')) + len(summary.encode('utf-8')), now)
+                                 for key, (html, summary) in self.pending.items()])
+            self.db.executemany('UPDATE renders SET used = ? WHERE key = ?', [(now, key) for key in self.used])
+            self.db.execute("UPDATE counters SET value = value + ? WHERE name = 'hits'", (self.hits,))
+            self.db.execute("UPDATE counters SET value = value + ? WHERE name = 'misses'", (self.misses,))
+        self.pending.clear()
+        self.used.clear()
+        self.hits = self.misses = 0
+
+    def counters(self):
+        self.flush()
+        return dict(self.db.execute('SELECT name, value FROM counters'))
+
+    def evict(self, max_bytes=MAX_BYTES):
+        # Drop the least recently used entries beyond max_bytes; returns (entries, bytes, evicted)
+        self.flush()
+        total = 0
+        entries = 0
+        evicted = []
+        for key, size in self.db.execute('SELECT key, size FROM renders ORDER BY used DESC').fetchall():
+            if total + size > max_bytes:
+                evicted.append((key,))
+            else:
+                total += size
+                entries += 1
+        if evicted:
+            with self.db:
+                self.db.executemany('DELETE FROM renders WHERE key = ?', evicted)
+        return entries, total, len(evicted)
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+_local = threading.local()
+
+
+def open_cache(cache_dir, version):
+    # The cache of this process and thread, or None. sqlite3 connections cannot cross either: a
+    # forked worker must not use its parent's, the watch thread not the main thread's.
+    if sqlite3 is None:
+        return None
+    path = os.path.join(cache_dir, 'render-cache.sqlite')
+    cache = getattr(_local, 'cache', None)
+    if cache is None or cache.pid != os.getpid() or cache.path != path or cache.version != str(version):
+        os.makedirs(cache_dir, exist_ok=True)
+        cache = _local.cache = RenderCache(path, version)
+    return cache
+
+
+def cache_report(cache, before, evicted):
+    # before: counters() at the start of the build; evicted: what evict() returned
+    after = cache.counters()
+    hits = after['hits'] - before['hits']
+    misses = after['misses'] - before['misses']
+    entries, size, dropped = evicted
+    line = (f'Render cache: {hits} hit(s), {misses} miss(es), {entries} entr{"y" if entries == 1 else "ies"} '
+            f'({size / 1048576:.1f} MB)')
+    return line + (f', {dropped} least recently used evicted' if dropped else '')
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Responsive image derivatives for generate_static.py.
+
+Every raster image is resized to a few widths and encoded as AVIF, WebP and JPEG
+(whichever the installed Pillow supports). Encodes are cached in the build cache
+by source hash, so an image is only processed again when its bytes change, and
+published under content-addressed names in public/images/responsive/.
+rewrite_img_tags then turns an <img> of such an image into a <picture> with
+srcset/sizes and the intrinsic width/height.
+
+Pillow is optional: without it derivatives() returns nothing and pages keep
+their plain <img> tags.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+# Bump when encoder settings change so cached derivatives are not reused
+DERIVATIVES_VERSION = 1
+
+WIDTHS = (480, 800, 1200)
+# (extension, MIME type, Pillow save options); JPEG last, it is the <img> fallback
+FORMATS = (
+    ('avif', 'image/avif', {'quality': 50}),
+    ('webp', 'image/webp', {'quality': 75, 'method': 6}),
+    ('jpg', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True}),
+)
+RASTER_EXTS = ('.jpg', '.jpeg', '.png', '.webp')
+DEFAULT_SIZES = '(max-width: 800px) 100vw, 800px'
+OUTPUT_DIR = 'images/responsive'  # under public/
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>')
+SRC_RE = re.compile(r'\ssrc="([^"]*)"')
+
+
+def available_formats():
+    if Image is None:
+        return ()
+    formats = []
+    for ext, mime, options in FORMATS:
+        try:
+            supported = ext == 'jpg' or features.check(ext)
+        except Exception:
+            supported = False
+        if supported:
+            formats.append((ext, mime, options))
+    return tuple(formats)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def target_widths(width):
+    # Configured widths below the intrinsic one, plus the largest size we serve
+    return sorted({w for w in WIDTHS if w < width} | {min(width, WIDTHS[-1])})
+
+
+def encode(path, digest, cache_dir, formats):
+    # Runs in a worker process. Writes <digest>-<width>.<ext> files into cache_dir and
+    # returns the image's metadata.
+    with Image.open(path) as im:
+        im = ImageOps.exif_transpose(im)
+        width, height = im.size
+        variants = {}
+        for w in target_widths(width):
+            resized = im if w == width else im.resize((w, round(height * w / width)), Image.LANCZOS)
+            for ext, mime, options in formats:
+                out = os.path.join(cache_dir, f'{digest}-{w}.{ext}')
+                if not os.path.exists(out):
+                    frame = resized
+                    if ext == 'jpg' and frame.mode not in ('RGB', 'L'):
+                        frame = frame.convert('RGB')
+                    elif frame.mode == 'P':
+                        frame = frame.convert('RGBA')
+                    frame.save(out + '.tmp', format={'jpg': 'JPEG'}.get(ext, ext.upper()), **options)
+                    os.replace(out + '.tmp', out)
+                variants.setdefault(ext, []).append(w)
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def derivatives(sources, public_dir, cache_dir, jobs=1):
+    # sources: (url, path) pairs, e.g. ('/images/133.jpg', 'static/images/133.jpg').
+    # Returns {url: {'width', 'height', 'sources': [(mime, [(derived url, width), ...]), ...]}}
+    # with the JPEG fallback last, and removes published derivatives no longer in use.
+    formats = available_formats()
+    if not formats:
+        return {}
+    cache_dir = os.path.join(cache_dir, 'images')
+    os.makedirs(cache_dir, exist_ok=True)
+    index_path = os.path.join(cache_dir, 'index.json')
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    fingerprint = f'{DERIVATIVES_VERSION}:{WIDTHS}:{[f[0] for f in formats]}'
+    if index.get('fingerprint') != fingerprint:
+        index = {'fingerprint': fingerprint, 'images': {}}
+
+    digests = {}
+    todo = []
+    for url, path in sources:
+        if os.path.splitext(path)[1].lower() not in RASTER_EXTS:
+            continue
+        digest = digests[url] = file_digest(path)
+        meta = index['images'].get(digest)
+        if meta is None or not all(os.path.exists(os.path.join(cache_dir, f'{digest}-{w}.{ext}'))
+                                   for ext, widths in meta['variants'].items() for w in widths):
+            todo.append((path, digest))
+    if todo:
+        if jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(encode, path, digest, cache_dir, formats) for path, digest in todo]
+                for (path, digest), future in zip(todo, futures):
+                    index['images'][digest] = future.result()
+        else:
+            for path, digest in todo:
+                index['images'][digest] = encode(path, digest, cache_dir, formats)
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(index_path + '.tmp', index_path)
+
+    out_dir = os.path.join(public_dir, *OUTPUT_DIR.split('/'))
+    os.makedirs(out_dir, exist_ok=True)
+    images = {}
+    live = set()
+    for url, digest in digests.items():
+        meta = index['images'][digest]
+        stem = os.path.splitext(os.path.basename(url))[0]
+        picture_sources = []
+        for ext, mime, _ in formats:
+            srcset = []
+            for w in meta['variants'].get(ext, ()):
+                # Named after the source hash, so the file under a given name never changes
+                name = f'{stem}.{digest[:8]}-{w}.{ext}'
+                if not os.path.exists(os.path.join(out_dir, name)):
+                    shutil.copyfile(os.path.join(cache_dir, f'{digest}-{w}.{ext}'), os.path.join(out_dir, name))
+                live.add(name)
+                srcset.append((f'/{OUTPUT_DIR}/{name}', w))
+            if srcset:
+                picture_sources.append((mime, srcset))
+        images[url] = {'width': meta['width'], 'height': meta['height'], 'sources': picture_sources}
+    for name in os.listdir(out_dir):
+        if name not in live:
+            os.remove(os.path.join(out_dir, name))
+    return images
+
+
+def derived_urls(images):
+    return sorted(url for info in images.values() for _, srcset in info['sources'] for url, _ in srcset)
+
+
+def rewrite_img_tags(html, images, sizes=DEFAULT_SIZES):
+    # <img src="/images/a.jpg" ...> -> <picture> with AVIF/WebP <source>s and the <img>
+    # carrying the JPEG srcset, sizes, width/height and decoding="async". Tags that
+    # already have a srcset, or images without derivatives, are left as they are.
+    if not images:
+        return html
+
+    def replace(m):
+        tag = m.group(0)
+        src = SRC_RE.search(tag)
+        info = images.get(src.group(1)) if src else None
+        if info is None or not info['sources'] or ' srcset=' in tag:
+            return tag
+        tag_sizes = re.search(r'\ssizes="([^"]*)"', tag)
+        tag_sizes = tag_sizes.group(1) if tag_sizes else sizes
+        *modern, (_, fallback) = info['sources']
+        extra = [f'srcset="{", ".join(f"{u} {w}w" for u, w in fallback)}"']
+        if ' sizes=' not in tag:
+            extra.append(f'sizes="{tag_sizes}"')
+        if ' width=' not in tag and ' height=' not in tag:
+            extra.append(f'width="{info["width"]}" height="{info["height"]}"')
+        if ' decoding=' not in tag:
+            extra.append('decoding="async"')
+        body = tag[:-1].rstrip()
+        closing = '/>' if body.endswith('/') else '>'
+        img = body.rstrip('/').rstrip() + ' ' + ' '.join(extra) + closing
+        if not modern:
+            return img
+        picture = [f'<source type="{mime}" srcset="{", ".join(f"{u} {w}w" for u, w in srcset)}" sizes="{tag_sizes}">'
+                   for mime, srcset in modern]
+        return '<picture>' + ''.join(picture) + img + '</picture>'
+
+    return IMG_TAG_RE.sub(replace, html)
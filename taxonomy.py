@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Taxonomies (tags, categories) for generate_static.py.
+
+Posts name their terms in the front matter, Hugo style: tags = ["Java", "NIO"].
+tomllib gives a list; the line-based fallback parser leaves the raw
+'["Java","NIO"]' text, and a plain "Java, NIO" string is accepted too.
+Every term gets a URL slug ("Node.js" -> node.js, "Bảo mật" -> bao-mat,
+"C++" -> c-plus-plus, "C#" -> c-sharp); names that differ only in case,
+accents or separators share a slug and so a page, shown under the first
+spelling met. Any other two names with the same slug would overwrite each
+other's pages, so they stop the build with a TaxonomyError.
+
+build_index turns the posts into the inverted index term -> posts of every
+taxonomy in a single pass, keeping the order the posts came in.
+"""
+import math
+import re
+import unicodedata
+
+SLUG_UNSAFE_RE = re.compile(r'[^a-z0-9._-]+')
+SEPARATORS_RE = re.compile(r'[\s_-]+')
+# Spelled out rather than dropped, so that C, C++ and C# get pages of their own
+SYMBOLS = {'+': ' plus ', '#': ' sharp ', '&': ' and ', '@': ' at '}
+CLOUD_WEIGHTS = 5
+
+
+def term_names(value):
+    # Term names from a front matter value: a list, '["a","b"]' or 'a, b'; duplicates dropped
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.strip().strip('[]').split(',')
+    names = []
+    for name in value:
+        name = str(name).strip().strip('"\'').strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class TaxonomyError(ValueError):
+    pass
+
+
+def fold(name):
+    # Lower case without accents: 'Bảo Mật' -> 'bao mat'
+    text = unicodedata.normalize('NFKD', name.replace('đ', 'd').replace('Đ', 'D'))
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def term_slug(name):
+    # URL path segment of a term: lower case ASCII, accents dropped, symbols spelled out, anything else -> '-'
+    text = ''.join(SYMBOLS.get(c, c) for c in fold(name))
+    return SLUG_UNSAFE_RE.sub('-', text).strip('-.')
+
+
+def same_term(name, other):
+    # Spellings of one term: equal but for case, accents and separators ('Node JS', 'node-js')
+    return SEPARATORS_RE.sub('-', fold(name).strip()) == SEPARATORS_RE.sub('-', fold(other).strip())
+
+
+def build_index(posts, taxonomies):
+    # {taxonomy: {slug: {'name', 'slug', 'posts'}}} from posts carrying their term names under the
+    # taxonomy's key (posts[i]['tags'] = ['Java', 'NIO']); slugs in order of first appearance.
+    # Raises TaxonomyError when two different terms would get the same page.
+    index = {taxonomy: {} for taxonomy in taxonomies}
+    for post in posts:
+        for taxonomy, terms in index.items():
+            for name in post.get(taxonomy, ()):
+                slug = term_slug(name)
+                if not slug:
+                    continue
+                term = terms.setdefault(slug, {'name': name, 'slug': slug, 'posts': []})
+                if name != term['name'] and not same_term(name, term['name']):
+                    raise TaxonomyError(f'{taxonomy}: "{term["name"]}" and "{name}" would both be /{taxonomy}/{slug}/, '
+                                        f'rename one of them (in {post.get("slug", "?")})')
+                if not term['posts'] or term['posts'][-1] is not post:
+                    term['posts'].append(post)
+    return index
+
+
+def cloud(terms):
+    # The terms of one taxonomy sorted by name, each with its post count and a weight from 1 to
+    # CLOUD_WEIGHTS on a log scale of the counts, for the font size in the tag cloud
+    counts = [len(term['posts']) for term in terms.values()]
+    if not counts:
+        return []
+    low, high = math.log(min(counts)), math.log(max(counts))
+    entries = []
+    for term in sorted(terms.values(), key=lambda t: (t['name'].casefold(), t['slug'])):
+        count = len(term['posts'])
+        weight = 1 + round((CLOUD_WEIGHTS - 1) * (math.log(count) - low) / (high - low)) if high > low else 1
+        entries.append({'name': term['name'], 'slug': term['slug'], 'count': count, 'weight': weight})
+    return entries
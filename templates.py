@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+"""
+Hugo-style layouts for generate_static.py, compiled to Python functions.
+
+Understands the subset of Go template syntax the files in layouts/ use:
+
+    {{ .Title }}  {{ .Site.Menus.main }}  {{ $.Title }}  {{ $p.Title }}
+    {{ "text" }}  {{ 42 }}  {{ true }}
+    {{ fn arg ... }}  {{ value | fn arg }}  {{ (fn arg).Field }}  {{ now.Year }}
+    {{ if x }} {{ else if y }} {{ else }} {{ end }}
+    {{ with x }} {{ else }} {{ end }}      {{ range x }} {{ else }} {{ end }}
+    {{ range $i, $e := x }}  {{ $v := x }}
+    {{ define "main" }}  {{ block "main" . }}  {{ template "main" . }}
+    {{ partial "footer.html" . }}  {{ partialCached "footer.html" . .Lang }}
+    {{- trim -}}  {{/* comment */}}
+
+Each layout is compiled once into Python source, exec'd, and cached by path and
+mtime. A page layout made only of {{ define }} blocks renders through
+_default/baseof.html, like Hugo. Values are inserted as-is, exactly like the
+f-strings these layouts replaced, so callers pass trusted HTML.
+"""
+import os
+import re
+from datetime import datetime
+
+ACTION_RE = re.compile(r'{{(-?)(\s*)(.*?)(\s*)(-?)}}', re.S)
+TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<string>"(?:[^"\\]|\\.)*"|`[^`]*`)
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<assign>:=|=)
+  | (?P<var>\$\w*(?:\.[A-Za-z_]\w*)*)
+  | (?P<field>(?:\.[A-Za-z_]\w*)+|\.)
+  | (?P<ident>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+  | (?P<punct>[|(),])
+''', re.X)
+CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+
+class TemplateError(Exception):
+    pass
+
+
+def lookup(obj, name):
+    # Go field access on dicts (exact key) and objects (Name, name, or snake_case name)
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    for attr in (name, name.lower(), CAMEL_RE.sub('_', name).lower()):
+        if hasattr(obj, attr):
+            return getattr(obj, attr)
+    return None
+
+
+def truth(value):
+    return bool(value) and value != 0
+
+
+def to_text(value):
+    if value is None:
+        return ''
+    if value is True or value is False:
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _and(*args):
+    for a in args:
+        if not truth(a):
+            return a
+    return args[-1]
+
+
+def _or(*args):
+    for a in args:
+        if truth(a):
+            return a
+    return args[-1]
+
+
+def _default(fallback, value=None):
+    return value if truth(value) else fallback
+
+
+def _index(obj, *keys):
+    for key in keys:
+        obj = obj[key] if obj is not None else None
+    return obj
+
+
+BUILTINS = {
+    'eq': lambda a, *b: any(a == x for x in b),
+    'ne': lambda a, b: a != b,
+    'lt': lambda a, b: a < b,
+    'le': lambda a, b: a <= b,
+    'gt': lambda a, b: a > b,
+    'ge': lambda a, b: a >= b,
+    'not': lambda a: not truth(a),
+    'and': _and,
+    'or': _or,
+    'len': lambda a: len(a) if a is not None else 0,
+    'default': _default,
+    'index': _index,
+    'lower': lambda s: to_text(s).lower(),
+    'upper': lambda s: to_text(s).upper(),
+    'printf': lambda fmt, *args: fmt.replace('%v', '%s') % args,
+    'safeHTML': lambda s: s,
+    'relURL': lambda s: '/' + to_text(s).lstrip('/'),
+    'now': datetime.now,
+}
+
+
+class Node:
+    def __init__(self, kind, **kw):
+        self.kind = kind
+        self.__dict__.update(kw)
+
+
+def lex(source, name):
+    # Split into text and action chunks, applying {{- -}} whitespace trimming
+    chunks = []
+    pos = 0
+    for m in ACTION_RE.finditer(source):
+        text = source[pos:m.start()]
+        if m.group(1):
+            text = text.rstrip()
+        if chunks and chunks[-1][0] == 'trim_next':
+            chunks.pop()
+            text = text.lstrip()
+        if text:
+            chunks.append(('text', text))
+        body = m.group(3)
+        if not (body.startswith('/*') and body.endswith('*/')):
+            line = source.count('\n', 0, m.start()) + 1
+            chunks.append(('action', body, line))
+        if m.group(5):
+            chunks.append(('trim_next',))
+        pos = m.end()
+    text = source[pos:]
+    if chunks and chunks[-1][0] == 'trim_next':
+        chunks.pop()
+        text = text.lstrip()
+    if text:
+        chunks.append(('text', text))
+    return chunks
+
+
+def tokenize(action, where):
+    tokens = []
+    pos = 0
+    while pos < len(action):
+        m = TOKEN_RE.match(action, pos)
+        if not m:
+            raise TemplateError(f'{where}: cannot parse {action[pos:]!r}')
+        pos = m.end()
+        if m.lastgroup != 'ws':
+            tokens.append((m.lastgroup, m.group()))
+    return tokens
+
+
+class Parser:
+    def __init__(self, name, source):
+        self.name = name
+        self.chunks = lex(source, name)
+        self.pos = 0
+        self.defines = {}
+
+    def parse(self):
+        body, end = self.parse_list(())
+        if end is not None:
+            raise TemplateError(f'{self.name}: unexpected {{{{ {end[0]} }}}}')
+        return body, self.defines
+
+    def parse_list(self, terminators):
+        # Returns (nodes, (keyword, rest_tokens, line)) where keyword ends the list
+        nodes = []
+        while self.pos < len(self.chunks):
+            chunk = self.chunks[self.pos]
+            self.pos += 1
+            if chunk[0] == 'text':
+                nodes.append(Node('text', text=chunk[1]))
+                continue
+            _, action, line = chunk
+            where = f'{self.name}:{line}'
+            tokens = tokenize(action, where)
+            if not tokens:
+                continue
+            head = tokens[0][1] if tokens[0][0] == 'ident' else None
+            if head in ('end', 'else'):
+                if head not in terminators:
+                    raise TemplateError(f'{where}: unexpected {{{{ {head} }}}}')
+                return nodes, (head, tokens[1:], where)
+            if head in ('if', 'with', 'range'):
+                nodes.append(self.parse_control(head, tokens[1:], where))
+            elif head == 'define':
+                name = self.string_arg(tokens[1:], where)
+                body, _ = self.parse_list(('end',))
+                self.defines[name] = body
+            elif head == 'block':
+                name = self.string_arg(tokens[1:2], where)
+                body, _ = self.parse_list(('end',))
+                self.defines.setdefault(name, body)
+                nodes.append(Node('block', name=name, expr=parse_pipeline(tokens[2:], where)))
+            elif head == 'template':
+                name = self.string_arg(tokens[1:2], where)
+                expr = parse_pipeline(tokens[2:], where) if len(tokens) > 2 else ('dot',)
+                nodes.append(Node('block', name=name, expr=expr))
+            elif len(tokens) > 2 and tokens[0][0] == 'var' and tokens[1][0] == 'assign':
+                nodes.append(Node('assign', var=tokens[0][1], expr=parse_pipeline(tokens[2:], where)))
+            else:
+                nodes.append(Node('output', expr=parse_pipeline(tokens, where)))
+        if terminators:
+            raise TemplateError(f'{self.name}: missing {{{{ end }}}}')
+        return nodes, None
+
+    def string_arg(self, tokens, where):
+        if not tokens or tokens[0][0] != 'string':
+            raise TemplateError(f'{where}: expected a quoted template name')
+        return parse_string(tokens[0][1])
+
+    def parse_control(self, kind, tokens, where):
+        variables = ()
+        if kind == 'range':
+            assign = [i for i, t in enumerate(tokens) if t[0] == 'assign']
+            if assign:
+                names = [t[1] for t in tokens[:assign[0]] if t[0] == 'var']
+                variables = tuple(names)
+                tokens = tokens[assign[0] + 1:]
+        expr = parse_pipeline(tokens, where)
+        body, (end, rest, end_where) = self.parse_list(('end', 'else'))
+        orelse = []
+        if end == 'else':
+            if rest and rest[0] == ('ident', 'if') and kind == 'if':
+                # {{ else if x }} nests another if that shares our {{ end }}
+                orelse = [self.parse_control('if', rest[1:], end_where)]
+            elif rest and rest[0] == ('ident', 'with') and kind == 'with':
+                orelse = [self.parse_control('with', rest[1:], end_where)]
+            else:
+                orelse, _ = self.parse_list(('end',))
+        return Node(kind, expr=expr, body=body, orelse=orelse, variables=variables)
+
+
+def parse_string(token):
+    if token.startswith('`'):
+        return token[1:-1]
+    return bytes(token[1:-1], 'utf-8').decode('unicode_escape') if '\\' in token else token[1:-1]
+
+
+def parse_pipeline(tokens, where):
+    # Expression tree: ('dot',) ('root',) ('var', name) ('lit', value) ('field', base, names)
+    # ('call', func, args) ('method', base, name, args)
+    stages = [[]]
+    depth = 0
+    for tok in tokens:
+        if tok == ('punct', '|') and depth == 0:
+            stages.append([])
+            continue
+        if tok == ('punct', '('):
+            depth += 1
+        elif tok == ('punct', ')'):
+            depth -= 1
+        stages[-1].append(tok)
+    expr = parse_command(stages[0], where, None)
+    for stage in stages[1:]:
+        expr = parse_command(stage, where, expr)
+    return expr
+
+
+def parse_command(tokens, where, piped):
+    if not tokens:
+        raise TemplateError(f'{where}: empty command')
+    operands = []
+    i = 0
+    while i < len(tokens):
+        operand, i = parse_operand(tokens, i, where)
+        operands.append(operand)
+    head = operands[0]
+    args = operands[1:] + ([piped] if piped is not None else [])
+    if head[0] == 'func':
+        return ('call', head[1], args)
+    if head[0] == 'field' and args:
+        # .Date.Format "2006" calls the last field as a method
+        base = ('field', head[1], head[2][:-1]) if len(head[2]) > 1 else head[1]
+        return ('method', base, head[2][-1], args)
+    if args:
+        raise TemplateError(f'{where}: {head} cannot take arguments')
+    return head
+
+
+def parse_operand(tokens, i, where):
+    kind, text = tokens[i]
+    if kind == 'punct' and text == '(':
+        depth = 1
+        j = i + 1
+        while j < len(tokens) and depth:
+            if tokens[j] == ('punct', '('):
+                depth += 1
+            elif tokens[j] == ('punct', ')'):
+                depth -= 1
+            j += 1
+        expr = parse_pipeline(tokens[i + 1:j - 1], where)
+        # Allow (expr).Field
+        if j < len(tokens) and tokens[j][0] == 'field' and tokens[j][1] != '.':
+            return ('field', expr, tuple(tokens[j][1][1:].split('.'))), j + 1
+        return expr, j
+    if kind == 'string':
+        return ('lit', parse_string(text)), i + 1
+    if kind == 'number':
+        return ('lit', float(text) if '.' in text else int(text)), i + 1
+    if kind == 'field':
+        if text == '.':
+            return ('dot',), i + 1
+        return ('field', ('dot',), tuple(text[1:].split('.'))), i + 1
+    if kind == 'var':
+        name, *fields = text.split('.')
+        base = ('root',) if name == '$' else ('var', name[1:])
+        return (('field', base, tuple(fields)) if fields else base), i + 1
+    if kind == 'ident':
+        if text in ('true', 'false'):
+            return ('lit', text == 'true'), i + 1
+        if text == 'nil':
+            return ('lit', None), i + 1
+        name, *fields = text.split('.')
+        if fields:
+            # now.Year: fields of a function's result
+            return ('field', ('call', name, []), tuple(fields)), i + 1
+        return ('func', text), i + 1
+    raise TemplateError(f'{where}: unexpected {text!r}')
+
+
+class Compiler:
+    def __init__(self, name):
+        self.name = name
+        self.lines = []
+        self.counter = 0
+
+    def fresh(self, prefix):
+        self.counter += 1
+        return f'{prefix}{self.counter}'
+
+    def function(self, fname, nodes):
+        self.lines.append(f'def {fname}(dot, root, blocks, env, out, vars):')
+        self.emit(nodes, 1, 'dot')
+        self.lines.append('    pass')
+        self.lines.append('')
+
+    def expr(self, e, dot):
+        kind = e[0]
+        if kind == 'dot':
+            return dot
+        if kind == 'root':
+            return 'root'
+        if kind == 'var':
+            return f'vars[{e[1]!r}]'
+        if kind == 'lit':
+            return repr(e[1])
+        if kind == 'field':
+            code = self.expr(e[1], dot)
+            for name in e[2]:
+                code = f'lookup({code}, {name!r})'
+            return code
+        if kind == 'call':
+            args = ', '.join(self.expr(a, dot) for a in e[2])
+            if e[1] in ('partial', 'partialCached'):
+                return f'env.{e[1]}(blocks, {args})'
+            return f'env.funcs[{e[1]!r}]({args})'
+        if kind == 'method':
+            args = ', '.join(self.expr(a, dot) for a in e[3])
+            return f'lookup({self.expr(e[1], dot)}, {e[2]!r})({args})'
+        raise TemplateError(f'{self.name}: cannot compile {e!r}')
+
+    def emit(self, nodes, depth, dot):
+        pad = '    ' * depth
+        for node in nodes:
+            if node.kind == 'text':
+                self.lines.append(f'{pad}out.append({node.text!r})')
+            elif node.kind == 'output':
+                self.lines.append(f'{pad}out.append(to_text({self.expr(node.expr, dot)}))')
+            elif node.kind == 'assign':
+                self.lines.append(f'{pad}vars[{node.var[1:]!r}] = {self.expr(node.expr, dot)}')
+            elif node.kind == 'block':
+                self.lines.append(f'{pad}blocks[{node.name!r}]({self.expr(node.expr, dot)}, root, blocks, env, out, vars)')
+            elif node.kind == 'if':
+                self.lines.append(f'{pad}if truth({self.expr(node.expr, dot)}):')
+                self.emit(node.body, depth + 1, dot)
+                self.lines.append(f'{pad}    pass')
+                if node.orelse:
+                    self.lines.append(f'{pad}else:')
+                    self.emit(node.orelse, depth + 1, dot)
+                    self.lines.append(f'{pad}    pass')
+            elif node.kind == 'with':
+                value = self.fresh('w')
+                self.lines.append(f'{pad}{value} = {self.expr(node.expr, dot)}')
+                self.lines.append(f'{pad}if truth({value}):')
+                self.emit(node.body, depth + 1, value)
+                self.lines.append(f'{pad}    pass')
+                if node.orelse:
+                    self.lines.append(f'{pad}else:')
+                    self.emit(node.orelse, depth + 1, dot)
+                    self.lines.append(f'{pad}    pass')
+            elif node.kind == 'range':
+                seq = self.fresh('seq')
+                key = self.fresh('k')
+                item = self.fresh('it')
+                self.lines.append(f'{pad}{seq} = {self.expr(node.expr, dot)}')
+                self.lines.append(f'{pad}{seq} = list({seq}.items()) if isinstance({seq}, dict) else list(enumerate({seq} or ()))')
+                self.lines.append(f'{pad}for {key}, {item} in {seq}:')
+                if len(node.variables) == 1:
+                    self.lines.append(f'{pad}    vars[{node.variables[0][1:]!r}] = {item}')
+                elif len(node.variables) == 2:
+                    self.lines.append(f'{pad}    vars[{node.variables[0][1:]!r}] = {key}')
+                    self.lines.append(f'{pad}    vars[{node.variables[1][1:]!r}] = {item}')
+                self.emit(node.body, depth + 1, item)
+                self.lines.append(f'{pad}    pass')
+                if node.orelse:
+                    self.lines.append(f'{pad}if not {seq}:')
+                    self.emit(node.orelse, depth + 1, dot)
+                    self.lines.append(f'{pad}    pass')
+
+
+class Template:
+    def __init__(self, name, source):
+        root, defines = Parser(name, source).parse()
+        compiler = Compiler(name)
+        compiler.function('render_root', root)
+        block_names = {}
+        for block in defines:
+            fname = compiler.fresh('render_block_')
+            compiler.function(fname, defines[block])
+            block_names[block] = fname
+        self.source = '\n'.join(compiler.lines)
+        namespace = {'lookup': lookup, 'truth': truth, 'to_text': to_text}
+        exec(compile(self.source, f'<layout {name}>', 'exec'), namespace)
+        self.render_root = namespace['render_root']
+        self.blocks = {block: namespace[fname] for block, fname in block_names.items()}
+        # A layout with nothing but {{ define }} blocks is a child of baseof.html
+        self.is_child = bool(defines) and not any(n.kind != 'text' or n.text.strip() for n in root)
+
+
+class Environment:
+    def __init__(self, root, funcs=None):
+        self.root = root
+        self.funcs = dict(BUILTINS)
+        self.funcs.update(funcs or {})
+        self.compiled = {}
+        self.partial_cache = {}
+
+    def get(self, name):
+        path = os.path.join(self.root, *name.split('/'))
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.compiled.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding='utf-8') as f:
+                cached = (mtime, Template(name, f.read()))
+            self.compiled[name] = cached
+            self.partial_cache.clear()
+        return cached[1]
+
+    def reset(self):
+        # Cached partial output depends on config; call once per build
+        self.partial_cache.clear()
+
+    def render(self, name, context):
+        template = self.get(name)
+        out = []
+        if template.is_child:
+            base = self.get('_default/baseof.html')
+            blocks = dict(base.blocks)
+            blocks.update(template.blocks)
+            base.render_root(context, context, blocks, self, out, {})
+        else:
+            template.render_root(context, context, dict(template.blocks), self, out, {})
+        return ''.join(out)
+
+    def partial(self, blocks, name, context=None):
+        template = self.get('partials/' + name)
+        out = []
+        template.render_root(context, context, dict(template.blocks), self, out, {})
+        return ''.join(out)
+
+    def partialCached(self, blocks, name, context=None, *variants):
+        # Rendered once per (name, variants) and reused, e.g. the footer once per language
+        key = (name,) + variants
+        if key not in self.partial_cache:
+            self.partial_cache[key] = self.partial(blocks, name, context)
+        return self.partial_cache[key]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_static  # noqa: E402
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    # The generator pointed at a copy of content/ and at an empty public/ and build cache, all in tmp_path,
+    # building the site for the root of its host whatever baseURL config.toml has
+    shutil.copytree(generate_static.CONTENT, tmp_path / 'content')
+    monkeypatch.setattr(generate_static, 'CONTENT', str(tmp_path / 'content'))
+    monkeypatch.setattr(generate_static, 'PUBLIC', str(tmp_path / 'public'))
+    monkeypatch.setattr(generate_static, 'BUILD_CACHE', str(tmp_path / 'cache'))
+    monkeypatch.setattr(generate_static, 'WATCH_STATE', {})
+    config = generate_static.load_config()
+    monkeypatch.setattr(generate_static, 'load_config', lambda: dataclasses.replace(config, base_url='/'))
+    return tmp_path
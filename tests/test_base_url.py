@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import http.client
+import re
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import dev_server
+import generate_static
+
+
+@pytest.fixture
+def project_page(site, monkeypatch):
+    # The site deployed as a GitHub project page under /blog/
+    config = generate_static.load_config()
+    monkeypatch.setattr(generate_static, 'load_config',
+                        lambda: dataclasses.replace(config, base_url='https://example.github.io/blog/'))
+    return site
+
+
+def root_relative(html):
+    return re.findall(r'''\s(?:href|src)=["'](/(?!/)[^"']*)''', html)
+
+
+def test_links_carry_the_base_path(project_page):
+    generate_static.build(force=True, critical_css=True, prune_css=True)
+    public = project_page / 'public'
+    for page in ('index.html', 'posts/index.en.html', 'posts/03-java-nio.html', 'tags/java/index.html'):
+        html = (public / page).read_text(encoding='utf-8')
+        urls = root_relative(html)
+        assert urls and all(url.startswith('/blog/') for url in urls), page
+    post = (public / 'posts' / '03-java-nio.html').read_text(encoding='utf-8')
+    assert 'hreflang="en" href="/blog/posts/03-java-nio.en.html"' in post
+    assert 'href="/blog/tags/java/"' in post
+    assert re.search(r'href="/blog/css/style\.[0-9a-f]{8}\.css"', post)
+    assert 'href="https://cdnjs.cloudflare.com/' in post
+
+
+def test_site_at_the_root_is_unchanged(site):
+    generate_static.build(force=True)
+    html = (site / 'public' / 'index.html').read_text(encoding='utf-8')
+    assert not any(url.startswith('/blog/') for url in root_relative(html))
+    assert 'href="/posts/"' in html
+
+
+def test_dev_server_serves_public_under_the_base_path(tmp_path):
+    (tmp_path / 'posts').mkdir()
+    (tmp_path / 'posts' / 'index.html').write_text('<html><body>posts</body></html>', encoding='utf-8')
+    handler = type('Handler', (dev_server.Handler,), {'reloader': dev_server.Reloader(), 'base_path': '/blog'})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        def get(path):
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+            connection.request('GET', path)
+            response = connection.getresponse()
+            return response.status, response.getheader('Location'), response.read()
+
+        status, _, body = get('/blog/posts/')
+        assert status == 200 and b'posts' in body and dev_server.RELOAD_PATH.encode() in body
+        assert get('/')[:2] == (302, '/blog/')
+    finally:
+        server.shutdown()
+        server.server_close()
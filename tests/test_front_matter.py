@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import generate_static
+
+FRONT_MATTER = '++\ntitle = "Socket"\ntags = ["Java","NIO"]\n++\n\n'
+BODIES = {
+    'paragraphs': 'First paragraph, long enough to be the summary.\n\nSecond one.\n',
+    'heading first': '### 1. Intro\n\nThe summary comes after the heading.\n\nMore.\n',
+    'code first': '```java\nServerSocket s;\n\nint port = 8080;\n```\n\nAfter the code.\n\nMore.\n',
+    'bullet list': '* one\n* two\n* three\n\nAfter the list.\n\nMore.\n',
+    'caption': '![Socket](/images/133.jpg)\n*Caption*\n\nText after the image.\n\nMore.\n',
+    'one paragraph': 'Just this, no blank line after it.',
+    'long paragraph': 'word ' * 400 + '\n\nNext.\n',
+}
+
+
+@pytest.mark.parametrize('body', BODIES.values(), ids=BODIES.keys())
+@pytest.mark.parametrize('front_matter', [FRONT_MATTER, '﻿' + FRONT_MATTER, ''], ids=['toml', 'bom', 'none'])
+def test_lazy_read_matches_full_read(tmp_path, front_matter, body):
+    path = tmp_path / 'post.md'
+    path.write_text(front_matter + body, encoding='utf-8')
+    assert generate_static.read_front_matter(str(path)) == generate_static.read_front_matter_and_body(str(path))[0]
+
+
+def test_lazy_read_gives_up_after_the_prefix(tmp_path, monkeypatch):
+    # An odd number of '*' keeps every partial summary undecided; the reader must not
+    # re-summarize the growing prefix line after line until the end of the file
+    path = tmp_path / 'post.md'
+    path.write_text(FRONT_MATTER + '* one\n* two\n* three\n\n' + ('word ' * 15 + '\n') * 5000, encoding='utf-8')
+    calls = []
+    summarize = generate_static.summarize
+    monkeypatch.setattr(generate_static, 'summarize', lambda body, partial=False: calls.append(len(body)) or summarize(body, partial))
+    fm = generate_static.read_front_matter(str(path))
+    # At most a few prefix-sized attempts, then the one full read
+    assert sum(calls) < 4 * generate_static.SUMMARY_PREFIX + path.stat().st_size
+    assert fm == generate_static.read_front_matter_and_body(str(path))[0]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import shutil
+
+import generate_static
+
+EN_LINK = '<link rel="alternate" hreflang="en" href="/posts/03-java-nio.en.html">'
+
+
+def test_english_sibling_removed_and_added_back(site, tmp_path):
+    generate_static.build(force=True)
+    en_post = site / 'content' / 'posts' / '03-java-nio.en.md'
+    page = site / 'public' / 'posts' / '03-java-nio.html'
+    assert EN_LINK in page.read_text(encoding='utf-8')
+
+    saved = tmp_path / 'saved.en.md'
+    shutil.move(en_post, saved)
+    generate_static.build()
+    assert EN_LINK not in page.read_text(encoding='utf-8')
+    assert not (site / 'public' / 'posts' / '03-java-nio.en.html').exists()
+
+    shutil.move(saved, en_post)
+    generate_static.build(changed={str(en_post)})
+    assert EN_LINK in page.read_text(encoding='utf-8')
+    assert (site / 'public' / 'posts' / '03-java-nio.en.html').exists()
+
+
+def test_incremental_build_matches_forced_build(site):
+    generate_static.build(force=True)
+    (site / 'content' / 'posts' / '05-fetch-websocket.en.md').unlink()
+    generate_static.build()
+    incremental = (site / 'public' / 'posts' / '05-fetch-websocket.html').read_bytes()
+    generate_static.build(force=True)
+    assert (site / 'public' / 'posts' / '05-fetch-websocket.html').read_bytes() == incremental
+
+
+def test_changed_tag_slugs_rerender_the_pages_linking_them(site, monkeypatch):
+    import taxonomy
+
+    generate_static.build(force=True)
+    page = site / 'public' / 'posts' / '06-nodejs-tcp-server.html'
+    assert 'href="/tags/node.js/"' in page.read_text(encoding='utf-8')
+
+    slug = taxonomy.term_slug
+    monkeypatch.setattr(taxonomy, 'term_slug', lambda name: slug(name).replace('.', '-'))
+    monkeypatch.setattr(generate_static, 'term_slug', taxonomy.term_slug)
+    monkeypatch.setattr(generate_static, 'file_digest', lambda path, digest=generate_static.file_digest:
+                        digest(path) + ('changed' if path.endswith('taxonomy.py') else ''))
+    generate_static.build()
+    assert not (site / 'public' / 'tags' / 'node.js').exists()
+    for html in (page, site / 'public' / 'posts' / 'index.html'):
+        assert 'href="/tags/node-js/"' in html.read_text(encoding='utf-8')
+
+
+def test_index_pages_only_link_languages_that_have_them(site):
+    # 9 bilingual posts and 3 Vietnamese-only ones: /posts/page/2/ only exists in Vietnamese
+    posts = site / 'content' / 'posts'
+    for n in (10, 11, 12):
+        shutil.copy(posts / '01-socket-java.md', posts / f'{n}-vi-only.md')
+    generate_static.build(force=True)
+    public = site / 'public' / 'posts'
+    assert not (public / 'page' / '2' / 'index.en.html').exists()
+    page = (public / 'page' / '2' / 'index.html').read_text(encoding='utf-8')
+    assert 'hreflang="vi" href="/posts/page/2/"' in page
+    assert 'hreflang="en"' not in page
+    assert 'hreflang="en" href="/posts/index.en.html"' in (public / 'index.html').read_text(encoding='utf-8')
+
+    # Once the English index gets a second page too, the Vietnamese one links it
+    for n in (10, 11):
+        shutil.copy(posts / '01-socket-java.en.md', posts / f'{n}-vi-only.en.md')
+    generate_static.build()
+    page = (public / 'page' / '2' / 'index.html').read_text(encoding='utf-8')
+    assert 'hreflang="en" href="/posts/page/2/index.en.html"' in page
+
+
+def test_term_pages_only_link_languages_that_have_them(site, monkeypatch):
+    # paginate = 2: JavaScript has 5 posts in both languages, 3 pages; without the English
+    # version of one of them, page 3 of /tags/javascript/ only exists in Vietnamese
+    config = generate_static.load_config()
+    monkeypatch.setattr(generate_static, 'load_config', lambda: dataclasses.replace(config, paginate=2))
+    (site / 'content' / 'posts' / '09-security-cors.en.md').unlink()
+    generate_static.build(force=True)
+    tag = site / 'public' / 'tags' / 'javascript'
+    assert not (tag / 'page' / '3' / 'index.en.html').exists()
+    page = (tag / 'page' / '3' / 'index.html').read_text(encoding='utf-8')
+    assert 'hreflang="en"' not in page
+    assert 'hreflang="en" href="/tags/javascript/page/2/index.en.html"' in (tag / 'page' / '2' / 'index.html').read_text(encoding='utf-8')
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import gzip
+
+from precompress import MIN_SIZE, precompress
+
+PAGE = '<!doctype html><p>' + 'Socket trong Java. ' * 100
+
+
+def test_only_removes_siblings_it_wrote(tmp_path):
+    public, cache = tmp_path / 'public', tmp_path / 'cache'
+    (public / 'downloads').mkdir(parents=True)
+    archive = gzip.compress(b'published archive')
+    (public / 'downloads' / 'archive.tar.gz').write_bytes(archive)
+    (public / 'downloads' / 'notes.txt.br').write_bytes(b'not ours either')
+    (public / 'index.html').write_text(PAGE, encoding='utf-8')
+    (public / 'about.html').write_text(PAGE, encoding='utf-8')
+
+    stats = precompress(str(public), str(cache))
+    assert stats['compressed'] == 2 and stats['removed'] == 0
+    assert gzip.decompress((public / 'index.html.gz').read_bytes()).decode('utf-8') == PAGE
+
+    # index.html deleted, about.html now too small to be worth compressing
+    (public / 'index.html').unlink()
+    (public / 'about.html').write_text('<p>' + 'x' * (MIN_SIZE // 2), encoding='utf-8')
+    stats = precompress(str(public), str(cache))
+    assert stats['removed'] == 2
+    assert not (public / 'index.html.gz').exists() and not (public / 'about.html.gz').exists()
+    assert (public / 'downloads' / 'archive.tar.gz').read_bytes() == archive
+    assert (public / 'downloads' / 'notes.txt.br').exists()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from remote_images import OUTPUT_DIR, localize, localize_html
+
+JPEG = b'\xff\xd8\xff\xe0' + b'stand-in image bytes' * 50
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path != '/photo.jpg':
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(JPEG)))
+        self.end_headers()
+        self.wfile.write(JPEG)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    # A stand-in for images.unsplash.com on an ephemeral port; yields its base URL and request log
+    handler = type('Handler', (ImageHandler,), {'requests': []})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}', handler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def write_post(tmp_path, thumbnail, image):
+    post = tmp_path / 'post.md'
+    post.write_text(f'++\ntitle = "Socket"\nthumbnail = "{thumbnail}"\n++\n\nText.\n\n![Diagram]({image})\n',
+                    encoding='utf-8')
+    return [str(post)]
+
+
+def test_download_rewrite_and_cache_reuse(tmp_path, image_server, monkeypatch):
+    monkeypatch.setenv('no_proxy', '127.0.0.1')
+    base, requests = image_server
+    url = f'{base}/photo.jpg'
+    paths = write_post(tmp_path, url, url)
+    public, cache = tmp_path / 'public', tmp_path / 'cache'
+
+    mapping, files, stats = localize(paths, str(public), str(cache))
+    assert stats == {'downloaded': 1, 'cached': 0, 'failed': 0}
+    assert requests == ['/photo.jpg']
+    local = mapping[url]
+    assert local.startswith(f'/{OUTPUT_DIR}/') and local.endswith('.jpg')
+    assert (public / local.lstrip('/')).read_bytes() == JPEG
+    assert localize_html(f'<img src="{url}" alt="">', mapping) == f'<img src="{local}" alt="">'
+
+    # Second build: served from the cache, the server is not asked again
+    mapping_again, _, stats = localize(paths, str(public), str(cache))
+    assert stats == {'downloaded': 0, 'cached': 1, 'failed': 0}
+    assert requests == ['/photo.jpg']
+    assert mapping_again == mapping
+
+
+def test_offline_and_failed_fetch_keep_the_remote_url(tmp_path, image_server, monkeypatch):
+    monkeypatch.setenv('no_proxy', '127.0.0.1')
+    base, requests = image_server
+    url, missing = f'{base}/photo.jpg', f'{base}/missing.jpg'
+    paths = write_post(tmp_path, url, missing)
+    public, cache = tmp_path / 'public', tmp_path / 'cache'
+
+    mapping, files, stats = localize(paths, str(public), str(cache), offline=True)
+    assert stats == {'downloaded': 0, 'cached': 0, 'failed': 2}
+    assert mapping == {} and files == [] and requests == []
+    page = f'<img src="{url}" alt=""><img src="{missing}" alt="">'
+    assert localize_html(page, mapping) == page
+
+    mapping, _, stats = localize(paths, str(public), str(cache))
+    assert stats == {'downloaded': 1, 'cached': 0, 'failed': 1}
+    assert missing not in mapping
+    assert localize_html(f'<img src="{missing}" alt="">', mapping) == f'<img src="{missing}" alt="">'
+    assert sorted(p.name for p in (public / OUTPUT_DIR).iterdir()) == [mapping[url].rsplit('/', 1)[1]]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from taxonomy import TaxonomyError, build_index, cloud, term_names, term_slug
+
+
+def test_term_names_from_every_front_matter_form():
+    assert term_names(['Java', 'NIO', 'Java']) == ['Java', 'NIO']
+    assert term_names('["Java","NIO"]') == ['Java', 'NIO']
+    assert term_names('Java, NIO') == ['Java', 'NIO']
+    assert term_names(None) == []
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('Java', 'java'), ('Node.js', 'node.js'), ('Socket.IO', 'socket.io'), ('Bảo mật', 'bao-mat'),
+    ('Đà Nẵng', 'da-nang'), ('C', 'c'), ('C++', 'c-plus-plus'), ('C#', 'c-sharp'), ('R&D', 'r-and-d'),
+])
+def test_term_slug(name, slug):
+    assert term_slug(name) == slug
+
+
+def test_c_family_gets_three_terms():
+    posts = [{'slug': '01-c', 'tags': ['C']}, {'slug': '02-cpp', 'tags': ['C++']}, {'slug': '03-cs', 'tags': ['C#', 'C']}]
+    terms = build_index(posts, ['tags'])['tags']
+    assert {slug: [p['slug'] for p in t['posts']] for slug, t in terms.items()} == {
+        'c': ['01-c', '03-cs'], 'c-plus-plus': ['02-cpp'], 'c-sharp': ['03-cs']}
+
+
+def test_spellings_of_one_term_share_its_page():
+    posts = [{'slug': '01', 'tags': ['Bảo mật']}, {'slug': '02', 'tags': ['bao mat']}, {'slug': '03', 'tags': ['Bao-Mat']}]
+    terms = build_index(posts, ['tags'])['tags']
+    assert list(terms) == ['bao-mat']
+    assert terms['bao-mat']['name'] == 'Bảo mật' and len(terms['bao-mat']['posts']) == 3
+
+
+def test_different_terms_with_one_slug_stop_the_build():
+    posts = [{'slug': '01-web', 'tags': ['Web']}, {'slug': '02-web', 'tags': ['Web!']}]
+    with pytest.raises(TaxonomyError, match=r'"Web" and "Web!" would both be /tags/web/'):
+        build_index(posts, ['tags'])
+
+
+def test_cloud_weights():
+    posts = [{'tags': ['Java', 'NIO']}] + [{'tags': ['Java']} for _ in range(3)]
+    entries = cloud(build_index(posts, ['tags'])['tags'])
+    assert [(e['name'], e['count'], e['weight']) for e in entries] == [('Java', 4, 5), ('NIO', 1, 1)]
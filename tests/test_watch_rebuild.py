@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+import generate_static
+
+
+def in_thread(fn, *args, **kwargs):
+    # Runs fn like dev_server.watch() runs the rebuilds: on a thread of its own
+    errors = []
+
+    def run():
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return errors
+
+
+def append(path, text):
+    path.write_text(path.read_text(encoding='utf-8') + text, encoding='utf-8')
+
+
+def test_rebuilds_from_the_watch_thread(site):
+    generate_static.build(force=True)
+    post = site / 'content' / 'posts' / '01-socket-java.md'
+    page = site / 'public' / 'posts' / '01-socket-java.html'
+
+    append(post, '\nA paragraph added while serving.\n')
+    assert in_thread(generate_static.build, changed={str(post)}) == []
+    assert 'A paragraph added while serving.' in page.read_text(encoding='utf-8')
+
+    append(post, '\nAnd one more before a full rebuild.\n')
+    assert in_thread(generate_static.build) == []
+    assert 'And one more before a full rebuild.' in page.read_text(encoding='utf-8')
+
+
+def test_failed_rebuild_renders_again(site, monkeypatch):
+    generate_static.build(force=True)
+    post = site / 'content' / 'posts' / '01-socket-java.md'
+    page = site / 'public' / 'posts' / '01-socket-java.html'
+    append(post, '\nWritten after the failure.\n')
+
+    def broken(body):
+        raise RuntimeError('renderer crashed')
+
+    with monkeypatch.context() as m:
+        m.setattr(generate_static, 'render_body', broken)
+        with pytest.raises(RuntimeError):
+            generate_static.build(changed={str(post)})
+    assert 'Written after the failure.' not in page.read_text(encoding='utf-8')
+
+    # The next targeted rebuild is for another file, but the failed page is still pending
+    other = site / 'content' / 'posts' / '02-multithread-server.md'
+    generate_static.build(changed={str(other)})
+    assert 'Written after the failure.' in page.read_text(encoding='utf-8')